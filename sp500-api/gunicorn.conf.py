@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Configuration Gunicorn - Déploiement de production multi-processus du Bot Trading SP500
+
+Lancement (depuis sp500-api/):
+    gunicorn -c gunicorn.conf.py
+
+Architecture:
+- N processus HTTP (WEB_CONCURRENCY) en mode "web": sans état, ils relaient les requêtes API
+  au processus d'analyse, servent /api/status depuis l'instantané partagé et relaient à leurs
+  clients /api/stream les événements du processus d'analyse (abonnement par la liaison IPC)
+- 1 processus d'analyse (mode "worker"), lancé et relancé par le maître Gunicorn: il détient
+  system_status, l'orchestrateur et l'agent de trading; le rôle de leader (horloges, trading)
+  est garanti unique par le verrou LeaderLock, même si deux déploiements se chevauchent
+
+Variables: PORT, WEB_CONCURRENCY, GUNICORN_THREADS, ANALYSIS_WORKER_PORT, ANALYSIS_WORKER_AUTHKEY
+(secret de la liaison IPC: généré aléatoirement au lancement s'il n'est pas fourni)
+(le serveur de développement `python src/main.py` reste disponible en mode inline)
+"""
+
+import os
+import sys
+import time
+import subprocess
+import threading
+import multiprocessing
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+
+# ===== SERVEUR HTTP =====
+
+wsgi_app = 'main:app'
+pythonpath = SRC_DIR
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+# Threads par processus: les connexions SSE (/api/stream) occupent chacune un thread (voir MAX_STREAM_CLIENTS)
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+accesslog = '-'
+errorlog = '-'
+
+# Processus HTTP sans état: toutes les routes API s'exécutent dans le processus d'analyse.
+# Chaque client /api/stream occupe un thread: la moitié au plus leur est réservée par processus
+raw_env = ['ANALYSIS_WORKER_MODE=web', f'MAX_STREAM_CLIENTS={max(1, threads // 2)}']
+
+# Secret de la liaison IPC web <-> worker, hérité par les processus HTTP (fork) et d'analyse (environnement)
+os.environ.setdefault('ANALYSIS_WORKER_AUTHKEY', os.urandom(32).hex())
+
+# ===== PROCESSUS D'ANALYSE (PROPRIÉTAIRE DE L'ÉTAT) =====
+
+ANALYSIS_RESTART_DELAY = 5  # Secondes avant de relancer un processus d'analyse arrêté
+
+analysis_process = {'process': None, 'stopping': False}
+
+def _spawn_analysis_worker():
+    env = dict(os.environ, ANALYSIS_WORKER_MODE='worker')
+    return subprocess.Popen([sys.executable, 'main.py'], cwd=SRC_DIR, env=env)
+
+def _supervise_analysis_worker(server):
+    """Relance le processus d'analyse s'il s'arrête (un nouveau leader est élu à son démarrage)"""
+    while not analysis_process['stopping']:
+        process = _spawn_analysis_worker()
+        analysis_process['process'] = process
+        server.log.info(f"🛠️ Processus d'analyse démarré (PID {process.pid})")
+        code = process.wait()
+        if analysis_process['stopping']:
+            return
+        server.log.warning(f"⚠️ Processus d'analyse arrêté (code {code}) - relance dans {ANALYSIS_RESTART_DELAY}s")
+        time.sleep(ANALYSIS_RESTART_DELAY)
+
+def on_starting(server):
+    """Maître Gunicorn: lance le processus d'analyse avant les processus HTTP"""
+    threading.Thread(target=_supervise_analysis_worker, args=(server,), daemon=True,
+                     name="sp500-analysis-supervisor").start()
+
+def on_exit(server):
+    """Arrêt propre du processus d'analyse avec le maître"""
+    analysis_process['stopping'] = True
+    process = analysis_process['process']
+    if process and process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=graceful_timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
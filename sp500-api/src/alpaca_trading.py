@@ -12,7 +12,7 @@ CORRECTIONS PRINCIPALES:
 9. CORRECTION DOUBLE ORDRE: Désactive le thread auto trading pour éviter duplication
 """
 
-import alpaca_trade_api as tradeapi
+import importlib.util
 from datetime import datetime, timedelta, time
 import pytz
 import threading
@@ -21,7 +21,15 @@ import json
 import os
 from typing import Dict, List, Optional, Tuple
 import logging
-import schedule
+
+from event_bus import event_bus, ORDER_SUBMITTED, ORDER_FILLED, RECOMMENDATION_READY
+
+RECOMMENDATION_WAKEUP_INTERVAL = 1.0    # Réveil de l'attente pour vérifier l'arrêt et le timeout (secondes)
+RECOMMENDATION_WAIT_LOG_INTERVAL = 60.0  # Trace périodique pendant l'attente (secondes)
+
+# SDK Alpaca importé à la première connexion (démarrage rapide); son absence rend le module indisponible
+if importlib.util.find_spec('alpaca_trade_api') is None:
+    raise ImportError("Module alpaca_trade_api non installé")
 
 # ===== CORRECTION DOUBLE ORDRE: VARIABLE DE CONTRÔLE =====
 # Désactive le thread auto trading pour éviter les doubles ordres
@@ -50,7 +58,10 @@ logger = logging.getLogger(__name__)
 
 class AlpacaTradingAgent:
     def __init__(self):
-        self.api = None
+        self._api = None
+        # Connexion différée: établie au premier accès à self.api (jamais à l'import du module)
+        self._api_pending = False
+        self._api_lock = threading.RLock()
         self.config = {
             'paper_api_key': '',
             'paper_secret_key': '',
@@ -78,6 +89,8 @@ class AlpacaTradingAgent:
         self.active_orders = {}
         self.auto_trading_thread = None
         self.stop_auto_trading = False
+        # Source de la recommandation finale affichable (enregistrée par l'API, même processus)
+        self.recommendation_source = None
         self.market_hours = {
             'NYSE': {'open': time(9, 30), 'close': time(16, 0), 'timezone': 'US/Eastern'},
             'NASDAQ': {'open': time(9, 30), 'close': time(16, 0), 'timezone': 'US/Eastern'}
@@ -104,11 +117,11 @@ class AlpacaTradingAgent:
                         self.config[key] = value
                 logger.info(f"Configuration chargée depuis {self.config_file}")
                 
-                # Si des clés API sont présentes, initialiser automatiquement l'API
+                # Si des clés API sont présentes, l'API sera initialisée automatiquement au premier usage
                 if (self.config['paper_api_key'] and self.config['paper_secret_key']) or \
                    (self.config['live_api_key'] and self.config['live_secret_key']):
-                    logger.info("Clés API détectées, initialisation automatique...")
-                    self._initialize_api()
+                    logger.info("Clés API détectées, initialisation automatique au premier usage...")
+                    self._api_pending = True
                     
             except json.JSONDecodeError as e:
                 logger.error(f"Erreur de décodage JSON dans {self.config_file}: {e}. Utilisation de la configuration par défaut.")
@@ -118,6 +131,20 @@ class AlpacaTradingAgent:
             logger.info(f"Fichier de configuration {self.config_file} non trouvé. Création avec la configuration par défaut.")
             self._save_config()  # Sauvegarder la configuration par défaut si le fichier n'existe pas
 
+    @property
+    def api(self):
+        """Client REST Alpaca, connecté au premier accès si des clés sont configurées"""
+        if self._api is None and self._api_pending:
+            with self._api_lock:
+                if self._api is None and self._api_pending:
+                    self._api_pending = False
+                    self._initialize_api()
+        return self._api
+    
+    @api.setter
+    def api(self, value):
+        self._api = value
+    
     def _save_config(self):
         """Sauvegarde la configuration actuelle dans un fichier JSON."""
         try:
@@ -163,6 +190,7 @@ class AlpacaTradingAgent:
             if not api_key or not secret_key:
                 return {'success': False, 'message': 'Clés API manquantes'}
             
+            import alpaca_trade_api as tradeapi
             self.api = tradeapi.REST(
                 api_key,
                 secret_key,
@@ -309,6 +337,8 @@ class AlpacaTradingAgent:
             )
             
             logger.info(f"Ordre placé: {side} {qty} {symbol}")
+            event_bus.publish(ORDER_SUBMITTED, {'order_id': order.id, 'symbol': symbol, 'qty': qty, 'side': side})
+            self._watch_order_fill(order.id, symbol, side)
             
             # Mise à jour du portefeuille
             self._update_portfolio()
@@ -326,6 +356,32 @@ class AlpacaTradingAgent:
             logger.error(f"Erreur placement ordre: {e}")
             return {'success': False, 'message': str(e)}
     
+    def _watch_order_fill(self, order_id: str, symbol: str, side: str, timeout: float = 60.0):
+        """Publie l'exécution de l'ordre dès qu'Alpaca la confirme (suivi en arrière-plan)"""
+        def watch():
+            deadline = time_module.time() + timeout
+            while time_module.time() < deadline:
+                try:
+                    order = self.api.get_order(order_id)
+                    if order.status == 'filled':
+                        event_bus.publish(ORDER_FILLED, {
+                            'order_id': order_id,
+                            'symbol': symbol,
+                            'side': side,
+                            'filled_qty': float(order.filled_qty or 0),
+                            'filled_avg_price': float(order.filled_avg_price or 0)
+                        })
+                        return
+                    if order.status in ('canceled', 'expired', 'rejected'):
+                        logger.warning(f"Ordre {side} {symbol} non exécuté: {order.status}")
+                        return
+                except Exception as e:
+                    logger.error(f"Erreur suivi ordre {order_id}: {e}")
+                time_module.sleep(1)
+            logger.warning(f"Ordre {side} {symbol} toujours en attente après {timeout:.0f}s")
+        
+        threading.Thread(target=watch, daemon=True).start()
+    
     def calculate_investment_amount(self, symbol: str) -> Tuple[int, float]:
         """Calcule le montant et la quantité à investir"""
         try:
@@ -727,82 +783,70 @@ class AlpacaTradingAgent:
         """
         CORRECTION ROBUSTE: Attend la recommandation finale avec timeout optionnel
         Si max_wait_time est None, attente infinie jusqu'à réception de la recommandation
+        
+        Attente sur le bus d'événements interne: réveil dès la publication de la
+        recommandation par l'analyse des finalistes (plus d'interrogation HTTP du serveur local)
         """
         try:
             if not use_recommendation:
                 logger.info("Option 'utiliser la recommandation finale' désactivée - pas d'attente")
                 return None
-                
-            import requests
             
             if max_wait_time is None:
                 logger.info("🔍 ATTENTE RECOMMANDATION FINALE (SANS TIMEOUT - attente infinie)")
             else:
                 logger.info(f"🔍 ATTENTE RECOMMANDATION FINALE (timeout: {max_wait_time}s)")
-                
+            
             start_time = time_module.time()
-            consecutive_errors = 0
-            max_consecutive_errors = 10  # Plus tolérant aux erreurs
+            last_log = start_time
+            sequence = event_bus.last_sequence(RECOMMENDATION_READY)
+            symbol = self._current_recommendation_symbol()  # Recommandation déjà disponible
             
-            while True:
+            while not symbol:
+                elapsed_time = time_module.time() - start_time
+                
                 # Vérifier le timeout global SEULEMENT si max_wait_time est défini
-                if max_wait_time is not None:
-                    elapsed_time = time_module.time() - start_time
-                    if elapsed_time > max_wait_time:
-                        logger.warning(f"⏰ Timeout atteint ({max_wait_time}s) - Abandon de l'attente")
-                        return None
-                        
+                if max_wait_time is not None and elapsed_time > max_wait_time:
+                    logger.warning(f"⏰ Timeout atteint ({max_wait_time}s) - Abandon de l'attente")
+                    return None
+                
                 # Vérifier l'arrêt demandé par l'utilisateur
                 if self.stop_auto_trading:
                     logger.info("Attente de recommandation interrompue par l'utilisateur")
                     return None
-                    
-                try:
-                    # Interroger l'API pour la recommandation finale
-                    response = requests.get('http://localhost:5000/api/get-final-recommendation', timeout=15)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data.get('success') and data.get('recommendation'):
-                            symbol = data['recommendation'].get('symbol')
-                            if symbol:
-                                elapsed_time = time_module.time() - start_time
-                                logger.info(f"✅ RECOMMANDATION FINALE REÇUE: {symbol} (après {elapsed_time:.1f}s)")
-                                return symbol
-                    
-                    # Réinitialiser le compteur d'erreurs en cas de succès
-                    consecutive_errors = 0
-                    
-                    # Afficher le statut de l'analyse pour information
-                    try:
-                        status_response = requests.get('http://localhost:5000/api/status', timeout=5)
-                        if status_response.status_code == 200:
-                            status_data = status_response.json()
-                            phase = status_data.get('phase', 'unknown')
-                            analyzed = status_data.get('analyzed_stocks', 0)
-                            total = status_data.get('total_stocks', 0)
-                            elapsed_time = time_module.time() - start_time
-                            logger.info(f"📊 Statut analyse: {phase} ({analyzed}/{total}) - Attente: {elapsed_time:.0f}s")
-                    except:
-                        pass  # Ignorer les erreurs de statut
-                    
-                except requests.exceptions.RequestException as e:
-                    consecutive_errors += 1
-                    logger.warning(f"Erreur communication API ({consecutive_errors}/{max_consecutive_errors}): {e}")
-                    
-                    # Si trop d'erreurs consécutives, abandonner
-                    if consecutive_errors >= max_consecutive_errors:
-                        logger.error(f"Trop d'erreurs consécutives ({max_consecutive_errors}) - Abandon de l'attente")
-                        return None
                 
-                # Attendre avant de réessayer (intervalle adaptatif)
-                wait_time = min(15, 5 + consecutive_errors)  # 5-15 secondes selon les erreurs
-                time_module.sleep(wait_time)
+                if time_module.time() - last_log >= RECOMMENDATION_WAIT_LOG_INTERVAL:
+                    logger.info(f"⏳ Recommandation finale toujours attendue - Attente: {elapsed_time:.0f}s")
+                    last_log = time_module.time()
+                
+                # Réveil à la publication, ou périodiquement pour l'arrêt et le timeout
+                wait_time = RECOMMENDATION_WAKEUP_INTERVAL
+                if max_wait_time is not None:
+                    wait_time = max(0.0, min(wait_time, max_wait_time - elapsed_time))
+                record = event_bus.wait_for(RECOMMENDATION_READY, timeout=wait_time, after_sequence=sequence)
+                if record:
+                    sequence = record['sequence']
+                    symbol = self._current_recommendation_symbol(record['payload'])
+            
+            logger.info(f"✅ RECOMMANDATION FINALE REÇUE: {symbol} (après {time_module.time() - start_time:.1f}s)")
+            return symbol
                 
         except Exception as e:
             logger.error(f"Erreur attente recommandation: {e}")
             return None
     
+    def _current_recommendation_symbol(self, payload: Optional[Dict] = None) -> Optional[str]:
+        """
+        Symbole de la recommandation finale affichable (seuil de score appliqué par le serveur),
+        lu via la source enregistrée par l'API; à défaut, symbole porté par l'événement publié
+        """
+        if self.recommendation_source:
+            data = self.recommendation_source()
+            if data.get('success') and data.get('recommendation'):
+                return data['recommendation'].get('symbol')
+            return None
+        return (payload or {}).get('symbol')
+    
     def _auto_trading_with_immediate_buy(self, symbol: str) -> None:
         """
         CORRECTION ROBUSTE: Mode auto trading avec achat immédiat dès réception de la recommandation
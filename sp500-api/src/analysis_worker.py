@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Processus d'Analyse Dédié pour le Bot Trading SP500
+Déploiement séparé optionnel, choisi par la variable ANALYSIS_WORKER_MODE:
+- "inline" (défaut): serveur Flask, orchestrateur, horloges et trading dans un seul processus
+- "worker": ce processus possède l'orchestrateur, les horloges et la surveillance des positions;
+  il exécute les requêtes API relayées par le serveur web et publie un instantané du statut
+- "web": le serveur Flask relaie les requêtes API au worker par IPC locale
+  et sert /api/status depuis l'instantané partagé (aucun calcul d'analyse dans ce processus)
+
+Un seul processus détient l'état, les horloges et le trading: le leader, élu par un verrou
+de fichier exclusif (LeaderLock). Déploiement multi-processus: voir gunicorn.conf.py
+
+Liaison web <-> worker: boucle locale uniquement, authentifiée par un secret obligatoire
+(ANALYSIS_WORKER_AUTHKEY); les messages sont des trames JSON et des corps en octets bruts,
+jamais des objets sérialisés par pickle (le worker détient les clés Alpaca)
+"""
+
+import os
+import json
+import time
+import ipaddress
+import tempfile
+import threading
+import logging
+from multiprocessing.connection import Client, Listener
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from event_stream import STREAM_BOOT_ID
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+WORKER_MODE = os.getenv('ANALYSIS_WORKER_MODE', 'inline').lower()
+# IPC locale: boucle locale TCP (fonctionne aussi sous Windows, contrairement aux sockets Unix)
+WORKER_ADDRESS = (os.getenv('ANALYSIS_WORKER_HOST', '127.0.0.1'), int(os.getenv('ANALYSIS_WORKER_PORT', '6001')))
+# Secret partagé sans valeur par défaut (gunicorn.conf.py en génère un pour ses processus)
+WORKER_AUTHKEY = os.getenv('ANALYSIS_WORKER_AUTHKEY', '').encode()
+WORKER_AUTHKEY_MIN_LENGTH = 16
+SNAPSHOT_PATH = os.getenv('ANALYSIS_SNAPSHOT_PATH', os.path.join(tempfile.gettempdir(), 'sp500_status_snapshot.json'))
+SNAPSHOT_INTERVAL = 0.5  # Secondes entre deux publications de l'instantané
+SNAPSHOT_STALE_AFTER = 10.0  # Instantané considéré périmé (worker arrêté) au-delà de ce délai
+LEADER_LOCK_PATH = os.getenv('ANALYSIS_LEADER_LOCK', os.path.join(tempfile.gettempdir(), 'sp500_analysis_leader.lock'))
+LEADER_POLL_INTERVAL = 2.0  # Secondes entre deux tentatives d'un processus en attente du rôle de leader
+EVENTS_HEARTBEAT = 15.0     # Trame vide sur l'abonnement aux événements (détection d'une liaison morte)
+EVENTS_RETRY_DELAY = 2.0    # Secondes avant de se réabonner après une coupure
+
+# En-têtes recalculés par le serveur web
+HOP_BY_HOP_HEADERS = {'content-length', 'connection', 'transfer-encoding'}
+
+class WorkerUnavailableError(Exception):
+    """Le processus d'analyse ne répond pas"""
+
+def check_worker_link(address: Tuple[str, int], authkey: bytes):
+    """Refuse une liaison sans secret explicite ou exposée hors de la boucle locale"""
+    if len(authkey) < WORKER_AUTHKEY_MIN_LENGTH:
+        raise RuntimeError(f"ANALYSIS_WORKER_AUTHKEY requis en mode worker/web "
+                           f"(secret aléatoire d'au moins {WORKER_AUTHKEY_MIN_LENGTH} caractères)")
+    host = address[0]
+    try:
+        loopback = host == 'localhost' or ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        loopback = False
+    if not loopback:
+        raise RuntimeError(f"ANALYSIS_WORKER_HOST doit être une adresse de boucle locale (reçu: {host})")
+
+def send_message(connection, header: Dict, body: bytes = None):
+    """Trame d'en-tête JSON, suivie du corps brut s'il est fourni"""
+    connection.send_bytes(json.dumps(header).encode('utf-8'))
+    if body is not None:
+        connection.send_bytes(body)
+
+def recv_message(connection) -> Dict:
+    return json.loads(connection.recv_bytes().decode('utf-8'))
+
+def write_snapshot(payload: bytes, path: str = SNAPSHOT_PATH):
+    """Publie l'instantané de façon atomique (les lecteurs ne voient jamais un fichier partiel)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+class LeaderLock:
+    """
+    Élection locale du leader (horloges, analyses planifiées, trading)
+
+    Verrou exclusif non bloquant sur un fichier: un seul processus de la machine le détient,
+    et le système le libère si ce processus meurt, ce qui permet à un processus en attente
+    de prendre le relais sans risque de double déclenchement des ordres.
+    """
+
+    def __init__(self, path: str = LEADER_LOCK_PATH):
+        self.path = path
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def try_acquire(self) -> bool:
+        """Tente de devenir leader; retourne True si le verrou est (déjà) détenu par ce processus"""
+        if self._file:
+            return True
+        f = open(self.path, 'a+')
+        try:
+            if os.name == 'nt':
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        # Identifiant du leader, pour le diagnostic des processus en attente
+        f.seek(0)
+        f.truncate()
+        f.write(f"{os.getpid()}\n")
+        f.flush()
+        self._file = f
+        return True
+
+    def acquire(self, on_wait: Optional[Callable[[Optional[int]], None]] = None):
+        """Attend le rôle de leader (bloquant); `on_wait` reçoit le PID du leader actuel au premier échec"""
+        if self.try_acquire():
+            return
+        if on_wait:
+            on_wait(self.holder())
+        while not self.try_acquire():
+            time.sleep(LEADER_POLL_INTERVAL)
+
+    def holder(self) -> Optional[int]:
+        """PID du leader actuel (None si inconnu)"""
+        try:
+            with open(self.path) as f:
+                content = f.read().strip()
+            return int(content) if content.isdigit() else None
+        except OSError:
+            return None
+
+    def release(self):
+        if not self._file:
+            return
+        try:
+            if os.name == 'nt':
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+class WorkerClient:
+    """Côté serveur web: relaie les requêtes au worker et lit l'instantané partagé"""
+
+    def __init__(self, address: Tuple[str, int] = WORKER_ADDRESS, authkey: bytes = WORKER_AUTHKEY,
+                 snapshot_path: str = SNAPSHOT_PATH):
+        check_worker_link(address, authkey)
+        self.address = address
+        self.authkey = authkey
+        self.snapshot_path = snapshot_path
+        self._local = threading.local()  # Une connexion par thread du serveur web
+        self._snapshot_cache: Tuple[int, bytes] = (0, b'')
+        self._snapshot_lock = threading.Lock()
+
+    def forward(self, method: str, path: str, query_string: bytes, body: bytes,
+                headers: Dict[str, str]) -> Tuple[int, List[Tuple[str, str]], Union[bytes, Iterator[bytes]]]:
+        """
+        Exécute une requête API dans le worker; retourne (code, en-têtes, corps)
+
+        Le corps d'une réponse en flux (NDJSON) est un itérateur de fragments, transmis au fil
+        de leur production par le worker.
+        """
+        request = {'method': method, 'path': path, 'query_string': query_string.decode('latin-1'), 'headers': headers}
+        for attempt in range(2):
+            try:
+                connection = self._connection()
+                send_message(connection, request, body)
+                reply = recv_message(connection)
+                headers = [tuple(header) for header in reply['headers']]
+                if reply.get('streamed'):
+                    return reply['status'], headers, self._stream_chunks(connection)
+                return reply['status'], headers, connection.recv_bytes()
+            except (EOFError, OSError) as e:
+                # Worker redémarré: une seule reconnexion
+                self._local.connection = None
+                if attempt:
+                    raise WorkerUnavailableError(f"Processus d'analyse injoignable: {e}")
+
+    def relay_events(self, publish: Callable[[str, str], Any], on_resync: Callable[[], Any]):
+        """
+        Abonnement aux événements du processus d'analyse, republiés localement (bloquant)
+
+        Une connexion dédiée reçoit les événements déjà sérialisés. Après une coupure, la reprise se fait
+        depuis le dernier numéro reçu; si des événements ont été perdus (journal évincé, worker redémarré),
+        `on_resync` est appelé pour que les clients repartent d'un statut complet.
+        """
+        boot, seq = None, None
+        while True:
+            try:
+                with Client(self.address, authkey=self.authkey) as connection:
+                    send_message(connection, {'subscribe': 'events', 'boot': boot, 'since': seq}, b'')
+                    while True:
+                        frame = recv_message(connection)
+                        if frame.get('gap'):
+                            on_resync()
+                        boot = frame.get('boot', boot)
+                        for seq, event, payload in frame.get('events', []):
+                            publish(event, payload)
+                        seq = frame.get('seq', seq)
+            except (EOFError, OSError, ValueError):
+                time.sleep(EVENTS_RETRY_DELAY)
+
+    def _stream_chunks(self, connection) -> Iterator[bytes]:
+        """Fragments d'une réponse en flux jusqu'au terminateur (fragment vide)"""
+        completed = False
+        try:
+            while True:
+                chunk = connection.recv_bytes()
+                if not chunk:
+                    completed = True
+                    return
+                yield chunk
+        finally:
+            if not completed:
+                # Client HTTP parti ou worker arrêté en cours de flux: la connexion n'est plus synchronisée.
+                # Sa fermeture interrompt l'envoi côté worker, qui annule le traitement.
+                connection.close()
+                self._local.connection = None
+
+    def read_snapshot(self) -> Optional[Tuple[bytes, float]]:
+        """Dernier instantané publié et son âge en secondes (None si aucun)"""
+        try:
+            stat = os.stat(self.snapshot_path)
+        except FileNotFoundError:
+            return None
+        with self._snapshot_lock:
+            if stat.st_mtime_ns != self._snapshot_cache[0]:
+                with open(self.snapshot_path, 'rb') as f:
+                    self._snapshot_cache = (stat.st_mtime_ns, f.read())
+            payload = self._snapshot_cache[1]
+        return payload, time.time() - stat.st_mtime
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = Client(self.address, authkey=self.authkey)
+            self._local.connection = connection
+        return connection
+
+class WorkerServer:
+    """Côté worker: exécute les requêtes relayées dans l'application Flask locale et publie le statut"""
+
+    def __init__(self, app, build_snapshot: Callable[[], bytes], event_stream=None,
+                 on_subscribe: Optional[Callable[[], Any]] = None, address: Tuple[str, int] = WORKER_ADDRESS,
+                 authkey: bytes = WORKER_AUTHKEY, snapshot_path: str = SNAPSHOT_PATH):
+        """
+        Args:
+            app: Application Flask dont les routes sont exécutées pour le serveur web
+            build_snapshot (Callable): Construit le corps JSON de /api/status
+            event_stream (EventStream): Journal d'événements relayé aux serveurs web abonnés
+            on_subscribe (Callable): Appelé à chaque abonnement (démarrage de la publication des événements)
+        """
+        check_worker_link(address, authkey)
+        self.app = app
+        self.build_snapshot = build_snapshot
+        self.event_stream = event_stream
+        self.on_subscribe = on_subscribe
+        self.address = address
+        self.authkey = authkey
+        self.snapshot_path = snapshot_path
+        self.running = False
+        self.logger = logging.getLogger(__name__)
+
+    def serve_forever(self):
+        """Publie l'instantané en continu et sert les connexions du serveur web (bloquant)"""
+        self.running = True
+        threading.Thread(target=self._publish_snapshots, daemon=True, name="sp500-snapshot").start()
+
+        with Listener(self.address, authkey=self.authkey) as listener:
+            self.logger.info(f"🛠️ Processus d'analyse à l'écoute sur {self.address[0]}:{self.address[1]}")
+            while self.running:
+                try:
+                    connection = listener.accept()
+                except Exception as e:
+                    self.logger.warning(f"Connexion refusée: {e}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(connection,), daemon=True).start()
+
+    def _serve_connection(self, connection):
+        """Traite les requêtes d'une connexion jusqu'à sa fermeture"""
+        client = self.app.test_client()
+        with connection:
+            while True:
+                try:
+                    request = recv_message(connection)
+                    body = connection.recv_bytes()
+                except (EOFError, OSError, ValueError):
+                    return  # Fermée, ou trame invalide: connexion abandonnée
+                if request.get('subscribe') == 'events':
+                    self._serve_events(connection, request)
+                    return
+                response = None
+                try:
+                    response = client.open(request['path'], method=request['method'],
+                                           query_string=request['query_string'], data=body,
+                                           headers=request['headers'])
+                    headers = [(k, v) for k, v in response.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS]
+                    # Le client de test expose tout corps comme un itérateur: une réponse produite par un
+                    # générateur se reconnaît à l'absence de Content-Length
+                    if 'Content-Length' not in response.headers:
+                        if not self._send_stream(connection, response, headers):
+                            return
+                        continue
+                    reply = ({'status': response.status_code, 'headers': headers, 'streamed': False}, response.get_data())
+                except Exception as e:
+                    body = json.dumps({'success': False, 'message': f'Erreur: {str(e)}'}).encode()
+                    reply = ({'status': 500, 'headers': [('Content-Type', 'application/json')], 'streamed': False}, body)
+                try:
+                    send_message(connection, *reply)
+                except OSError:
+                    return
+
+    def _send_stream(self, connection, response, headers: List[Tuple[str, str]]) -> bool:
+        """
+        Transmet une réponse en flux fragment par fragment, terminée par un fragment vide
+
+        Returns:
+            bool: False si la connexion est rompue (le flux est fermé, ce qui annule sa production)
+        """
+        try:
+            send_message(connection, {'status': response.status_code, 'headers': headers, 'streamed': True})
+            for chunk in response.response:
+                if chunk:
+                    connection.send_bytes(chunk if isinstance(chunk, bytes) else chunk.encode('utf-8'))
+        except OSError:
+            response.close()
+            return False
+        except Exception as e:
+            # En-tête déjà envoyé: le flux est terminé tel quel (le client voit une réponse tronquée)
+            self.logger.error(f"Erreur pendant la réponse en flux: {e}")
+        response.close()
+        try:
+            connection.send_bytes(b'')
+        except OSError:
+            return False
+        return True
+
+    def _serve_events(self, connection, request: Dict):
+        """Envoie les événements publiés dans ce processus jusqu'à la fermeture de la connexion"""
+        if self.event_stream is None:
+            return
+        if self.on_subscribe:
+            self.on_subscribe()
+        since = request.get('since')
+        # Reprise seulement dans le même démarrage; sinon, à partir des prochains événements
+        resumed = request.get('boot') == STREAM_BOOT_ID and isinstance(since, int) and since <= self.event_stream.last_seq()
+        seq = since if resumed else self.event_stream.last_seq()
+        try:
+            send_message(connection, {'boot': STREAM_BOOT_ID, 'seq': seq, 'gap': request.get('boot') is not None and not resumed})
+            while self.running:
+                events, gap = self.event_stream.read_since(seq, EVENTS_HEARTBEAT)
+                if events:
+                    seq = events[-1][0]
+                send_message(connection, {'events': events, 'seq': seq, 'gap': gap})
+        except OSError:
+            return
+
+    def _publish_snapshots(self):
+        """Republie le statut dès qu'il change (vérifié toutes les SNAPSHOT_INTERVAL secondes)"""
+        last_payload = None
+        last_write = 0.0
+        while self.running:
+            try:
+                payload = self.build_snapshot()
+                # Réécrit aussi périodiquement pour que l'âge de l'instantané prouve que le worker est vivant
+                if payload != last_payload or time.time() - last_write > SNAPSHOT_STALE_AFTER / 2:
+                    write_snapshot(payload, self.snapshot_path)
+                    last_payload = payload
+                    last_write = time.time()
+            except Exception as e:
+                self.logger.error(f"Erreur publication instantané: {e}")
+            time.sleep(SNAPSHOT_INTERVAL)
@@ -10,19 +10,28 @@ import time
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass, asdict
 import threading
 from threading import Timer
+from concurrent.futures import ThreadPoolExecutor, Future
 import os
 import sys
 from collections import defaultdict, Counter
 import random
+import heapq
+import queue
+import bisect
+import base64
 
 # Import du nouveau système avancé V3
 from individual_agent_v2 import AdvancedIndividualAgentV3
+from scan_checkpoint import ScanCheckpoint
+from scan_deadline import ScanDeadline, build_completeness
+from fetch_control import AIMDConcurrencyController
+from event_stream import event_stream
 
 @dataclass
 class EquitableAnalysisResult:
@@ -66,6 +75,53 @@ class EquitableAnalysisResult:
     
     # NOUVEAU V3 - avec valeurs par défaut (DOIT être à la fin)
     momentum_score: float = 50.0
+    base_equitable_score: float = 0.0  # Score brut avant bonus de diversité (passe 1)
+    diversity_bonus: float = 0.0       # Bonus appliqué en passe 2
+    analysis_depth: str = 'full'       # 'light' si analysé en mode allégé sous échéance
+
+def result_to_record(result: EquitableAnalysisResult) -> Dict:
+    """Sérialise un résultat pour le journal de reprise"""
+    record = asdict(result)
+    record['timestamp'] = result.timestamp.isoformat()
+    return record
+
+def result_from_record(record: Dict) -> EquitableAnalysisResult:
+    """Reconstruit un résultat depuis le journal de reprise"""
+    fields = {key: value for key, value in record.items() if key in EquitableAnalysisResult.__dataclass_fields__}
+    fields['timestamp'] = datetime.fromisoformat(fields['timestamp'])
+    return EquitableAnalysisResult(**fields)
+
+def result_to_summary(result: EquitableAnalysisResult) -> Dict:
+    """Vue API d'un résultat (scores arrondis, trois premiers motifs)"""
+    return {
+        'symbol': result.symbol,
+        'equitable_score': round(result.equitable_score, 1),
+        'overall_score': round(result.overall_score, 1),
+        'momentum_score': round(result.momentum_score, 1),
+        'base_equitable_score': round(result.base_equitable_score, 1),
+        'diversity_bonus': round(result.diversity_bonus, 1),
+        'component_scores': {
+            'rsi': round(result.rsi_score, 1),
+            'macd': round(result.macd_score, 1),
+            'bollinger': round(result.bollinger_score, 1),
+            'ma': round(result.ma_score, 1),
+            'volume': round(result.volume_score, 1),
+            'pattern': round(result.pattern_score, 1),
+            'risk': round(result.risk_score, 1)
+        },
+        'recommendation': result.recommendation,
+        'confidence': round(result.confidence, 2),
+        'sector': result.sector,
+        'quintile': result.quintile_name,
+        'market_cap': result.market_cap,
+        'price': result.price,
+        'change_percent': result.change_percent,
+        'buy_signals': result.buy_signals,
+        'sell_signals': result.sell_signals,
+        'reasoning': result.reasoning[:3],
+        'analysis_version': result.analysis_version,
+        'analysis_depth': result.analysis_depth
+    }
 
 @dataclass
 class DiversityMetrics:
@@ -111,6 +167,23 @@ class AdvancedSystemStatus:
     # Nouveaux paramètres V3
     precise_settings: Dict = None
     score_distribution: Dict[str, int] = None
+    
+    # Scan priorisé et convergence du Top K (NOUVEAU V3)
+    convergence: Dict = None
+    
+    # Complétude du scan (échéance, mode allégé) (NOUVEAU V3)
+    completeness: Dict = None
+    
+    # Symboles repris depuis le journal de reprise (NOUVEAU V3)
+    resumed_symbols: int = 0
+    
+    # Scan en entonnoir : préfiltre vectorisé et rappel mesuré (NOUVEAU V3)
+    funnel: Dict = None
+    
+    def __setattr__(self, name, value):
+        # Version incrémentée à chaque écriture: le statut composé de l'API n'est reconstruit qu'au changement
+        object.__setattr__(self, 'version', getattr(self, 'version', 0) + 1)
+        object.__setattr__(self, name, value)
 
 class PreciseDistributionEngine:
     """Moteur de distribution précise V3 pour équilibrer la sélection"""
@@ -134,16 +207,22 @@ class PreciseDistributionEngine:
         if not results:
             return DiversityMetrics(0, 0, 0.0, 0.0, {}, {}, 0.0, 1.0, 1.0, 0.0)
         
-        # Distribution par secteur
-        sector_counts = Counter([r.sector for r in results])
-        sectors_represented = len(sector_counts)
+        return self.calculate_diversity_metrics_from_counts(
+            Counter([r.sector for r in results]),
+            Counter([r.quintile_rank for r in results]),
+            sorted([r.equitable_score for r in results])
+        )
+    
+    def calculate_diversity_metrics_from_counts(self, sector_counts: Counter, quintile_counts: Counter,
+                                                sorted_scores: List[float]) -> DiversityMetrics:
+        """Métriques de diversité à partir des compteurs maintenus incrémentalement (NOUVEAU V3)"""
+        total_count = sum(sector_counts.values())
+        if total_count == 0:
+            return DiversityMetrics(0, 0, 0.0, 0.0, {}, {}, 0.0, 1.0, 1.0, 0.0)
         
-        # Distribution par quintile
-        quintile_counts = Counter([r.quintile_rank for r in results])
+        sectors_represented = len(sector_counts)
         quintiles_represented = len(quintile_counts)
         
-        total_count = len(results)
-        
         # Concentrations maximales
         max_sector_concentration = max(sector_counts.values()) / total_count * 100
         max_quintile_concentration = max(quintile_counts.values()) / total_count * 100
@@ -153,7 +232,7 @@ class PreciseDistributionEngine:
         herfindahl_index = sum(share ** 2 for share in sector_shares)
         
         # Coefficient de Gini (inégalité) - NOUVEAU V3
-        scores = sorted([r.equitable_score for r in results])
+        scores = sorted_scores
         n = len(scores)
         gini_coefficient = 0.0
         if n > 1:
@@ -218,6 +297,610 @@ class PreciseDistributionEngine:
         quintile_balance = max(0, 50 - quintile_std * 2)
         
         return (sector_balance + quintile_balance) / 2
+    
+    def apply_diversity_bonuses(self, results: List[EquitableAnalysisResult], settings: Dict) -> List[EquitableAnalysisResult]:
+        """Passe 2 : applique les bonus de diversité sur le jeu complet de résultats (NOUVEAU V3)
+        
+        Les scores bruts de la passe 1 ne dépendent pas de l'ordre de traitement ; le rang
+        dans le secteur et la concentration sectorielle sont calculés ici sur l'ensemble,
+        ce qui rend le score final déterministe quel que soit le parallélisme du scan.
+        """
+        if not results:
+            return results
+        
+        df = pd.DataFrame({
+            'symbol': [r.symbol for r in results],
+            'sector': [r.sector for r in results],
+            'quintile': [r.quintile_rank for r in results],
+            'base': [r.base_equitable_score for r in results]
+        })
+        
+        # Rang dans le secteur par score brut décroissant (symbole en départage)
+        ordered = df.sort_values(['sector', 'base', 'symbol'], ascending=[True, False, True])
+        sector_rank = ordered.groupby('sector').cumcount().reindex(df.index)
+        
+        if settings.get('diversity_bonus_enabled', True):
+            # Bonus par quintile de capitalisation
+            quintile_bonus = df['quintile'].map({
+                1: 0.0,
+                2: settings['quintile_bonus_large_mid_2'],
+                3: settings['quintile_bonus_large_mid'],
+                4: settings['quintile_bonus_mid_cap'],
+                5: settings['quintile_bonus_small_cap']
+            }).fillna(0.0)
+            
+            # Bonus de représentation sectorielle (trois meilleurs de chaque secteur)
+            sector_bonus = sector_rank.map({
+                0: settings['sector_bonus_first'],
+                1: settings['sector_bonus_second'],
+                2: settings['sector_bonus_third']
+            }).fillna(0.0)
+            
+            # Pénalité anti-concentration sur la part du secteur dans le jeu complet
+            sector_share = df.groupby('sector')['symbol'].transform('size') / len(df)
+            max_share = self.distribution_targets['max_sector_concentration'] / 100
+            concentration_penalty = pd.Series(np.select(
+                [sector_share > max_share, sector_share > 0.15],
+                [settings['anti_concentration_penalty'], settings['anti_concentration_penalty_moderate']],
+                default=0.0
+            ), index=df.index)
+            
+            bonus = (quintile_bonus + sector_bonus + concentration_penalty).round(1)
+        else:
+            bonus = pd.Series(0.0, index=df.index)
+        
+        final_scores = np.minimum(100.0, df['base'] + bonus).round(1)
+        
+        for i, result in enumerate(results):
+            result.diversity_bonus = float(bonus.iat[i])
+            result.equitable_score = float(final_scores.iat[i])
+            result.sector_rank = int(sector_rank.iat[i]) + 1
+            result.recommendation, result.confidence = self._recommendation_from_score(
+                result.equitable_score, result.buy_signals, result.sell_signals, settings
+            )
+            if result.reasoning and result.reasoning[0].startswith('Score équitable'):
+                result.reasoning[0] = self._score_reasoning(result.equitable_score, settings)
+        
+        return results
+    
+    def _recommendation_from_score(self, score: float, buy_signals: List[str], sell_signals: List[str],
+                                   settings: Dict) -> Tuple[str, float]:
+        """Recommandation V3 recalculée après application des bonus (seuils précis)"""
+        signal_balance = len(buy_signals) - len(sell_signals)
+        
+        if score >= settings['strong_buy_threshold'] and signal_balance >= 2:
+            return "STRONG_BUY", 0.92
+        elif score >= settings['buy_threshold'] and signal_balance >= 1:
+            return "BUY", 0.84
+        elif score >= settings['weak_buy_threshold'] and signal_balance >= 0:
+            return "WEAK_BUY", 0.73
+        elif score <= settings['strong_sell_threshold'] and signal_balance <= -2:
+            return "STRONG_SELL", 0.92
+        elif score <= settings['sell_threshold'] and signal_balance <= -1:
+            return "SELL", 0.84
+        elif score <= settings['weak_sell_threshold'] and signal_balance <= 0:
+            return "WEAK_SELL", 0.73
+        else:
+            return "HOLD", 0.65
+    
+    def _score_reasoning(self, score: float, settings: Dict) -> str:
+        """Ligne de raisonnement sur le score équitable final"""
+        if score >= settings['strong_buy_threshold']:
+            return f"Score équitable excellent ({score:.1f}/100) - Signal STRONG_BUY"
+        elif score >= settings['buy_threshold']:
+            return f"Score équitable très élevé ({score:.1f}/100) - Signal BUY"
+        elif score >= settings['weak_buy_threshold']:
+            return f"Score équitable élevé ({score:.1f}/100) - Signal WEAK_BUY"
+        elif score <= settings['strong_sell_threshold']:
+            return f"Score équitable très faible ({score:.1f}/100) - Signal STRONG_SELL"
+        elif score <= settings['sell_threshold']:
+            return f"Score équitable faible ({score:.1f}/100) - Signal SELL"
+        elif score <= settings['weak_sell_threshold']:
+            return f"Score équitable bas ({score:.1f}/100) - Signal WEAK_SELL"
+        else:
+            return f"Score équitable neutre ({score:.1f}/100) - Position HOLD"
+
+class StreamingTopKSelector:
+    """Sélection incrémentale du Top K équilibré pendant le scan (NOUVEAU V3)
+    
+    Un tas borné par cellule (secteur, quintile) garde les meilleurs résultats arrivés,
+    plus un tas global de taille K pour le complément sans contraintes. Tout résultat
+    sélectionnable appartient à ce pool borné : la sélection provisoire ou finale ne
+    trie plus que ce pool, quel que soit le nombre de symboles analysés.
+    """
+    
+    def __init__(self, k: int, max_per_sector: int, max_per_quintile: Optional[int] = None,
+                 min_sectors: int = 0, relax_fill: bool = False):
+        self.k = k
+        self.max_per_sector = max_per_sector
+        self.max_per_quintile = max_per_quintile
+        self.min_sectors = min_sectors
+        self.relax_fill = relax_fill
+        self.cell_capacity = min(max_per_sector, max_per_quintile or max_per_sector)
+        
+        self.cell_heaps: Dict[Tuple[str, int], List] = {}
+        self.global_heap: List = []
+        self.sector_counts = Counter()
+        self.quintile_counts = Counter()
+        self.sorted_scores: List[float] = []
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def add(self, result: EquitableAnalysisResult):
+        """Intègre un résultat en O(log K)"""
+        with self._lock:
+            # Clé (score, -ordre) : à score égal, le dernier arrivé est évincé en premier
+            entry = (result.equitable_score, -self.count, result)
+            self.count += 1
+            
+            heap = self.cell_heaps.setdefault((result.sector, result.quintile_rank), [])
+            self._push_bounded(heap, entry, self.cell_capacity)
+            self._push_bounded(self.global_heap, entry, self.k)
+            
+            self.sector_counts[result.sector] += 1
+            self.quintile_counts[result.quintile_rank] += 1
+            bisect.insort(self.sorted_scores, result.equitable_score)
+    
+    def add_many(self, results: List[EquitableAnalysisResult]) -> 'StreamingTopKSelector':
+        for result in results:
+            self.add(result)
+        return self
+    
+    def reset_scores(self, scores: List[float]):
+        """Met à jour la distribution des scores après rescoring (passe 2)"""
+        with self._lock:
+            self.sorted_scores = sorted(scores)
+    
+    def select(self) -> List[EquitableAnalysisResult]:
+        """Sélection équilibrée sur le pool borné, avec les scores courants"""
+        with self._lock:
+            pool = {id(entry[2]): entry for heap in self.cell_heaps.values() for entry in heap}
+            pool.update({id(entry[2]): entry for entry in self.global_heap})
+        
+        # Ordre d'arrivée puis score décroissant (tri stable, comme le tri complet d'origine)
+        ordered = [entry[2] for entry in sorted(pool.values(), key=lambda e: -e[1])]
+        ordered.sort(key=lambda r: r.equitable_score, reverse=True)
+        
+        selected = []
+        selected_ids = set()
+        sector_counts = Counter()
+        quintile_counts = Counter()
+        
+        def pick(result):
+            selected.append(result)
+            selected_ids.add(id(result))
+            sector_counts[result.sector] += 1
+            quintile_counts[result.quintile_rank] += 1
+        
+        # Phase 1: garantir un minimum de secteurs représentés
+        if self.min_sectors:
+            for result in ordered:
+                if len(sector_counts) >= self.min_sectors:
+                    break
+                if result.sector not in sector_counts:
+                    pick(result)
+        
+        # Phase 2: meilleurs scores en respectant les limites
+        for result in ordered:
+            if len(selected) >= self.k:
+                break
+            if id(result) in selected_ids:
+                continue
+            if sector_counts[result.sector] >= self.max_per_sector:
+                continue
+            if self.max_per_quintile and quintile_counts[result.quintile_rank] >= self.max_per_quintile:
+                continue
+            pick(result)
+        
+        # Phase 3: compléter en assouplissant les contraintes
+        if self.relax_fill:
+            for result in ordered:
+                if len(selected) >= self.k:
+                    break
+                if id(result) not in selected_ids:
+                    pick(result)
+        
+        return selected[:self.k]
+    
+    def diversity_snapshot(self) -> Tuple[Counter, Counter, List[float]]:
+        """Copie cohérente des compteurs pour le calcul des métriques"""
+        with self._lock:
+            return Counter(self.sector_counts), Counter(self.quintile_counts), list(self.sorted_scores)
+    
+    @staticmethod
+    def _push_bounded(heap: List, entry: Tuple, capacity: int):
+        if len(heap) < capacity:
+            heapq.heappush(heap, entry)
+        elif entry[0] > heap[0][0]:
+            heapq.heapreplace(heap, entry)
+
+class ScanPriorityPlanner:
+    """Ordonnancement du scan par score attendu et détection de convergence du Top K (NOUVEAU V3)
+    
+    Le score attendu combine le score du run précédent et un instantané groupé
+    (gap d'ouverture, ratio de volume, volatilité récente) obtenu en une seule requête,
+    afin d'analyser en premier les gagnants probables.
+    """
+    
+    def __init__(self):
+        self.logger = logging.getLogger("ScanPriorityPlanner")
+        self.previous_scores: Dict[str, float] = {}
+        self.expected_scores: Dict[str, float] = {}
+        self.residuals: List[float] = []
+        self.last_top: Optional[List[str]] = None
+        self.stable_batches = 0
+        self.order_source = 'csv'
+        self.last_bulk: Optional[pd.DataFrame] = None  # Barres groupées du dernier instantané (réutilisées par le préfiltre)
+    
+    def build_order(self, symbols: List[str], use_snapshot: bool = True) -> List[str]:
+        """Trie les symboles par score attendu décroissant (ordre CSV en départage)"""
+        self.residuals = []
+        self.last_top = None
+        self.stable_batches = 0
+        
+        snapshot = self._fetch_bulk_snapshot(symbols) if use_snapshot else {}
+        
+        expected = {}
+        for symbol in symbols:
+            previous = self.previous_scores.get(symbol)
+            snapshot_score = snapshot.get(symbol)
+            if previous is not None and snapshot_score is not None:
+                expected[symbol] = 0.7 * previous + 0.3 * snapshot_score
+            elif previous is not None:
+                expected[symbol] = previous
+            elif snapshot_score is not None:
+                expected[symbol] = snapshot_score
+        
+        if not expected:
+            self.order_source = 'csv'
+            self.expected_scores = {}
+            return list(symbols)
+        
+        # Symboles sans information : score neutre
+        default_score = float(np.median(list(expected.values())))
+        self.expected_scores = {symbol: expected.get(symbol, default_score) for symbol in symbols}
+        self.order_source = '+'.join(
+            name for name, used in (('previous_run', bool(self.previous_scores)), ('snapshot', bool(snapshot))) if used
+        )
+        
+        return sorted(symbols, key=lambda sym: self.expected_scores[sym], reverse=True)
+    
+    def _fetch_bulk_snapshot(self, symbols: List[str]) -> Dict[str, float]:
+        """Instantané groupé (une requête) converti en score attendu 0-100"""
+        try:
+            import yfinance as yf
+            
+            # 3 mois de barres: le score attendu n'utilise que le dernier mois, le préfiltre l'historique complet
+            data = yf.download(
+                symbols, period="3mo", interval="1d",
+                group_by='ticker', threads=True, progress=False
+            )
+            self.last_bulk = data if data is not None and not data.empty else None
+            if self.last_bulk is None:
+                return {}
+            
+            scores = {}
+            for symbol in symbols:
+                try:
+                    bars = data[symbol].dropna().tail(21)
+                except KeyError:
+                    continue
+                if len(bars) < 5:
+                    continue
+                
+                close = bars['Close']
+                gap_pct = (bars['Open'].iloc[-1] / close.iloc[-2] - 1) * 100
+                volume_ratio = bars['Volume'].iloc[-1] / max(bars['Volume'].iloc[:-1].mean(), 1)
+                volatility_pct = close.pct_change().std() * 100
+                
+                score = 50.0
+                score += float(np.clip(gap_pct * 3, -15, 15))              # Gap d'ouverture
+                score += float(np.clip((volume_ratio - 1) * 10, -10, 10))  # Volume relatif
+                score += 5.0 if 1.0 <= volatility_pct <= 3.0 else -5.0     # Volatilité exploitable
+                scores[symbol] = score
+            
+            self.logger.info(f"📸 Instantané groupé: {len(scores)}/{len(symbols)} symboles")
+            return scores
+            
+        except Exception as e:
+            self.logger.warning(f"Instantané groupé indisponible, ordre sans snapshot: {e}")
+            return {}
+    
+    def observe(self, results: List[EquitableAnalysisResult]):
+        """Enregistre l'écart entre score observé et score attendu"""
+        for result in results:
+            expected = self.expected_scores.get(result.symbol)
+            if expected is not None:
+                self.residuals.append(result.equitable_score - expected)
+    
+    def record_run(self, results: List[EquitableAnalysisResult]):
+        """Mémorise les scores bruts du run pour ordonner le suivant"""
+        for result in results:
+            self.previous_scores[result.symbol] = result.base_equitable_score or result.equitable_score
+    
+    def check_convergence(self, top: List[EquitableAnalysisResult], remaining: List[str],
+                          required_stable_batches: int, bonus_margin: float = 0.0) -> Dict:
+        """Le Top K est stable si inchangé sur N batches et hors d'atteinte des symboles restants
+        
+        `bonus_margin`: écart maximal que des bonus appliqués après le scan (passe 2) peuvent créer
+        entre un symbole restant et le K-ième, ajouté à la borne des symboles restants
+        """
+        top_symbols = [r.symbol for r in top]
+        if top_symbols == self.last_top:
+            self.stable_batches += 1
+        else:
+            self.stable_batches = 0
+            self.last_top = top_symbols
+        
+        kth_score = top[-1].equitable_score if top else 0.0
+        
+        # Marge d'erreur du score attendu (2 écarts-types des résidus observés)
+        if len(self.residuals) >= 10 and remaining and self.expected_scores:
+            margin = 2 * float(np.std(self.residuals))
+            remaining_upper_bound = max(self.expected_scores.get(sym, 100.0) for sym in remaining) + margin
+        elif remaining:
+            remaining_upper_bound = 100.0
+        else:
+            remaining_upper_bound = 0.0
+        if remaining:
+            remaining_upper_bound += bonus_margin
+        
+        converged = (self.stable_batches >= required_stable_batches and
+                     kth_score >= remaining_upper_bound)
+        
+        return {
+            'converged': converged,
+            'stable_batches': self.stable_batches,
+            'kth_score': round(kth_score, 1),
+            'remaining_upper_bound': round(remaining_upper_bound, 1),
+            'remaining_symbols': len(remaining),
+            'bonus_margin': round(bonus_margin, 1),
+            'order_source': self.order_source
+        }
+
+class VectorizedPrefilter:
+    """Préfiltre vectorisé du scan en entonnoir (NOUVEAU V3)
+    
+    Étape rapide : RSI, momentum et volume relatif calculés en une passe sur les barres groupées
+    de tout l'univers (tableaux dates × symboles). Seuls les meilleurs X % passent à l'analyse
+    complète ; un audit périodique sans coupe mesure le rappel du préfiltre sur le scan complet.
+    """
+    
+    def __init__(self):
+        self.logger = logging.getLogger("VectorizedPrefilter")
+        self.last_scores: Dict[str, float] = {}
+        self.last_kept: set = set()
+        self.prefiltered_runs = 0
+        self.recall_history: List[Dict] = []
+    
+    def score_universe(self, bulk: Optional[pd.DataFrame], symbols: List[str]) -> Dict[str, float]:
+        """Score 0-100 par symbole (rang percentile combiné), calculé sans boucle par symbole"""
+        if bulk is None or not isinstance(bulk.columns, pd.MultiIndex):
+            return {}
+        
+        available = [sym for sym in symbols if sym in bulk.columns.get_level_values(0)]
+        if not available:
+            return {}
+        # Tableaux consolidés (un seul bloc numpy) : les opérations restent vectorisées sur tout l'univers
+        close = pd.DataFrame(bulk.xs('Close', axis=1, level=1)[available].to_numpy(dtype=float),
+                             index=bulk.index, columns=available)
+        volume = pd.DataFrame(bulk.xs('Volume', axis=1, level=1)[available].to_numpy(dtype=float),
+                              index=bulk.index, columns=available)
+        
+        # RSI 14 (Wilder) sur toutes les colonnes à la fois
+        delta = close.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+        rsi = (100 - 100 / (1 + gain / loss.replace(0, np.nan))).iloc[-1]
+        
+        momentum_5d = close.iloc[-1] / close.iloc[-6] - 1
+        momentum_20d = close.iloc[-1] / close.iloc[-21] - 1
+        volume_ratio = volume.iloc[-1] / volume.iloc[-21:-1].mean().replace(0, np.nan)
+        
+        # Même orientation que le scoring complet : survente, reprise récente, volume confirmant
+        components = pd.DataFrame({
+            'rsi': (100 - rsi).rank(pct=True),
+            'momentum': (momentum_5d - 0.5 * momentum_20d).rank(pct=True),
+            'volume': volume_ratio.rank(pct=True)
+        })
+        combined = (0.45 * components['rsi'] + 0.35 * components['momentum'] + 0.20 * components['volume'])
+        combined = combined.dropna()
+        return {sym: round(float(score) * 100, 2) for sym, score in combined.items()}
+    
+    def select(self, symbols: List[str], scores: Dict[str, float], keep_ratio: float) -> List[str]:
+        """Garde les meilleurs `keep_ratio` des symboles notés (les symboles sans barres sont gardés), ordre conservé"""
+        scored = sorted(scores, key=scores.get, reverse=True)
+        kept = set(scored[:max(1, int(round(len(scored) * keep_ratio)))])
+        kept.update(sym for sym in symbols if sym not in scores)
+        self.last_scores = scores
+        self.last_kept = kept
+        return [sym for sym in symbols if sym in kept]
+    
+    def measure_recall(self, results: List[EquitableAnalysisResult], keep_ratio: float) -> Optional[Dict]:
+        """Rappel du préfiltre sur un scan complet : part du Top K complet que le préfiltre aurait gardée"""
+        if not self.last_scores or not results:
+            return None
+        
+        full_scores = {r.symbol: r.base_equitable_score or r.equitable_score for r in results}
+        common = [sym for sym in full_scores if sym in self.last_scores]
+        if len(common) < 20:
+            return None
+        
+        ranked = sorted(full_scores, key=full_scores.get, reverse=True)
+        scored = sorted(self.last_scores, key=self.last_scores.get, reverse=True)
+        would_keep = set(scored[:max(1, int(round(len(scored) * keep_ratio)))])
+        would_keep.update(sym for sym in full_scores if sym not in self.last_scores)
+        
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'keep_ratio': keep_ratio,
+            'recall_at_10': round(len(set(ranked[:10]) & would_keep) / min(10, len(ranked)), 3),
+            'recall_at_20': round(len(set(ranked[:20]) & would_keep) / min(20, len(ranked)), 3),
+            # Corrélation de Spearman (Pearson sur les rangs, sans dépendance à scipy)
+            'rank_correlation': round(float(pd.Series(full_scores)[common].rank().corr(
+                pd.Series(self.last_scores)[common].rank())), 3),
+            'symbols_compared': len(common)
+        }
+        self.recall_history = (self.recall_history + [report])[-10:]
+        self.logger.info(f"🔎 Rappel du préfiltre ({keep_ratio:.0%} gardés): "
+                         f"@10={report['recall_at_10']:.0%} @20={report['recall_at_20']:.0%}")
+        return report
+
+class ResultsIndex:
+    """Index trié des résultats d'un scan terminé, pour la requête paginée (NOUVEAU V3)
+    
+    Construit une seule fois à la fin du scan : chaque résultat est sérialisé une fois, et pour
+    chaque composante de score on garde l'ordre croissant et décroissant (clés (valeur, symbole)),
+    globalement et par valeur de facette (secteur, quintile, recommandation). Une requête choisit
+    la vue la plus sélective, s'y positionne par dichotomie (curseur ou plage de scores) et ne
+    parcourt que la page demandée : O(log n + page).
+    """
+    
+    SORT_FIELDS = ('equitable_score', 'overall_score', 'momentum_score', 'base_equitable_score',
+                   'diversity_bonus', 'rsi_score', 'macd_score', 'bollinger_score', 'ma_score',
+                   'volume_score', 'pattern_score', 'risk_score', 'confidence', 'change_percent',
+                   'market_cap', 'price')
+    FACETS = ('sector', 'quintile', 'recommendation')
+    MAX_PAGE_SIZE = 100
+    
+    def __init__(self, results: List[EquitableAnalysisResult], generation: int):
+        self.source = results
+        self.count = len(results)
+        self.generation = generation  # Les curseurs d'un index précédent sont refusés
+        self.records = [result_to_summary(r) for r in results]
+        facet_values = [(r.sector, r.quintile_name, r.recommendation) for r in results]
+        
+        # vues[(facette, valeur) ou None][(champ, ordre)] = (clés triées, positions)
+        self.views: Dict[Optional[Tuple[str, str]], Dict[Tuple[str, str], Tuple[List, List[int]]]] = defaultdict(dict)
+        for field in self.SORT_FIELDS:
+            values = [self._sort_value(getattr(r, field)) for r in results]
+            for order, sign in (('asc', 1), ('desc', -1)):
+                ordered = sorted(range(self.count), key=lambda i: (sign * values[i], results[i].symbol))
+                buckets = defaultdict(lambda: ([], []))
+                for i in ordered:
+                    key = (sign * values[i], results[i].symbol)
+                    for bucket in [None] + list(zip(self.FACETS, facet_values[i])):
+                        keys, positions = buckets[bucket]
+                        keys.append(key)
+                        positions.append(i)
+                for bucket, view in buckets.items():
+                    self.views[bucket][(field, order)] = view
+        
+        # Nombre de résultats par valeur de facette (options de filtre pour le client)
+        self.facets = {facet: {} for facet in self.FACETS}
+        for bucket, views in self.views.items():
+            if bucket:
+                self.facets[bucket[0]][bucket[1]] = len(views[('equitable_score', 'desc')][0])
+    
+    def query(self, filters: Optional[Dict[str, str]] = None, sort: str = 'equitable_score', order: str = 'desc',
+              min_score: Optional[float] = None, max_score: Optional[float] = None,
+              score_field: str = 'equitable_score', limit: int = 20, cursor: Optional[str] = None) -> Dict:
+        """
+        Page de résultats filtrés et triés
+        
+        Args:
+            filters (Dict): Égalités sur les facettes (sector, quintile = nom du quintile, recommendation)
+            sort (str): Composante de score servant au tri
+            order (str): 'desc' ou 'asc' (à valeur égale, ordre alphabétique des symboles)
+            min_score, max_score (float): Plage de valeurs (bornes incluses) sur `score_field`
+            limit (int): Taille de page (MAX_PAGE_SIZE au plus)
+            cursor (str): Curseur opaque `next_cursor` de la page précédente
+            
+        Raises:
+            ValueError: Paramètre invalide ou curseur d'un autre index/tri
+        """
+        if sort not in self.SORT_FIELDS or score_field not in self.SORT_FIELDS:
+            raise ValueError(f"Champ de tri inconnu (valeurs possibles: {', '.join(self.SORT_FIELDS)})")
+        if order not in ('asc', 'desc'):
+            raise ValueError("Ordre invalide (asc ou desc)")
+        filters = {facet: value for facet, value in (filters or {}).items() if value not in (None, '')}
+        unknown = set(filters) - set(self.FACETS)
+        if unknown:
+            raise ValueError(f"Filtre inconnu: {', '.join(sorted(unknown))}")
+        limit = max(1, min(int(limit), self.MAX_PAGE_SIZE))
+        
+        # Vue la plus sélective parmi les facettes demandées ; les autres sont vérifiées pendant le parcours
+        candidates = [(facet, value) for facet, value in filters.items()]
+        if any(bucket not in self.views for bucket in candidates):
+            return self._page([], None, 0)
+        base = min(candidates, key=lambda b: len(self.views[b][(sort, order)][0]), default=None)
+        keys, positions = self.views[base][(sort, order)]
+        residual = [(facet, value) for facet, value in candidates if (facet, value) != base]
+        
+        # Plage sur le champ de tri : bornes par dichotomie, sinon filtre résiduel
+        sign = 1 if order == 'asc' else -1
+        start, end = 0, len(keys)
+        range_residual = None
+        if min_score is not None or max_score is not None:
+            low = float('-inf') if min_score is None else float(min_score)
+            high = float('inf') if max_score is None else float(max_score)
+            if score_field == sort:
+                first, last = (low, high) if sign == 1 else (-high, -low)
+                start = bisect.bisect_left(keys, (first,))
+                end = bisect.bisect_right(keys, (last, '\uffff'))
+            else:
+                range_residual = (score_field, low, high)
+        total = end - start if not residual and not range_residual else None
+        
+        if cursor:
+            start = max(start, bisect.bisect_right(keys, self._decode_cursor(cursor, sort, order)))
+        
+        page = []
+        i = start
+        while i < end and len(page) <= limit:
+            position = positions[i]
+            i += 1
+            if residual and not self._matches(position, residual):
+                continue
+            if range_residual:
+                value = getattr(self.source[position], range_residual[0])
+                if not range_residual[1] <= value <= range_residual[2]:
+                    continue
+            page.append((keys[i - 1], position))
+        
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = self._encode_cursor(sort, order, page[-1][0])
+        return self._page([self.records[position] for _, position in page], next_cursor, total)
+    
+    def _matches(self, position: int, residual: List[Tuple[str, str]]) -> bool:
+        record = self.records[position]
+        return all(record[facet] == value for facet, value in residual)
+    
+    def symbols_for(self, facet: str, value: str) -> List[str]:
+        """Symboles d'une valeur de facette (ex. secteur), par score équitable décroissant"""
+        view = self.views.get((facet, value))
+        return [self.records[i]['symbol'] for i in view[('equitable_score', 'desc')][1]] if view else []
+    
+    def _page(self, items: List[Dict], next_cursor: Optional[str], total: Optional[int]) -> Dict:
+        return {'items': items, 'next_cursor': next_cursor, 'total': total, 'indexed': self.count,
+                'generation': self.generation, 'facets': self.facets}
+    
+    def _encode_cursor(self, sort: str, order: str, key: Tuple[float, str]) -> str:
+        raw = json.dumps([self.generation, sort, order, key[0], key[1]])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+    
+    def _decode_cursor(self, cursor: str, sort: str, order: str) -> Tuple[float, str]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            generation, cursor_sort, cursor_order, value, symbol = json.loads(raw)
+        except Exception:
+            raise ValueError("Curseur invalide")
+        if generation != self.generation:
+            raise ValueError("Curseur expiré: un nouveau scan a remplacé les résultats")
+        if (cursor_sort, cursor_order) != (sort, order):
+            raise ValueError("Curseur obtenu avec un autre tri")
+        return (float(value), symbol)
+    
+    @staticmethod
+    def _sort_value(value) -> float:
+        # Valeurs manquantes ou non finies classées en dernier dans l'ordre décroissant
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return float('-inf')
+        return value if np.isfinite(value) else float('-inf')
 
 class AdvancedCentralOrchestratorV3:
     """Orchestrateur central avancé V3 COMPLET avec toutes les fonctions préservées"""
@@ -250,6 +933,36 @@ class AdvancedCentralOrchestratorV3:
         self.stop_flag = False
         self.analysis_thread = None
         
+        # Annulation coopérative : un événement par exécution, propagé aux agents
+        self.cancel_event = threading.Event()
+        self.run_id = 0  # Identifiant de l'exécution courante (une exécution remplacée ne touche plus au statut)
+        self.run_future: Optional[Future] = None  # Résolu à la fin de chaque scan (callbacks de fin de phase)
+        self.run_deadline: Optional[ScanDeadline] = None  # Échéance du scan en cours (mode anytime)
+        self.run_resume = False  # Reprise depuis le journal du dernier scan interrompu
+        
+        # Journaux de reprise (un par mode de scan)
+        self.checkpoints = {kind: ScanCheckpoint(kind) for kind in ('equitable', 'precise')}
+        self.active_checkpoint: Optional[ScanCheckpoint] = None  # Journal du scan en cours ou du dernier scan
+        
+        # Pool dédié aux appels réseau bloquants des agents (yfinance), limité par une fenêtre AIMD
+        self.fetch_controller = AIMDConcurrencyController(initial_window=10, min_window=2, max_window=40)
+        self.io_executor = ThreadPoolExecutor(max_workers=self.fetch_controller.max_window, thread_name_prefix="sp500-io")
+        
+        # Sélecteur Top K incrémental alimenté pendant le scan
+        self.selector: Optional[StreamingTopKSelector] = None
+        self.selector_kind: Optional[str] = None
+        
+        # Ordonnancement du scan par score attendu
+        self.priority_planner = ScanPriorityPlanner()
+        
+        # Préfiltre vectorisé (étape rapide du scan en entonnoir)
+        self.prefilter = VectorizedPrefilter()
+        
+        # Index trié des résultats du dernier scan terminé (requête paginée)
+        self.results_index: Optional[ResultsIndex] = None
+        self.results_generation = 0
+        self._results_index_lock = threading.Lock()
+        
         # Statistiques de performance
         self.performance_stats = {
             'total_analyses': 0,
@@ -303,12 +1016,20 @@ class AdvancedCentralOrchestratorV3:
             'momentum_weight': 0.15,
             'diversity_bonus_enabled': True,
             'anti_concentration_penalty': -8.5,
+            'anti_concentration_penalty_moderate': -4.2,
             'sector_bonus_first': 12.7,
             'sector_bonus_second': 5.7,
+            'sector_bonus_third': 3.1,
             'quintile_bonus_small_cap': 16.4,
             'quintile_bonus_mid_cap': 11.8,
             'quintile_bonus_large_mid': 7.2,
-            'quintile_bonus_large_mid_2': 3.7
+            'quintile_bonus_large_mid_2': 3.7,
+            'priority_scan_enabled': True,       # Analyser d'abord les gagnants probables
+            'convergence_stable_batches': 3,     # Batches sans changement du Top K
+            'convergence_early_stop': False,     # Terminer le scan dès convergence (scan équitable ; le scan précis va au bout)
+            'prefilter_enabled': False,          # Entonnoir : préfiltre vectorisé avant l'analyse complète
+            'prefilter_keep_ratio': 0.25,        # Part de l'univers gardée pour l'analyse complète
+            'prefilter_audit_every': 5           # Un run préfiltré sur N analyse tout l'univers pour mesurer le rappel
         }
     
     def load_sp500_symbols_extended(self) -> List[str]:
@@ -524,19 +1245,26 @@ class AdvancedCentralOrchestratorV3:
     
     # ===== GESTION DES MODES AVANCÉS (PRÉSERVÉ INTÉGRALEMENT) =====
     
-    def configure_advanced_mode(self, mode: str, diversity_settings: Optional[Dict] = None) -> Dict:
+    def configure_advanced_mode(self, mode: str, diversity_settings: Optional[Dict] = None,
+                                precise_settings: Optional[Dict] = None) -> Dict:
         """Configure le mode d'opération avancé avec paramètres de diversité (PRÉSERVÉ)"""
         try:
             if mode not in ['manual', 'auto']:
                 return {'success': False, 'message': 'Mode invalide. Utilisez "manual" ou "auto"'}
             
+            if precise_settings:
+                keep_ratio = precise_settings.get('prefilter_keep_ratio', self.status.precise_settings['prefilter_keep_ratio'])
+                if not 0.05 <= keep_ratio <= 1.0:
+                    return {'success': False, 'message': 'prefilter_keep_ratio doit être entre 0.05 et 1.0'}
+                self.status.precise_settings.update(precise_settings)
+            
             # Configuration du mode
             self.status.mode = mode
-            self.status.last_update = datetime.now().isoformat()
             
             # Configuration de la diversité
             if diversity_settings:
                 self.status.diversity_settings.update(diversity_settings)
+            self.status.last_update = datetime.now().isoformat()
             
             self.logger.info(f"🔧 Mode configuré: {mode}")
             if diversity_settings:
@@ -545,7 +1273,8 @@ class AdvancedCentralOrchestratorV3:
             return {
                 'success': True, 
                 'message': f'Mode {mode} configuré avec succès',
-                'current_settings': self.status.diversity_settings
+                'current_settings': self.status.diversity_settings,
+                'precise_settings': self.status.precise_settings
             }
             
         except Exception as e:
@@ -595,12 +1324,19 @@ class AdvancedCentralOrchestratorV3:
                     'average_score': round(self.status.average_score, 1),
                     'total_results': len(self.status.analysis_results_500) if self.status.analysis_results_500 else 0
                 },
-                'diversity_metrics': asdict(self.status.diversity_metrics) if self.status.diversity_metrics else None,
+                # Dataclass sérialisée directement par l'encodeur JSON (pas de copie asdict à chaque statut)
+                'diversity_metrics': self.status.diversity_metrics,
                 'diversity_settings': self.status.diversity_settings,
                 'precise_settings': self.status.precise_settings,  # NOUVEAU V3
                 'score_distribution': self.status.score_distribution,  # NOUVEAU V3
                 'top_10_count': len(self.status.top_10_candidates) if self.status.top_10_candidates else 0,
-                'final_recommendation': self.status.final_recommendation
+                'final_recommendation': self.status.final_recommendation,
+                'provisional_selection': self.get_provisional_selection(),  # NOUVEAU V3
+                'convergence': self.status.convergence,  # NOUVEAU V3
+                'completeness': self.status.completeness,  # NOUVEAU V3
+                'resumed_symbols': self.status.resumed_symbols,
+                'fetch_concurrency': self.fetch_controller.get_status(),  # Fenêtre AIMD et latences observées
+                'funnel': self.status.funnel  # Préfiltre vectorisé et rappel mesuré
             }
             
         except Exception as e:
@@ -638,14 +1374,216 @@ class AdvancedCentralOrchestratorV3:
     
     # ===== ANALYSE ÉQUITABLE AVANCÉE (PRÉSERVÉ + AMÉLIORÉ V3) =====
     
-    async def start_equitable_analysis_500(self) -> Dict:
-        """Démarre l'analyse équitable des 500 actions S&P (PRÉSERVÉ)"""
+    def _begin_run(self) -> threading.Event:
+        """Prépare une nouvelle exécution avec son propre événement d'annulation"""
+        # Laisser au thread précédent (déjà annulé) une seconde pour se retirer proprement
+        if self.analysis_thread and self.analysis_thread.is_alive():
+            self.cancel_event.set()
+            self.analysis_thread.join(timeout=1.0)
+        
+        self.stop_flag = False
+        self.run_id += 1
+        self.cancel_event = threading.Event()
+        return self.cancel_event
+    
+    def _start_background_run(self, target, cancel_event: threading.Event) -> Future:
+        """Lance un scan en arrière-plan et retourne le future résolu à sa fin (succès, arrêt ou erreur)"""
+        run_future = Future()
+        self.run_future = run_future
+        run_id = self.run_id
+        
+        def runner():
+            try:
+                target(cancel_event, run_id)
+            finally:
+                run_future.set_result({
+                    'phase': 'stopped' if cancel_event.is_set() else self.status.phase,
+                    'cancelled': cancel_event.is_set(),
+                    'analyzed_stocks': len(self.status.analysis_results_500 or []),
+                    'top_count': len(self.status.top_10_candidates or [])
+                })
+        
+        self.analysis_thread = threading.Thread(target=runner)
+        self.analysis_thread.daemon = True
+        self.analysis_thread.start()
+        return run_future
+    
+    def _plan_scan_order(self) -> List[str]:
+        """Ordre de scan : gagnants probables d'abord si activé, sinon ordre CSV"""
+        if not self.status.precise_settings.get('priority_scan_enabled', True):
+            self.priority_planner.order_source = 'csv'
+            self.priority_planner.last_bulk = None
+            return list(self.sp500_symbols)
+        
+        symbols = self.priority_planner.build_order(self.sp500_symbols)
+        self.logger.info(f"🧭 Ordre de scan priorisé ({self.priority_planner.order_source}) - tête: {symbols[:5]}")
+        return symbols
+    
+    def _apply_prefilter(self, symbols: List[str]) -> List[str]:
+        """Étape rapide de l'entonnoir : ne garde que les meilleurs X % pour l'analyse complète
+        
+        Un run préfiltré sur N (le premier inclus) analyse tout l'univers pour mesurer le rappel.
+        """
+        settings = self.status.precise_settings
+        self.status.funnel = None
+        if not settings.get('prefilter_enabled', False):
+            return symbols
+        
+        keep_ratio = settings.get('prefilter_keep_ratio', 0.25)
+        if self.priority_planner.last_bulk is None:
+            self.priority_planner._fetch_bulk_snapshot(symbols)
+        scores = self.prefilter.score_universe(self.priority_planner.last_bulk, symbols)
+        if not scores:
+            self.logger.warning("⚠️ Préfiltre sans barres groupées - analyse complète de l'univers")
+            return symbols
+        
+        kept = self.prefilter.select(symbols, scores, keep_ratio)
+        audit_every = settings.get('prefilter_audit_every', 5)
+        audit = audit_every > 0 and self.prefilter.prefiltered_runs % audit_every == 0
+        self.prefilter.prefiltered_runs += 1
+        
+        selected = symbols if audit else kept
+        self.status.funnel = {
+            'enabled': True,
+            'audit_run': audit,
+            'universe': len(symbols),
+            'prefilter_kept': len(kept),
+            'analyzed': len(selected),
+            'keep_ratio': keep_ratio,
+            'work_saved_ratio': round(1 - len(selected) / len(symbols), 3),
+            'recall': self.prefilter.recall_history[-1] if self.prefilter.recall_history else None
+        }
+        
+        if audit:
+            self.logger.info(f"🔎 Run d'audit du préfiltre : {len(symbols)} symboles analysés pour mesurer le rappel")
+        else:
+            self.logger.info(f"🔻 Préfiltre : {len(kept)}/{len(symbols)} symboles gardés pour l'analyse complète")
+        return selected
+    
+    def _finish_funnel(self):
+        """Mesure le rappel du préfiltre à la fin d'un run d'audit"""
+        funnel = self.status.funnel
+        if funnel and funnel['audit_run']:
+            funnel['recall'] = self.prefilter.measure_recall(self.status.analysis_results_500, funnel['keep_ratio'])
+            funnel['recall_history'] = list(self.prefilter.recall_history)
+    
+    def _diversity_bonus_margin(self) -> float:
+        """Écart maximal de bonus de passe 2 entre deux symboles (meilleur bonus moins pire pénalité)"""
+        settings = self.status.precise_settings
+        if not settings.get('diversity_bonus_enabled', True):
+            return 0.0
+        best = settings['sector_bonus_first'] + max(
+            0.0, settings['quintile_bonus_large_mid_2'], settings['quintile_bonus_large_mid'],
+            settings['quintile_bonus_mid_cap'], settings['quintile_bonus_small_cap'])
+        worst = min(0.0, settings['anti_concentration_penalty'], settings['anti_concentration_penalty_moderate'])
+        return best - worst
+    
+    def _update_convergence(self, batch_results: List[EquitableAnalysisResult], remaining: List[str],
+                            precise: bool = False) -> bool:
+        """Met à jour l'état de convergence du Top K ; retourne True si le scan peut s'arrêter
+        
+        Scan précis : les bonus de passe 2 peuvent réordonner le Top K (borne élargie de leur écart
+        maximal) et sont calculés sur le jeu scanné (rang sectoriel, concentration) : un arrêt
+        anticipé fausserait le classement final, la convergence y reste donc indicative.
+        """
+        self.priority_planner.observe(batch_results)
+        self.status.convergence = self.priority_planner.check_convergence(
+            self.selector.select(), remaining,
+            self.status.precise_settings.get('convergence_stable_batches', 3),
+            self._diversity_bonus_margin() if precise else 0.0
+        )
+        self.status.convergence['early_stop_allowed'] = not precise
+        
+        if self.status.convergence['converged'] and remaining:
+            self.logger.info(f"🎯 Top K stable - {len(remaining)} symboles restants hors d'atteinte")
+            return not precise and self.status.precise_settings.get('convergence_early_stop', False)
+        return False
+    
+    def _create_selector(self, kind: str) -> StreamingTopKSelector:
+        """Crée le sélecteur incrémental correspondant au mode de sélection"""
+        self.selector_kind = kind
+        if kind == 'equitable':
+            # Top 10 : max 3 par secteur, max 4 par quintile, complément sans contraintes
+            return StreamingTopKSelector(k=10, max_per_sector=3, max_per_quintile=4, relax_fill=True)
+        
+        # Top 20 équilibré V3 selon les objectifs de distribution
+        targets = self.distribution_engine.distribution_targets
+        return StreamingTopKSelector(
+            k=20,
+            max_per_sector=max(1, int(20 * targets['max_sector_concentration'] / 100)),
+            min_sectors=targets['min_sectors_represented']
+        )
+    
+    def _selector_for(self, kind: str) -> StreamingTopKSelector:
+        """Retourne le sélecteur à jour, ou le reconstruit à partir des résultats complets"""
+        results = self.status.analysis_results_500 or []
+        if self.selector and self.selector_kind == kind and self.selector.count == len(results):
+            return self.selector
+        self.selector = self._create_selector(kind).add_many(results)
+        return self.selector
+    
+    def _build_results_index(self) -> Optional[ResultsIndex]:
+        """Construit l'index trié des résultats (une fois par scan terminé)"""
+        results = self.status.analysis_results_500 or []
+        with self._results_index_lock:
+            index = self.results_index
+            if index and index.source is results and index.count == len(results):
+                return index
+            self.results_generation += 1
+            self.results_index = ResultsIndex(results, self.results_generation)
+            return self.results_index
+    
+    def get_results_index(self) -> Optional[ResultsIndex]:
+        """Index du dernier scan terminé (reconstruit si les résultats ont changé hors scan, ex. annulation)"""
+        index = self.results_index
+        results = self.status.analysis_results_500
+        if not self.status.running and results and (index is None or index.source is not results
+                                                    or index.count != len(results)):
+            index = self._build_results_index()
+        return index
+    
+    def get_provisional_selection(self) -> Optional[Dict]:
+        """Top candidats et diversité provisoires, disponibles pendant le scan (NOUVEAU V3)"""
+        selector = self.selector
+        if not selector or selector.count == 0:
+            return None
+        
+        selected = selector.select()
+        sector_counts, quintile_counts, sorted_scores = selector.diversity_snapshot()
+        metrics = self.distribution_engine.calculate_diversity_metrics_from_counts(
+            sector_counts, quintile_counts, sorted_scores
+        )
+        
+        return {
+            'provisional': self.status.running,
+            'analyzed': selector.count,
+            'top_candidates': [
+                {
+                    'rank': i,
+                    'symbol': r.symbol,
+                    'equitable_score': round(r.equitable_score, 1),
+                    'sector': r.sector,
+                    'quintile': r.quintile_name,
+                    'recommendation': r.recommendation
+                }
+                for i, r in enumerate(selected, 1)
+            ],
+            'diversity_metrics': metrics
+        }
+    
+    async def start_equitable_analysis_500(self, deadline: Optional[float] = None, resume: bool = False) -> Dict:
+        """Démarre l'analyse équitable des 500 actions S&P (PRÉSERVÉ)
+        
+        deadline: timestamp (epoch) auquel le meilleur Top K disponible doit être publié
+        resume: reprend le dernier scan interrompu si la date des données correspond
+        """
         if self.status.running:
             return {'success': False, 'message': 'Une analyse est déjà en cours'}
         
         try:
             # Réinitialisation
-            self.stop_flag = False
+            cancel_event = self._begin_run()
+            self.selector = self._create_selector('equitable')
             
             # Mise à jour du statut
             self.status.running = True
@@ -656,13 +1594,16 @@ class AdvancedCentralOrchestratorV3:
             self.status.analysis_results_500 = []
             self.status.successful_analyses = 0
             self.status.error_count = 0
+            self.status.convergence = None
+            self.status.completeness = None
+            self.run_deadline = ScanDeadline(deadline, len(self.sp500_symbols)) if deadline else None
+            self.run_resume = resume
+            self.status.resumed_symbols = 0
             
             self.logger.info("🚀 Démarrage analyse équitable S&P 500")
             
             # Lancement en arrière-plan
-            self.analysis_thread = threading.Thread(target=self._run_equitable_analysis_500_background)
-            self.analysis_thread.daemon = True
-            self.analysis_thread.start()
+            self._start_background_run(self._run_equitable_analysis_500_background, cancel_event)
             
             return {'success': True, 'message': 'Analyse équitable des 500 tickers démarrée'}
             
@@ -671,14 +1612,19 @@ class AdvancedCentralOrchestratorV3:
             self.status.running = False
             return {'success': False, 'message': f'Erreur: {str(e)}'}
     
-    async def run_complete_sp500_analysis_precise(self) -> Dict:
-        """Lance l'analyse complète des 500 actions avec système précis V3 (NOUVEAU)"""
+    async def run_complete_sp500_analysis_precise(self, deadline: Optional[float] = None, resume: bool = False) -> Dict:
+        """Lance l'analyse complète des 500 actions avec système précis V3 (NOUVEAU)
+        
+        deadline: timestamp (epoch) auquel le meilleur Top K disponible doit être publié
+        resume: reprend le dernier scan interrompu si la date des données correspond
+        """
         if self.status.running:
             return {'success': False, 'message': 'Une analyse est déjà en cours'}
         
         try:
             # Réinitialisation
-            self.stop_flag = False
+            cancel_event = self._begin_run()
+            self.selector = self._create_selector('precise')
             
             # Mise à jour du statut
             self.status.running = True
@@ -689,6 +1635,11 @@ class AdvancedCentralOrchestratorV3:
             self.status.analysis_results_500 = []
             self.status.successful_analyses = 0
             self.status.error_count = 0
+            self.status.convergence = None
+            self.status.completeness = None
+            self.run_deadline = ScanDeadline(deadline, len(self.sp500_symbols)) if deadline else None
+            self.run_resume = resume
+            self.status.resumed_symbols = 0
             self.status.score_distribution = {
                 'STRONG_BUY': 0, 'BUY': 0, 'WEAK_BUY': 0, 'HOLD': 0,
                 'WEAK_SELL': 0, 'SELL': 0, 'STRONG_SELL': 0
@@ -697,9 +1648,7 @@ class AdvancedCentralOrchestratorV3:
             self.logger.info("🚀 Démarrage analyse précise S&P 500 V3")
             
             # Lancement en arrière-plan
-            self.analysis_thread = threading.Thread(target=self._run_precise_analysis_500_background)
-            self.analysis_thread.daemon = True
-            self.analysis_thread.start()
+            self._start_background_run(self._run_precise_analysis_500_background, cancel_event)
             
             return {'success': True, 'message': 'Analyse précise V3 des 500 tickers démarrée'}
             
@@ -708,34 +1657,144 @@ class AdvancedCentralOrchestratorV3:
             self.status.running = False
             return {'success': False, 'message': f'Erreur: {str(e)}'}
     
-    def _run_equitable_analysis_500_background(self):
+    async def start_deep_analysis_10(self) -> Dict:
+        """Démarre l'analyse équitable approfondie des 10 finalistes (run en arrière-plan, résolu par run_future)"""
+        if self.status.running:
+            return {'success': False, 'message': 'Une analyse est déjà en cours'}
+        if not self.status.top_10_candidates:
+            return {'success': False, 'message': 'Aucun Top 10 disponible. Lancez d\'abord une analyse complète.'}
+        
+        try:
+            cancel_event = self._begin_run()
+            
+            self.status.running = True
+            self.status.phase = 'analyzing_10'
+            self.status.analyzed_stocks = 0
+            self.status.total_stocks = len(self.status.top_10_candidates)
+            self.status.start_time = datetime.now().isoformat()
+            self.status.final_recommendation = None
+            
+            self.logger.info("🔍 Démarrage analyse équitable approfondie des 10 finalistes")
+            
+            self._start_background_run(self._run_deep_analysis_10_background, cancel_event)
+            
+            return {'success': True, 'message': 'Analyse équitable approfondie des 10 finalistes démarrée'}
+            
+        except Exception as e:
+            self.logger.error(f"Erreur démarrage analyse approfondie 10: {e}")
+            self.status.running = False
+            return {'success': False, 'message': f'Erreur: {str(e)}'}
+    
+    def _run_deep_analysis_10_background(self, cancel_event: threading.Event, run_id: int):
+        """Ré-analyse complète (sans mode allégé) des finalistes et choix de la recommandation finale"""
+        try:
+            start_time = time.time()
+            candidates = list(self.status.top_10_candidates)
+            
+            async def analyze(symbol: str):
+                result = await self._analyze_single_symbol_equitable(symbol, cancel_event)
+                if run_id == self.run_id:
+                    self.status.analyzed_stocks += 1
+                    self.status.last_update = datetime.now().isoformat()
+                return result
+            
+            results = asyncio.run(self._gather_cancellable(
+                [analyze(candidate['symbol']) for candidate in candidates], cancel_event))
+            
+            # Exécution remplacée ou arrêtée : ne plus toucher au statut
+            if run_id != self.run_id or cancel_event.is_set():
+                return
+            
+            # Finalistes dont la ré-analyse a échoué : conservés avec leur score du scan
+            deep_results = {result.symbol: result for result in results if isinstance(result, EquitableAnalysisResult)}
+            finalists = [self._candidate_from_result(0, deep_results[candidate['symbol']])
+                         if candidate['symbol'] in deep_results else dict(candidate) for candidate in candidates]
+            finalists.sort(key=lambda candidate: candidate['equitable_score'], reverse=True)
+            for rank, candidate in enumerate(finalists, 1):
+                candidate['rank'] = rank
+            
+            self.status.top_10_candidates = finalists
+            best = finalists[0] if finalists else None
+            self.status.final_recommendation = dict(best, score=best['equitable_score']) if best else None
+            self.status.running = False
+            self.status.phase = 'completed_10'
+            self.status.last_update = datetime.now().isoformat()
+            
+            self.logger.info(f"✅ Analyse approfondie des finalistes terminée en {time.time() - start_time:.1f}s "
+                             f"({len(deep_results)}/{len(candidates)} ré-analysés)")
+            
+        except Exception as e:
+            self.logger.error(f"❌ Erreur critique analyse approfondie 10: {e}")
+            self.status.running = False
+            self.status.phase = 'error'
+            self.status.last_update = datetime.now().isoformat()
+    
+    def _run_equitable_analysis_500_background(self, cancel_event: threading.Event, run_id: int):
         """Exécute l'analyse équitable des 500 tickers en arrière-plan (PRÉSERVÉ INTÉGRALEMENT)"""
         try:
             start_time = time.time()
             
+            # Gagnants probables en premier, symboles déjà traités repris du journal
+            symbols = self._apply_prefilter(self._plan_scan_order())
+            total_symbols = len(symbols)
+            checkpoint = self.active_checkpoint = self.checkpoints['equitable']
+            symbols = self._restore_checkpoint(checkpoint, symbols)
+            if self.run_deadline:
+                # Complétude rapportée à l'univers préfiltré (symboles repris du journal inclus)
+                self.run_deadline.total_symbols = total_symbols
+            
             # Analyse par batches pour optimiser les performances
-            batch_size = 25  # Taille de batch optimisée
-            total_batches = (len(self.sp500_symbols) + batch_size - 1) // batch_size
+            # Taille minimale, élargie quand la fenêtre de concurrence AIMD le permet
+            min_batch_size = 25  # Taille de batch optimisée
+            
+            self.logger.info(f"📊 Analyse de {len(symbols)} symboles par batches adaptatifs (fenêtre {self.fetch_controller.window})")
             
-            self.logger.info(f"📊 Analyse de {len(self.sp500_symbols)} symboles en {total_batches} batches")
+            deadline = self.run_deadline
+            scanned = total_symbols - len(symbols)
             
-            for batch_idx in range(total_batches):
-                if self.stop_flag:
+            batch_idx = 0
+            end_idx = 0
+            while end_idx < len(symbols):
+                if cancel_event.is_set():
                     break
                 
-                start_idx = batch_idx * batch_size
-                end_idx = min(start_idx + batch_size, len(self.sp500_symbols))
-                batch_symbols = self.sp500_symbols[start_idx:end_idx]
+                # Échéance atteinte : le meilleur Top K disponible est publié
+                if deadline and deadline.expired():
+                    self.logger.info(f"⏰ Échéance atteinte après {scanned}/{len(symbols)} symboles - publication du meilleur Top K")
+                    break
+                
+                start_idx = end_idx
+                end_idx = min(start_idx + self.fetch_controller.batch_size(min_batch_size), len(symbols))
+                batch_symbols = symbols[start_idx:end_idx]
+                batch_idx += 1
+                
+                # Fin projetée au-delà de l'échéance : symboles restants (les moins prioritaires) en mode allégé
+                light = bool(deadline) and deadline.projected_overshoot(len(symbols) - start_idx)
                 
-                self.logger.info(f"🔄 Batch {batch_idx + 1}/{total_batches} - Analyse de {len(batch_symbols)} symboles")
+                self.logger.info(f"🔄 Batch {batch_idx} - Analyse de {len(batch_symbols)} symboles ({len(symbols) - end_idx} restants)")
                 
                 # Analyse du batch
-                batch_results = asyncio.run(self._analyze_batch_equitable(batch_symbols))
+                batch_results = asyncio.run(self._analyze_batch_equitable(
+                    batch_symbols, cancel_event, light, deadline.deadline_ts if deadline else None))
+                
+                # Exécution remplacée par une plus récente : ne plus toucher au statut
+                if run_id != self.run_id:
+                    break
+                
+                scanned += len(batch_symbols)
+                if deadline:
+                    deadline.record_batch(len(batch_symbols), light)
+                self._checkpoint_batch(checkpoint, batch_results)
                 
                 # Ajout des résultats
                 self.status.analysis_results_500.extend(batch_results)
                 self.status.successful_analyses += len(batch_results)
                 self.status.analyzed_stocks = len(self.status.analysis_results_500)
+                self.selector.add_many(batch_results)
+                
+                # Convergence du Top K (arrêt anticipé si configuré)
+                if self._update_convergence(batch_results, symbols[end_idx:]):
+                    break
                 
                 # Mise à jour du statut
                 self.status.last_update = datetime.now().isoformat()
@@ -745,16 +1804,31 @@ class AdvancedCentralOrchestratorV3:
                     total_score = sum(r.equitable_score for r in self.status.analysis_results_500)
                     self.status.average_score = total_score / len(self.status.analysis_results_500)
                 
-                # Pause entre les batches
-                time.sleep(2)
+                # Arrêt demandé : les symboles déjà terminés du batch en vol sont conservés
+                if cancel_event.is_set():
+                    break
+                
+                # Pause entre les batches (interrompue immédiatement en cas d'arrêt, supprimée sous échéance)
+                if not light:
+                    cancel_event.wait(self.fetch_controller.batch_pause(2))
+            
+            if cancel_event.is_set():
+                self.logger.info(f"⏹️ Analyse équitable annulée - {len(self.status.analysis_results_500)} résultats partiels conservés")
+                return
+            
+            self.status.completeness = self._scan_completeness(deadline, scanned, total_symbols)
+            self._finish_funnel()
+            self.priority_planner.record_run(self.status.analysis_results_500)
+            self._close_checkpoint(checkpoint, deadline)
             
             # Sélection du Top 10 équitable
-            if not self.stop_flag and self.status.analysis_results_500:
+            if self.status.analysis_results_500:
                 self.status.phase = 'selecting_top_10'
                 self._select_equitable_top_10()
                 self._calculate_comprehensive_diversity_metrics()
             
             # Finalisation
+            self._build_results_index()
             total_time = time.time() - start_time
             self.status.running = False
             self.status.phase = 'completed'
@@ -773,44 +1847,77 @@ class AdvancedCentralOrchestratorV3:
             self.status.phase = 'error'
             self.status.last_update = datetime.now().isoformat()
     
-    def _run_precise_analysis_500_background(self):
+    def _run_precise_analysis_500_background(self, cancel_event: threading.Event, run_id: int):
         """Exécute l'analyse précise V3 des 500 tickers en arrière-plan (NOUVEAU)"""
         try:
             start_time = time.time()
             
+            # Gagnants probables en premier, symboles déjà traités repris du journal
+            symbols = self._apply_prefilter(self._plan_scan_order())
+            total_symbols = len(symbols)
+            checkpoint = self.active_checkpoint = self.checkpoints['precise']
+            symbols = self._restore_checkpoint(checkpoint, symbols)
+            if self.run_deadline:
+                # Complétude rapportée à l'univers préfiltré (symboles repris du journal inclus)
+                self.run_deadline.total_symbols = total_symbols
+            for result in self.status.analysis_results_500:
+                self.status.score_distribution[result.recommendation] += 1
+            
             # Analyse par batches optimisée V3
-            batch_size = 20  # Taille réduite pour plus de précision
-            total_batches = (len(self.sp500_symbols) + batch_size - 1) // batch_size
+            # Taille minimale, élargie quand la fenêtre de concurrence AIMD le permet
+            min_batch_size = 20  # Taille réduite pour plus de précision
             
-            self.logger.info(f"📊 Analyse précise V3 de {len(self.sp500_symbols)} symboles en {total_batches} batches")
+            self.logger.info(f"📊 Analyse précise V3 de {len(symbols)} symboles par batches adaptatifs (fenêtre {self.fetch_controller.window})")
             
-            # Statistiques sectorielles pour bonus de diversité
-            sector_stats = {}
-            quintile_stats = {}
+            deadline = self.run_deadline
+            scanned = total_symbols - len(symbols)
             
-            for batch_idx in range(total_batches):
-                if self.stop_flag:
+            batch_idx = 0
+            end_idx = 0
+            while end_idx < len(symbols):
+                if cancel_event.is_set():
+                    break
+                
+                # Échéance atteinte : le meilleur Top K disponible est publié
+                if deadline and deadline.expired():
+                    self.logger.info(f"⏰ Échéance atteinte après {scanned}/{len(symbols)} symboles - publication du meilleur Top K")
                     break
                 
-                start_idx = batch_idx * batch_size
-                end_idx = min(start_idx + batch_size, len(self.sp500_symbols))
-                batch_symbols = self.sp500_symbols[start_idx:end_idx]
+                start_idx = end_idx
+                end_idx = min(start_idx + self.fetch_controller.batch_size(min_batch_size), len(symbols))
+                batch_symbols = symbols[start_idx:end_idx]
+                batch_idx += 1
+                
+                # Fin projetée au-delà de l'échéance : symboles restants (les moins prioritaires) en mode allégé
+                light = bool(deadline) and deadline.projected_overshoot(len(symbols) - start_idx)
+                
+                self.logger.info(f"🔄 Batch précis {batch_idx} - Analyse de {len(batch_symbols)} symboles ({len(symbols) - end_idx} restants)")
                 
-                self.logger.info(f"🔄 Batch précis {batch_idx + 1}/{total_batches} - Analyse de {len(batch_symbols)} symboles")
+                # Passe 1 : scores bruts, indépendants de l'ordre de traitement
+                batch_results = asyncio.run(self._analyze_batch_precise_v3(
+                    batch_symbols, cancel_event, light, deadline.deadline_ts if deadline else None))
                 
-                # Analyse du batch avec système précis V3
-                batch_results = asyncio.run(self._analyze_batch_precise_v3(batch_symbols, sector_stats, quintile_stats))
+                # Exécution remplacée par une plus récente : ne plus toucher au statut
+                if run_id != self.run_id:
+                    break
+                
+                scanned += len(batch_symbols)
+                if deadline:
+                    deadline.record_batch(len(batch_symbols), light)
+                self._checkpoint_batch(checkpoint, batch_results)
                 
                 # Ajout des résultats
                 self.status.analysis_results_500.extend(batch_results)
                 self.status.successful_analyses += len(batch_results)
                 self.status.analyzed_stocks = len(self.status.analysis_results_500)
+                self.selector.add_many(batch_results)
+                
+                # Convergence du Top K (indicative : pas d'arrêt anticipé avant la passe 2)
+                self._update_convergence(batch_results, symbols[end_idx:], precise=True)
                 
-                # Mise à jour des statistiques de distribution
+                # Mise à jour des statistiques de distribution (provisoires jusqu'à la passe 2)
                 for result in batch_results:
                     self.status.score_distribution[result.recommendation] += 1
-                    sector_stats[result.sector] = sector_stats.get(result.sector, 0) + 1
-                    quintile_stats[result.quintile_rank] = quintile_stats.get(result.quintile_rank, 0) + 1
                 
                 # Mise à jour du statut
                 self.status.last_update = datetime.now().isoformat()
@@ -820,16 +1927,38 @@ class AdvancedCentralOrchestratorV3:
                     total_score = sum(r.equitable_score for r in self.status.analysis_results_500)
                     self.status.average_score = total_score / len(self.status.analysis_results_500)
                 
-                # Pause entre les batches
-                time.sleep(1.5)
+                # Arrêt demandé : les symboles déjà terminés du batch en vol sont conservés
+                if cancel_event.is_set():
+                    break
+                
+                # Pause entre les batches (interrompue immédiatement en cas d'arrêt, supprimée sous échéance)
+                if not light:
+                    cancel_event.wait(self.fetch_controller.batch_pause(1.5))
+            
+            if cancel_event.is_set():
+                # Résultats partiels conservés et rescorés si aucune nouvelle analyse n'a démarré
+                if run_id == self.run_id and self.status.analysis_results_500:
+                    self._apply_diversity_pass()
+                self.logger.info(f"⏹️ Analyse précise V3 annulée - {len(self.status.analysis_results_500)} résultats partiels conservés")
+                return
+            
+            self.status.completeness = self._scan_completeness(deadline, scanned, total_symbols)
+            self._finish_funnel()
+            self.priority_planner.record_run(self.status.analysis_results_500)
+            self._close_checkpoint(checkpoint, deadline)
+            
+            # Passe 2 : bonus de diversité appliqués sur le jeu complet (résultat déterministe)
+            if self.status.analysis_results_500:
+                self._apply_diversity_pass()
             
             # Sélection équilibrée du Top avec système V3
-            if not self.stop_flag and self.status.analysis_results_500:
+            if self.status.analysis_results_500:
                 self.status.phase = 'selecting_top_balanced'
                 self._select_top_candidates_balanced()
                 self._calculate_advanced_diversity_metrics()
             
             # Finalisation
+            self._build_results_index()
             total_time = time.time() - start_time
             self.status.running = False
             self.status.phase = 'completed_precise'
@@ -849,62 +1978,146 @@ class AdvancedCentralOrchestratorV3:
             self.status.phase = 'error'
             self.status.last_update = datetime.now().isoformat()
     
-    async def _analyze_batch_equitable(self, symbols: List[str]) -> List[EquitableAnalysisResult]:
+    def _restore_checkpoint(self, checkpoint: ScanCheckpoint, symbols: List[str]) -> List[str]:
+        """Ouvre le journal du scan ; en reprise, recharge les résultats déjà obtenus et retourne les symboles restants"""
+        restored = checkpoint.begin(len(symbols), resume=self.run_resume)
+        if not restored:
+            return symbols
+        
+        results = [result_from_record(record) for record in restored.values()]
+        self.status.analysis_results_500.extend(results)
+        self.status.successful_analyses += len(results)
+        self.status.analyzed_stocks = len(self.status.analysis_results_500)
+        self.status.resumed_symbols = len(restored)
+        self.selector.add_many(results)
+        if self.run_deadline:
+            self.run_deadline.restored = len(restored)
+        
+        return [symbol for symbol in symbols if symbol not in restored]
+    
+    def _close_checkpoint(self, checkpoint: ScanCheckpoint, deadline: Optional[ScanDeadline]):
+        """Scan mené à son terme : le journal est supprimé (seul un scan coupé par l'échéance reste reprenable)"""
+        if not (deadline and deadline.deadline_hit):
+            checkpoint.clear()
+    
+    def last_checkpoint(self) -> ScanCheckpoint:
+        """Journal du scan en cours ou du dernier scan (après redémarrage: le plus récent sur disque)"""
+        if self.active_checkpoint:
+            return self.active_checkpoint
+        return max(self.checkpoints.values(), key=lambda checkpoint: checkpoint.info().get('started') or '')
+    
+    def _checkpoint_batch(self, checkpoint: ScanCheckpoint, batch_results: List[EquitableAnalysisResult]):
+        """Ajoute les résultats d'un batch au journal (les échecs seront retentés à la reprise) et au flux SSE"""
+        checkpoint.append(result_to_record(result) for result in batch_results)
+        # Résultats par symbole poussés aux clients du flux SSE
+        event_stream.publish('symbol_results', [{
+            'symbol': result.symbol,
+            'score': round(result.equitable_score, 2),
+            'recommendation': result.recommendation,
+            'sector': result.sector
+        } for result in batch_results])
+    
+    def _scan_completeness(self, deadline: Optional[ScanDeadline], scanned: int, total: int) -> Dict:
+        """Indicateur de complétude du scan terminé (échéance, arrêt anticipé, mode allégé)"""
+        successful = len(self.status.analysis_results_500 or [])
+        if deadline:
+            deadline.expired()
+            return deadline.completeness(successful)
+        return build_completeness(scanned, total, successful)
+    
+    def _apply_diversity_pass(self):
+        """Applique la passe 2 de bonus de diversité et recalcule les statistiques (NOUVEAU V3)"""
+        results = self.status.analysis_results_500
+        self.distribution_engine.apply_diversity_bonuses(results, self.status.precise_settings)
+        
+        self.status.score_distribution = {
+            'STRONG_BUY': 0, 'BUY': 0, 'WEAK_BUY': 0, 'HOLD': 0,
+            'WEAK_SELL': 0, 'SELL': 0, 'STRONG_SELL': 0
+        }
+        for result in results:
+            self.status.score_distribution[result.recommendation] += 1
+        self.status.average_score = sum(r.equitable_score for r in results) / len(results)
+        if self.selector:
+            self.selector.reset_scores([r.equitable_score for r in results])
+        self.status.last_update = datetime.now().isoformat()
+        
+        self.logger.info(f"⚖️ Bonus de diversité appliqués sur {len(results)} résultats (passe 2)")
+    
+    async def _analyze_batch_equitable(self, symbols: List[str], cancel_event: threading.Event, light: bool = False,
+                                       deadline_ts: Optional[float] = None) -> List[EquitableAnalysisResult]:
         """Analyse un lot de symboles avec le système équitable (PRÉSERVÉ INTÉGRALEMENT)"""
         results = []
         
-        # Analyse parallèle pour optimiser les performances
-        tasks = []
-        for symbol in symbols:
-            if self.stop_flag:
-                break
-            task = self._analyze_single_symbol_equitable(symbol)
-            tasks.append(task)
+        # Analyse parallèle annulable
+        tasks = [self._analyze_single_symbol_equitable(symbol, cancel_event, light) for symbol in symbols]
+        batch_results = await self._gather_cancellable(tasks, cancel_event, deadline_ts)
         
-        # Exécution parallèle avec limite de concurrence
-        if tasks:
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for symbol, result in zip(symbols, batch_results):
-                if isinstance(result, Exception):
-                    self.logger.warning(f"❌ Erreur analyse {symbol}: {result}")
-                elif result:
-                    results.append(result)
-                    self.logger.debug(f"✅ {symbol} - Score équitable: {result.equitable_score:.1f}")
+        for symbol, result in zip(symbols, batch_results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"❌ Erreur analyse {symbol}: {result}")
+            elif result:
+                results.append(result)
+                self.logger.debug(f"✅ {symbol} - Score équitable: {result.equitable_score:.1f}")
         
         return results
     
-    async def _analyze_batch_precise_v3(self, symbols: List[str], sector_stats: Dict, quintile_stats: Dict) -> List[EquitableAnalysisResult]:
+    async def _analyze_batch_precise_v3(self, symbols: List[str], cancel_event: threading.Event, light: bool = False,
+                                        deadline_ts: Optional[float] = None) -> List[EquitableAnalysisResult]:
         """Analyse un lot de symboles avec le système précis V3 (NOUVEAU)"""
         results = []
         
-        # Analyse parallèle optimisée pour V3
-        tasks = []
-        for symbol in symbols:
-            if self.stop_flag:
-                break
-            task = self._analyze_single_symbol_precise_v3(symbol, sector_stats, quintile_stats)
-            tasks.append(task)
+        # Analyse parallèle annulable
+        tasks = [self._analyze_single_symbol_precise_v3(symbol, cancel_event, light) for symbol in symbols]
+        batch_results = await self._gather_cancellable(tasks, cancel_event, deadline_ts)
         
-        # Exécution parallèle avec limite de concurrence
-        if tasks:
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for symbol, result in zip(symbols, batch_results):
-                if isinstance(result, Exception):
-                    self.logger.warning(f"❌ Erreur analyse précise {symbol}: {result}")
-                    self.status.error_count += 1
-                elif result:
-                    results.append(result)
-                    self.logger.debug(f"✅ {symbol} - Score précis: {result.equitable_score:.1f} - Rec: {result.recommendation}")
+        for symbol, result in zip(symbols, batch_results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"❌ Erreur analyse précise {symbol}: {result}")
+                self.status.error_count += 1
+            elif result:
+                results.append(result)
+                self.logger.debug(f"✅ {symbol} - Score précis: {result.equitable_score:.1f} - Rec: {result.recommendation}")
+        
+        return results
+    
+    async def _gather_cancellable(self, coros: List, cancel_event: threading.Event,
+                                  deadline_ts: Optional[float] = None) -> List[Any]:
+        """Exécute les tâches en parallèle et annule celles en attente dès que l'arrêt est demandé
+        (ou que l'échéance du scan est atteinte)
+        
+        Retourne un résultat par tâche, dans l'ordre : valeur, exception, ou None si annulée.
+        """
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        pending = set(tasks)
+        
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=0.2, return_when=asyncio.FIRST_COMPLETED)
+            deadline_reached = deadline_ts is not None and time.time() >= deadline_ts
+            if (cancel_event.is_set() or deadline_reached) and pending:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                self.logger.info(f"🛑 {len(pending)} analyses en vol annulées")
+                break
         
+        results = []
+        for task in tasks:
+            if task.cancelled():
+                results.append(None)
+            elif task.exception() is not None:
+                results.append(task.exception())
+            else:
+                results.append(task.result())
         return results
     
-    async def _analyze_single_symbol_equitable(self, symbol: str) -> Optional[EquitableAnalysisResult]:
+    async def _analyze_single_symbol_equitable(self, symbol: str, cancel_event: Optional[threading.Event] = None,
+                                               light: bool = False) -> Optional[EquitableAnalysisResult]:
         """Analyse équitable d'un symbole unique (PRÉSERVÉ INTÉGRALEMENT)"""
         try:
             # Utilisation de l'agent avancé V2
-            agent = AdvancedIndividualAgentV3(symbol, self.polygon_key, self.sector_data, self.quintile_data)
+            agent = AdvancedIndividualAgentV3(symbol, self.polygon_key, self.sector_data, self.quintile_data,
+                                              cancel_event=cancel_event, executor=self.io_executor,
+                                              light_mode=light, fetch_controller=self.fetch_controller)
             result = await agent.run_complete_analysis()
             
             if result and 'error' not in result:
@@ -916,11 +2129,14 @@ class AdvancedCentralOrchestratorV3:
             self.logger.warning(f"Erreur analyse équitable {symbol}: {e}")
             return None
     
-    async def _analyze_single_symbol_precise_v3(self, symbol: str, sector_stats: Dict, quintile_stats: Dict) -> Optional[EquitableAnalysisResult]:
-        """Analyse précise V3 d'un symbole unique (NOUVEAU)"""
+    async def _analyze_single_symbol_precise_v3(self, symbol: str, cancel_event: Optional[threading.Event] = None,
+                                                light: bool = False) -> Optional[EquitableAnalysisResult]:
+        """Analyse précise V3 d'un symbole unique - score brut de passe 1 (NOUVEAU)"""
         try:
-            # Utilisation de l'agent avancé V3
-            agent = AdvancedIndividualAgentV3(symbol, self.polygon_key, sector_stats, quintile_stats)
+            # Utilisation de l'agent avancé V3 (bonus de diversité différé en passe 2)
+            agent = AdvancedIndividualAgentV3(symbol, self.polygon_key, defer_diversity_bonus=True,
+                                              cancel_event=cancel_event, executor=self.io_executor,
+                                              light_mode=light, fetch_controller=self.fetch_controller)
             result = await agent.run_complete_analysis()
             
             if result and 'error' not in result:
@@ -979,7 +2195,8 @@ class AdvancedCentralOrchestratorV3:
                 # Métadonnées
                 source='Advanced Equitable System V2',
                 timestamp=datetime.now(),
-                analysis_version=analysis_result.get('analysis_version', 'V2')
+                analysis_version=analysis_result.get('analysis_version', 'V2'),
+                analysis_depth=analysis_result.get('analysis_depth', 'full')
             )
             
         except Exception as e:
@@ -1009,6 +2226,8 @@ class AdvancedCentralOrchestratorV3:
                 pattern_score=ai_analysis.get('pattern_score', 50.0),
                 risk_score=ai_analysis.get('risk_score', 50.0),
                 momentum_score=ai_analysis.get('momentum_score', 50.0),  # NOUVEAU V3
+                base_equitable_score=ai_analysis.get('base_equitable_score', ai_analysis.get('final_equitable_score', 50.0)),
+                diversity_bonus=ai_analysis.get('diversity_bonus', 0.0),
                 
                 # Données de marché
                 price=market_data.get('current_price', 0.0),
@@ -1034,7 +2253,8 @@ class AdvancedCentralOrchestratorV3:
                 # Métadonnées
                 source='Advanced Precise System V3',
                 timestamp=datetime.now(),
-                analysis_version=analysis_result.get('analysis_version', 'V3_Complete')
+                analysis_version=analysis_result.get('analysis_version', 'V3_Complete'),
+                analysis_depth=analysis_result.get('analysis_depth', 'full')
             )
             
         except Exception as e:
@@ -1056,6 +2276,27 @@ class AdvancedCentralOrchestratorV3:
     
     # ===== SÉLECTION ÉQUITABLE DU TOP 10 (PRÉSERVÉ + AMÉLIORÉ V3) =====
     
+    @staticmethod
+    def _candidate_from_result(rank: int, result: EquitableAnalysisResult) -> Dict:
+        """Vue dictionnaire d'un finaliste équitable (format du Top 10)"""
+        return {
+            'rank': rank,
+            'symbol': result.symbol,
+            'equitable_score': round(result.equitable_score, 1),
+            'overall_score': round(result.overall_score, 1),
+            'sector': result.sector,
+            'quintile': result.quintile_name,
+            'market_cap': result.market_cap,
+            'price': result.price,
+            'change_percent': result.change_percent,
+            'recommendation': result.recommendation,
+            'confidence': result.confidence,
+            'buy_signals': result.buy_signals,
+            'sell_signals': result.sell_signals,
+            'reasoning': result.reasoning[:3],  # Top 3 raisons
+            'analysis_depth': result.analysis_depth
+        }
+    
     def _select_equitable_top_10(self):
         """Sélectionne le Top 10 avec diversité forcée (PRÉSERVÉ INTÉGRALEMENT)"""
         try:
@@ -1065,78 +2306,12 @@ class AdvancedCentralOrchestratorV3:
             
             self.logger.info("🎯 Sélection équitable du Top 10")
             
-            # Tri par score équitable décroissant
-            sorted_results = sorted(
-                self.status.analysis_results_500, 
-                key=lambda x: x.equitable_score, 
-                reverse=True
-            )
-            
-            # Sélection avec diversité forcée
-            selected_candidates = []
-            sector_counts = {}
-            quintile_counts = {}
-            
-            # Paramètres de diversité
-            max_per_sector = 3  # Maximum 3 actions par secteur
-            max_per_quintile = 4  # Maximum 4 actions par quintile
-            min_sectors = 5  # Minimum 5 secteurs différents
-            
-            # Phase 1: Sélection des meilleurs avec contraintes
-            for result in sorted_results:
-                if len(selected_candidates) >= 10:
-                    break
-                
-                sector = result.sector
-                quintile = result.quintile_rank
-                
-                # Vérifier les contraintes de diversité
-                sector_count = sector_counts.get(sector, 0)
-                quintile_count = quintile_counts.get(quintile, 0)
-                
-                # Accepter si les contraintes sont respectées
-                if (sector_count < max_per_sector and 
-                    quintile_count < max_per_quintile):
-                    
-                    selected_candidates.append(result)
-                    sector_counts[sector] = sector_count + 1
-                    quintile_counts[quintile] = quintile_count + 1
-                    
-                    self.logger.debug(f"✅ Sélectionné: {result.symbol} - Score: {result.equitable_score:.1f} - Secteur: {sector}")
-            
-            # Phase 2: Compléter si nécessaire en assouplissant les contraintes
-            if len(selected_candidates) < 10:
-                remaining_needed = 10 - len(selected_candidates)
-                selected_symbols = {r.symbol for r in selected_candidates}
-                
-                for result in sorted_results:
-                    if len(selected_candidates) >= 10:
-                        break
-                    
-                    if result.symbol not in selected_symbols:
-                        selected_candidates.append(result)
-                        self.logger.debug(f"➕ Complété: {result.symbol} - Score: {result.equitable_score:.1f}")
+            # Sélection avec diversité forcée (max 3 par secteur, 4 par quintile) sur le pool incrémental
+            selected_candidates = self._selector_for('equitable').select()
             
             # Conversion en format dictionnaire pour compatibilité
-            self.status.top_10_candidates = []
-            for i, result in enumerate(selected_candidates[:10], 1):
-                candidate = {
-                    'rank': i,
-                    'symbol': result.symbol,
-                    'equitable_score': round(result.equitable_score, 1),
-                    'overall_score': round(result.overall_score, 1),
-                    'sector': result.sector,
-                    'quintile': result.quintile_name,
-                    'market_cap': result.market_cap,
-                    'price': result.price,
-                    'change_percent': result.change_percent,
-                    'recommendation': result.recommendation,
-                    'confidence': result.confidence,
-                    'buy_signals': result.buy_signals,
-                    'sell_signals': result.sell_signals,
-                    'reasoning': result.reasoning[:3]  # Top 3 raisons
-                }
-                self.status.top_10_candidates.append(candidate)
+            self.status.top_10_candidates = [self._candidate_from_result(i, result)
+                                             for i, result in enumerate(selected_candidates[:10], 1)]
             
             # Statistiques de diversité
             final_sectors = [c['sector'] for c in self.status.top_10_candidates]
@@ -1158,59 +2333,9 @@ class AdvancedCentralOrchestratorV3:
             
             self.logger.info("🎯 Sélection équilibrée V3 des top candidats")
             
-            # Tri par score équitable décroissant
-            sorted_results = sorted(
-                self.status.analysis_results_500, 
-                key=lambda x: x.equitable_score, 
-                reverse=True
-            )
-            
-            # Sélection avec distribution forcée V3
-            selected_candidates = []
-            sector_counts = {}
-            quintile_counts = {}
-            
-            # Paramètres de distribution V3
-            targets = self.distribution_engine.distribution_targets
-            max_per_sector = max(1, int(20 * targets['max_sector_concentration'] / 100))  # Top 20
-            min_sectors = targets['min_sectors_represented']
-            
-            # Phase 1: Garantir la diversité sectorielle
-            sectors_represented = set()
-            for result in sorted_results:
-                if len(sectors_represented) >= min_sectors:
-                    break
-                
-                sector = result.sector
-                if sector not in sectors_represented:
-                    selected_candidates.append(result)
-                    sectors_represented.add(sector)
-                    sector_counts[sector] = sector_counts.get(sector, 0) + 1
-                    quintile_counts[result.quintile_rank] = quintile_counts.get(result.quintile_rank, 0) + 1
-                    
-                    self.logger.debug(f"🎯 Diversité: {result.symbol} - {sector} - Score: {result.equitable_score:.1f}")
-            
-            # Phase 2: Compléter avec les meilleurs scores en respectant les limites
-            selected_symbols = {r.symbol for r in selected_candidates}
-            
-            for result in sorted_results:
-                if len(selected_candidates) >= 20:  # Top 20 pour plus de choix
-                    break
-                
-                if result.symbol in selected_symbols:
-                    continue
-                
-                sector = result.sector
-                sector_count = sector_counts.get(sector, 0)
-                
-                # Respecter la limite sectorielle
-                if sector_count < max_per_sector:
-                    selected_candidates.append(result)
-                    selected_symbols.add(result.symbol)
-                    sector_counts[sector] = sector_count + 1
-                    quintile_counts[result.quintile_rank] = quintile_counts.get(result.quintile_rank, 0) + 1
-                    
-                    self.logger.debug(f"✅ Ajouté: {result.symbol} - Score: {result.equitable_score:.1f}")
+            # Sélection avec distribution forcée V3 sur le pool incrémental
+            # (diversité sectorielle minimale puis meilleurs scores sous limite sectorielle)
+            selected_candidates = self._selector_for('precise').select()
             
             # Conversion en format dictionnaire
             self.status.top_10_candidates = []
@@ -1230,7 +2355,8 @@ class AdvancedCentralOrchestratorV3:
                     'confidence': result.confidence,
                     'buy_signals': result.buy_signals,
                     'sell_signals': result.sell_signals,
-                    'reasoning': result.reasoning[:3]
+                    'reasoning': result.reasoning[:3],
+                    'analysis_depth': result.analysis_depth
                 }
                 self.status.top_10_candidates.append(candidate)
             
@@ -1248,39 +2374,13 @@ class AdvancedCentralOrchestratorV3:
     def get_top_candidates_precise(self, count: int = 20) -> List[Dict]:
         """Retourne les top candidats avec scoring précis V3 (NOUVEAU)"""
         try:
-            if not self.status.analysis_results_500:
+            index = self.get_results_index()
+            if not index:
                 return []
             
-            # Tri par score équitable décroissant
-            sorted_results = sorted(
-                self.status.analysis_results_500, 
-                key=lambda x: x.equitable_score, 
-                reverse=True
-            )
-            
-            top_candidates = []
-            for i, result in enumerate(sorted_results[:count], 1):
-                candidate = {
-                    'rank': i,
-                    'symbol': result.symbol,
-                    'equitable_score': round(result.equitable_score, 1),
-                    'overall_score': round(result.overall_score, 1),
-                    'momentum_score': round(result.momentum_score, 1),
-                    'sector': result.sector,
-                    'quintile': result.quintile_name,
-                    'market_cap': result.market_cap,
-                    'price': result.price,
-                    'change_percent': result.change_percent,
-                    'recommendation': result.recommendation,
-                    'confidence': round(result.confidence, 2),
-                    'buy_signals': result.buy_signals,
-                    'sell_signals': result.sell_signals,
-                    'reasoning': result.reasoning[:3],
-                    'analysis_version': result.analysis_version
-                }
-                top_candidates.append(candidate)
-            
-            return top_candidates
+            # Première page de l'index trié par score équitable décroissant
+            page = index.query(sort='equitable_score', order='desc', limit=count)
+            return [dict(record, rank=i) for i, record in enumerate(page['items'], 1)]
             
         except Exception as e:
             self.logger.error(f"Erreur récupération top candidats précis: {e}")
@@ -1289,38 +2389,82 @@ class AdvancedCentralOrchestratorV3:
     def get_analysis_results_by_score_range(self, min_score: float, max_score: float) -> List[Dict]:
         """Retourne les résultats dans une plage de scores (NOUVEAU V3)"""
         try:
-            if not self.status.analysis_results_500:
+            index = self.get_results_index()
+            if not index:
                 return []
             
-            filtered_results = [
-                {
-                    'symbol': r.symbol,
-                    'equitable_score': round(r.equitable_score, 1),
-                    'overall_score': round(r.overall_score, 1),
-                    'momentum_score': round(r.momentum_score, 1),
-                    'recommendation': r.recommendation,
-                    'confidence': round(r.confidence, 2),
-                    'sector': r.sector,
-                    'quintile': r.quintile_name,
-                    'market_cap': r.market_cap,
-                    'price': r.price,
-                    'change_percent': r.change_percent,
-                    'buy_signals': r.buy_signals,
-                    'sell_signals': r.sell_signals
-                }
-                for r in self.status.analysis_results_500
-                if min_score <= r.equitable_score <= max_score
-            ]
-            
-            # Trier par score décroissant
-            filtered_results.sort(key=lambda x: x['equitable_score'], reverse=True)
-            
-            return filtered_results
+            # Plage bornée par dichotomie sur l'index trié par score décroissant
+            filtered_results = []
+            cursor = None
+            while True:
+                page = index.query(min_score=min_score, max_score=max_score, limit=index.MAX_PAGE_SIZE, cursor=cursor)
+                filtered_results.extend(page['items'])
+                cursor = page['next_cursor']
+                if not cursor:
+                    return filtered_results
             
         except Exception as e:
             self.logger.error(f"Erreur filtrage par plage de score: {e}")
             return []
     
+    def sector_symbols(self, sector: str) -> List[str]:
+        """Symboles d'un secteur d'après le dernier scan terminé (vide si secteur inconnu ou aucun scan)"""
+        index = self.get_results_index()
+        return index.symbols_for('sector', sector) if index else []
+    
+    def analyze_symbols_stream(self, symbols: List[str],
+                               cancel_event: threading.Event) -> Iterator[Tuple[str, Optional[EquitableAnalysisResult]]]:
+        """Analyse ad hoc d'une liste de symboles, produite au fil des fins d'analyse (NOUVEAU V3)
+        
+        Même pipeline que le scan (agents sur le pool d'E/S partagé, fenêtre AIMD, disjoncteurs des
+        fournisseurs), au plus une fenêtre de symboles en vol. L'analyse tourne dans une boucle asyncio
+        dédiée; le générateur est consommé par le thread appelant (réponse HTTP en flux). Fermer le
+        générateur (client déconnecté) annule les analyses restantes.
+        
+        Yields:
+            Tuple: (symbole, résultat ou None si l'analyse a échoué)
+        """
+        completed = queue.Queue()
+        
+        async def analyze_all():
+            in_flight = asyncio.Semaphore(self.fetch_controller.window)
+            
+            async def analyze(symbol):
+                result = None
+                async with in_flight:
+                    if not cancel_event.is_set():
+                        result = await self._analyze_single_symbol_equitable(symbol, cancel_event)
+                completed.put((symbol, result))
+            
+            await asyncio.gather(*(analyze(symbol) for symbol in symbols), return_exceptions=True)
+        
+        def run():
+            try:
+                asyncio.run(analyze_all())
+            finally:
+                completed.put(None)
+        
+        threading.Thread(target=run, daemon=True, name="sp500-batch").start()
+        try:
+            while True:
+                item = completed.get()
+                if item is None:
+                    return
+                yield item
+        finally:
+            cancel_event.set()
+    
+    def query_results(self, **params) -> Dict:
+        """Requête paginée filtrée et triée sur les résultats du dernier scan terminé (NOUVEAU V3)
+        
+        Raises:
+            ValueError: Paramètre ou curseur invalide (voir ResultsIndex.query)
+        """
+        index = self.get_results_index()
+        if not index:
+            return {'items': [], 'next_cursor': None, 'total': 0, 'indexed': 0, 'generation': 0, 'facets': {}}
+        return index.query(**params)
+    
     # ===== MÉTRIQUES DE DIVERSITÉ (PRÉSERVÉ + AMÉLIORÉ V3) =====
     
     def _calculate_comprehensive_diversity_metrics(self):
@@ -1329,12 +2473,9 @@ class AdvancedCentralOrchestratorV3:
             if not self.status.analysis_results_500:
                 return
             
-            # Distribution par secteur
-            sector_counts = Counter([r.sector for r in self.status.analysis_results_500])
+            # Distributions par secteur et par quintile (compteurs incrémentaux)
+            sector_counts, quintile_counts, _ = self._selector_for('equitable').diversity_snapshot()
             sectors_represented = len(sector_counts)
-            
-            # Distribution par quintile
-            quintile_counts = Counter([r.quintile_rank for r in self.status.analysis_results_500])
             quintiles_represented = len(quintile_counts)
             
             total_count = len(self.status.analysis_results_500)
@@ -1381,9 +2522,10 @@ class AdvancedCentralOrchestratorV3:
             if not self.status.analysis_results_500:
                 return
             
-            # Utiliser le moteur de distribution V3
-            self.status.diversity_metrics = self.distribution_engine.calculate_advanced_diversity_metrics(
-                self.status.analysis_results_500
+            # Utiliser le moteur de distribution V3 sur les compteurs incrémentaux
+            sector_counts, quintile_counts, sorted_scores = self._selector_for('precise').diversity_snapshot()
+            self.status.diversity_metrics = self.distribution_engine.calculate_diversity_metrics_from_counts(
+                sector_counts, quintile_counts, sorted_scores
             )
             
             metrics = self.status.diversity_metrics
@@ -1425,7 +2567,9 @@ class AdvancedCentralOrchestratorV3:
             if not self.status.running:
                 return {'success': False, 'message': 'Aucune analyse en cours'}
             
+            # Propagation immédiate aux batches et agents en vol
             self.stop_flag = True
+            self.cancel_event.set()
             self.status.running = False
             self.status.phase = 'stopped'
             self.status.last_update = datetime.now().isoformat()
@@ -1436,7 +2580,8 @@ class AdvancedCentralOrchestratorV3:
                 'success': True, 
                 'message': 'Analyse arrêtée avec succès',
                 'analyzed_stocks': self.status.analyzed_stocks,
-                'total_stocks': self.status.total_stocks
+                'total_stocks': self.status.total_stocks,
+                'partial_results': len(self.status.analysis_results_500) if self.status.analysis_results_500 else 0
             }
             
         except Exception as e:
@@ -1530,9 +2675,6 @@ def create_advanced_orchestrator() -> AdvancedCentralOrchestratorV3:
     """Factory function pour créer un orchestrateur avancé V3 (PRÉSERVÉ + AMÉLIORÉ)"""
     return AdvancedCentralOrchestratorV3()
 
-# Instance globale pour l'API
-orchestrator = AdvancedCentralOrchestratorV3()
-
 if __name__ == "__main__":
     # Test de l'orchestrateur avancé V3
     async def test_orchestrator_v3():
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Fournisseurs de Données de Marché pour le Bot Trading SP500
+Yahoo Finance en principal, Polygon puis le magasin local en secours:
+chaque fournisseur distant est protégé par son disjoncteur, un fournisseur dégradé
+échoue immédiatement et les requêtes basculent sur le suivant
+"""
+
+import os
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from fetch_control import circuit_breakers, AIMDConcurrencyController, CircuitOpenError, HedgePolicy
+from lazy_init import LazyInstance
+
+POLYGON_BASE_URL = "https://api.polygon.io"
+LOCAL_STORE_MAX_AGE = 12 * 3600  # Âge maximal des données locales servies en secours (secondes)
+PERIOD_DAYS = {'1mo': 31, '3mo': 93, '6mo': 186, '1y': 366, '2y': 731}
+
+logger = logging.getLogger(__name__)
+
+# pandas, yfinance et requests sont importés au premier appel: le statut des fournisseurs
+# reste consultable sans charger la pile d'analyse (démarrage rapide des processus HTTP)
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Hedging optionnel: doublon vers le fournisseur de secours au-delà du p95 (budget de 5% de requêtes par défaut)
+HEDGING_ENABLED = os.getenv('FETCH_HEDGING_ENABLED', 'false').lower() == 'true'
+HEDGING_BUDGET = float(os.getenv('FETCH_HEDGING_BUDGET', '0.05'))
+hedge_policies = {kind: HedgePolicy(enabled=HEDGING_ENABLED, budget_fraction=HEDGING_BUDGET) for kind in ('history', 'info')}
+# Pool des requêtes couvertes, créé à la première requête couverte (jamais si le hedging est désactivé)
+_hedge_executor = LazyInstance(lambda: ThreadPoolExecutor(max_workers=64, thread_name_prefix="sp500-hedge"))
+
+class ProviderUnavailableError(Exception):
+    """Aucun fournisseur (ni le magasin local) n'a pu servir la requête"""
+
+class LocalMarketStore:
+    """Dernières données obtenues par symbole, servies quand tous les fournisseurs distants sont indisponibles"""
+
+    def __init__(self, max_age: float = LOCAL_STORE_MAX_AGE):
+        self.max_age = max_age
+        self._bars: Dict[str, Tuple[float, 'pd.DataFrame']] = {}
+        self._info: Dict[str, Tuple[float, Dict]] = {}
+        self._lock = threading.Lock()
+
+    def put_bars(self, symbol: str, bars: 'pd.DataFrame'):
+        with self._lock:
+            self._bars[symbol] = (time.time(), bars)
+
+    def get_bars(self, symbol: str) -> Optional['pd.DataFrame']:
+        return self._get(self._bars, symbol)
+
+    def put_info(self, symbol: str, info: Dict):
+        with self._lock:
+            self._info[symbol] = (time.time(), info)
+
+    def get_info(self, symbol: str) -> Optional[Dict]:
+        return self._get(self._info, symbol)
+
+    def _get(self, store: Dict, symbol: str):
+        with self._lock:
+            entry = store.get(symbol)
+        if entry and time.time() - entry[0] <= self.max_age:
+            return entry[1]
+        return None
+
+# Magasin local global
+local_store = LocalMarketStore()
+
+# ===== YAHOO FINANCE (PRINCIPAL) =====
+
+def yahoo_history(symbol: str, period: str = "6mo") -> 'pd.DataFrame':
+    """Barres journalières Yahoo (une réponse vide est un résultat valide: symbole peu échangé ou récent)"""
+    import pandas as pd
+    import yfinance as yf
+    data = yf.Ticker(symbol).history(period=period)
+    return data if data is not None else pd.DataFrame()
+
+def yahoo_info(symbol: str) -> Dict:
+    """Données fondamentales Yahoo"""
+    import yfinance as yf
+    info = yf.Ticker(symbol).info
+    if not info or not (info.get('currentPrice') or info.get('regularMarketPrice')):
+        raise ValueError(f"Données fondamentales Yahoo vides pour {symbol}")
+    return info
+
+# ===== POLYGON (SECOURS) =====
+
+def _polygon_get(path: str, params: Optional[Dict] = None) -> Dict:
+    """Requête Polygon; un 429 est remonté comme tel pour le contrôle de congestion"""
+    import requests
+    response = requests.get(f"{POLYGON_BASE_URL}{path}",
+                            params={**(params or {}), 'apiKey': os.getenv('POLYGON_API_KEY')}, timeout=10)
+    if response.status_code == 429:
+        raise RuntimeError("429 Too Many Requests (Polygon)")
+    response.raise_for_status()
+    return response.json()
+
+def _polygon_symbol(symbol: str) -> str:
+    """Yahoo note les classes d'actions avec un tiret (BRK-B), Polygon avec un point (BRK.B)"""
+    return symbol.replace('-', '.')
+
+def polygon_history(symbol: str, period: str = "6mo") -> 'pd.DataFrame':
+    """Barres journalières Polygon au format yfinance (Open/High/Low/Close/Volume)"""
+    import pandas as pd
+    end = datetime.now().date()
+    start = end - timedelta(days=PERIOD_DAYS.get(period, 186))
+    data = _polygon_get(f"/v2/aggs/ticker/{_polygon_symbol(symbol)}/range/1/day/{start}/{end}",
+                        {'adjusted': 'true', 'sort': 'asc', 'limit': 5000})
+    results = data.get('results') or []
+    if not results:
+        # Aucune séance sur la période: résultat valide, comme chez Yahoo
+        return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'])
+
+    bars = pd.DataFrame(results)
+    bars.index = pd.to_datetime(bars['t'], unit='ms')
+    return bars.rename(columns={'o': 'Open', 'h': 'High', 'l': 'Low', 'c': 'Close', 'v': 'Volume'})[
+        ['Open', 'High', 'Low', 'Close', 'Volume']]
+
+def polygon_info(symbol: str) -> Dict:
+    """Données fondamentales Polygon, converties aux clés yfinance utilisées par les agents"""
+    ticker = _polygon_symbol(symbol)
+    end = datetime.now().date()
+    # Deux dernières séances: la variation se calcule, comme chez Yahoo, contre la clôture de la veille
+    sessions = _polygon_get(f"/v2/aggs/ticker/{ticker}/range/1/day/{end - timedelta(days=10)}/{end}",
+                            {'adjusted': 'true', 'sort': 'desc', 'limit': 2}).get('results') or []
+    if not sessions:
+        raise ValueError(f"Aucune séance Polygon pour {symbol}")
+    last = sessions[0]
+    previous_close = sessions[1]['c'] if len(sessions) > 1 else None
+    details = _polygon_get(f"/v3/reference/tickers/{ticker}").get('results') or {}
+
+    return {
+        'currentPrice': last['c'],
+        'regularMarketChangePercent': (last['c'] - previous_close) / previous_close * 100 if previous_close else 0,
+        'volume': last['v'],
+        'marketCap': details.get('market_cap', 0),
+        'industry': details.get('sic_description', 'Unknown')
+    }
+
+# ===== BASCULE AUTOMATIQUE =====
+
+def _remote_fetchers(yahoo: Callable, polygon: Callable) -> List[Tuple[str, Callable]]:
+    """Fournisseurs distants dans l'ordre de préférence (Polygon seulement si une clé est configurée)"""
+    fetchers = [('yahoo', yahoo)]
+    if os.getenv('POLYGON_API_KEY'):
+        fetchers.append(('polygon', polygon))
+    return fetchers
+
+def _guarded_fetch(provider: str, fetch: Callable):
+    """Appel d'un fournisseur via son disjoncteur"""
+    return circuit_breakers[provider].call(fetch)
+
+def _windowed_fetch(controller: AIMDConcurrencyController, provider: str, fetch: Callable):
+    """Doublon exécuté dans la place réservée de la fenêtre AIMD (libérée à la fin, même abandonné)"""
+    started = time.perf_counter()
+    try:
+        data = _guarded_fetch(provider, fetch)
+    except BaseException as e:
+        controller.release((time.perf_counter() - started) * 1000, e)
+        raise
+    controller.release((time.perf_counter() - started) * 1000)
+    return data
+
+def _hedged_fetch(fetchers: List[Tuple[str, Callable]], delay: float, policy: HedgePolicy,
+                  errors: List[Tuple[str, Exception]], controller: Optional[AIMDConcurrencyController] = None):
+    """
+    Lance le fournisseur principal; sans réponse après `delay`, double la requête vers le
+    fournisseur de secours (ou une seconde connexion au principal) et garde la première réponse.
+    Le principal occupe la place de l'appelant dans la fenêtre AIMD; le doublon doit en obtenir
+    une seconde, sinon il n'est pas lancé (pas de surcharge d'un fournisseur déjà ralenti).
+
+    Returns:
+        Tuple: ((données, fournisseur) ou None, nombre de fournisseurs déjà essayés)
+    """
+    started = time.perf_counter()
+    primary_provider, primary_fetch = fetchers[0]
+    primary = _hedge_executor.submit(_guarded_fetch, primary_provider, primary_fetch)
+    primary.add_done_callback(lambda _: policy.record_latency((time.perf_counter() - started) * 1000))
+    providers = {primary: primary_provider}
+
+    done, _ = wait([primary], timeout=delay)
+    if not done and policy.acquire_hedge(controller):
+        hedge_provider, hedge_fetch = fetchers[1] if len(fetchers) > 1 else fetchers[0]
+        if controller is not None:
+            hedge = _hedge_executor.submit(_windowed_fetch, controller, hedge_provider, hedge_fetch)
+            # Doublon annulé avant de démarrer: sa place est rendue sans compter d'appel
+            hedge.add_done_callback(lambda future: future.cancelled() and controller.give_back())
+        else:
+            hedge = _hedge_executor.submit(_guarded_fetch, hedge_provider, hedge_fetch)
+        providers[hedge] = hedge_provider
+    tried = min(len(providers), len(fetchers))
+
+    pending = set(providers)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                data = future.result()
+            except Exception as e:
+                errors.append((providers[future], e))
+                continue
+            # Le perdant est abandonné (annulé s'il n'a pas encore démarré, résultat ignoré sinon)
+            for other in pending:
+                other.cancel()
+            if future is not primary:
+                policy.record_hedge_win()
+            return (data, providers[future]), tried
+    return None, tried
+
+def _report_primary_error(controller: Optional[AIMDConcurrencyController], primary: str,
+                          errors: List[Tuple[str, Exception]]):
+    """Signale à la fenêtre AIMD l'échec du principal masqué par un secours (un 429 Yahoo doit la réduire)"""
+    if controller is None:
+        return
+    for provider, error in errors:
+        if provider == primary and not isinstance(error, CircuitOpenError):
+            controller.report_error(error)
+
+def _format_errors(errors: List[Tuple[str, Exception]]) -> str:
+    return '; '.join(str(error) if isinstance(error, CircuitOpenError) else f"{provider}: {error}"
+                     for provider, error in errors)
+
+def _fetch_with_failover(kind: str, symbol: str, fetchers: List[Tuple[str, Callable]],
+                         local_get: Callable[[str], object], policy: Optional[HedgePolicy] = None,
+                         controller: Optional[AIMDConcurrencyController] = None):
+    """
+    Essaie chaque fournisseur via son disjoncteur puis le magasin local; retourne (données, fournisseur)
+
+    controller: fenêtre AIMD de l'appelant, informée des échecs du principal quand un secours répond
+    """
+    errors = []
+    primary = fetchers[0][0]
+    
+    delay = policy.hedge_delay() if policy else None
+    if delay is not None:
+        outcome, tried = _hedged_fetch(fetchers, delay, policy, errors, controller)
+        if outcome:
+            if outcome[1] != primary:
+                _report_primary_error(controller, primary, errors)
+            return outcome
+        fetchers = fetchers[tried:]
+    
+    for index, (provider, fetch) in enumerate(fetchers):
+        try:
+            started = time.perf_counter()
+            data = _guarded_fetch(provider, fetch)
+            if policy and delay is None and index == 0:
+                # Latences du principal: base du p95 de déclenchement
+                policy.record_latency((time.perf_counter() - started) * 1000)
+            if provider != primary:
+                _report_primary_error(controller, primary, errors)
+            return data, provider
+        except Exception as e:
+            errors.append((provider, e))
+
+    cached = local_get(symbol)
+    if cached is not None:
+        logger.info(f"💾 {kind} {symbol} servi par le magasin local ({_format_errors(errors)})")
+        _report_primary_error(controller, primary, errors)
+        return cached, 'local'
+    # Échec complet: l'erreur remonte à l'appelant, dont la fenêtre AIMD la comptabilise
+    raise ProviderUnavailableError(f"{kind} indisponible pour {symbol}: {_format_errors(errors)}")
+
+def fetch_history(symbol: str, period: str = "6mo",
+                  controller: Optional[AIMDConcurrencyController] = None) -> Tuple['pd.DataFrame', str]:
+    """Barres journalières avec bascule automatique; retourne (barres, fournisseur)"""
+    bars, provider = _fetch_with_failover(
+        'Historique', symbol,
+        _remote_fetchers(lambda: yahoo_history(symbol, period), lambda: polygon_history(symbol, period)),
+        local_store.get_bars, hedge_policies['history'], controller
+    )
+    if provider != 'local' and not bars.empty:
+        local_store.put_bars(symbol, bars)
+    return bars, provider
+
+def fetch_info(symbol: str, controller: Optional[AIMDConcurrencyController] = None) -> Tuple[Dict, str]:
+    """Données fondamentales avec bascule automatique; retourne (info au format yfinance, fournisseur)"""
+    info, provider = _fetch_with_failover(
+        'Fondamentaux', symbol,
+        _remote_fetchers(lambda: yahoo_info(symbol), lambda: polygon_info(symbol)),
+        local_store.get_info, hedge_policies['info'], controller
+    )
+    if provider == 'polygon':
+        # Secteur, bêta et ratios absents chez Polygon: repris des dernières données Yahoo connues
+        info = {**(local_store.get_info(symbol) or {}), **info}
+    if provider != 'local':
+        local_store.put_info(symbol, info)
+    return info, provider
+
+def get_hedging_status() -> Dict:
+    """Compteurs et délai de déclenchement du hedging par type de données"""
+    return {kind: policy.get_status() for kind, policy in hedge_policies.items()}
+
+def get_providers_status() -> Dict:
+    """État des disjoncteurs de chaque fournisseur"""
+    return {name: breaker.get_status() for name, breaker in circuit_breakers.items()}
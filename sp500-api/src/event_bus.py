@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Bus d'Événements Interne pour le Bot Trading SP500
+Signale la fin des phases d'analyse sans attente active
+"""
+
+import threading
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Événements publiés par les analyses
+SCAN_COMPLETED = 'scan_completed'              # Fin du scan des 500 tickers (succès, arrêt ou erreur)
+FINALISTS_READY = 'finalists_ready'            # Top 10 disponible pour l'analyse approfondie
+RECOMMENDATION_READY = 'recommendation_ready'  # Recommandation finale publiée
+ORDER_SUBMITTED = 'order_submitted'            # Ordre transmis à Alpaca
+ORDER_FILLED = 'order_filled'                  # Ordre exécuté (quantité et prix moyen d'exécution)
+
+class AnalysisEventBus:
+    """Bus publish/subscribe minimal: les abonnés sont appelés dans le thread qui publie"""
+
+    def __init__(self):
+        """Initialise le bus d'événements"""
+        self._subscribers: Dict[str, List[Callable]] = {}
+        self._last_events: Dict[str, Dict] = {}
+        self._condition = threading.Condition()
+        self.logger = logging.getLogger(__name__)
+
+    def subscribe(self, event: str, callback: Callable[[Dict], Any]) -> Callable[[Dict], Any]:
+        """
+        Abonne un callback à un événement
+
+        Args:
+            event (str): Nom de l'événement
+            callback (Callable): Fonction appelée avec le payload de l'événement
+
+        Returns:
+            Callable: Le callback (utilisable pour se désabonner)
+        """
+        with self._condition:
+            self._subscribers.setdefault(event, []).append(callback)
+        return callback
+
+    def unsubscribe(self, event: str, callback: Callable) -> bool:
+        """Désabonne un callback, retourne False s'il n'était pas abonné"""
+        with self._condition:
+            callbacks = self._subscribers.get(event, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+                return True
+        return False
+
+    def publish(self, event: str, payload: Optional[Dict] = None) -> int:
+        """
+        Publie un événement et notifie les abonnés
+
+        Returns:
+            int: Nombre d'abonnés notifiés
+        """
+        record = {
+            'event': event,
+            'payload': payload or {},
+            'timestamp': datetime.now().isoformat()
+        }
+        with self._condition:
+            sequence = self._last_events.get(event, {}).get('sequence', 0) + 1
+            record['sequence'] = sequence
+            self._last_events[event] = record
+            callbacks = list(self._subscribers.get(event, []))
+            self._condition.notify_all()
+
+        for callback in callbacks:
+            try:
+                callback(record['payload'])
+            except Exception as e:
+                self.logger.error(f"Erreur abonné {event}: {e}")
+        return len(callbacks)
+
+    def wait_for(self, event: str, timeout: Optional[float] = None, after_sequence: int = 0) -> Optional[Dict]:
+        """
+        Bloque jusqu'à la prochaine publication de l'événement
+
+        Args:
+            event (str): Nom de l'événement
+            timeout (float): Délai maximum en secondes (None = illimité)
+            after_sequence (int): Ignore les publications dont la séquence est inférieure ou égale
+
+        Returns:
+            Dict: Enregistrement de l'événement, ou None si le délai est écoulé
+        """
+        def published():
+            return self._last_events.get(event, {}).get('sequence', 0) > after_sequence
+
+        with self._condition:
+            if self._condition.wait_for(published, timeout=timeout):
+                return dict(self._last_events[event])
+        return None
+
+    def last_sequence(self, event: str) -> int:
+        """Séquence de la dernière publication de l'événement (0 si jamais publié)"""
+        with self._condition:
+            return self._last_events.get(event, {}).get('sequence', 0)
+
+    def get_last_events(self) -> Dict[str, Dict]:
+        """Retourne la dernière publication de chaque événement"""
+        with self._condition:
+            return {event: dict(record) for event, record in self._last_events.items()}
+
+# Instance globale du bus d'événements
+event_bus = AnalysisEventBus()
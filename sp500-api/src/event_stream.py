@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Flux d'Événements Server-Sent Events pour le Bot Trading SP500
+Journal circulaire d'événements numérotés, sérialisés une seule fois à la publication;
+chaque client SSE lit à partir de son dernier identifiant (reprise via Last-Event-ID)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, List, Optional, Tuple
+
+from json_codec import dumps
+
+STREAM_CAPACITY = 2000  # Événements conservés pour la reprise après déconnexion
+
+# Identifiants "<démarrage>-<numéro>": un identifiant d'un processus précédent force une resynchronisation
+STREAM_BOOT_ID = f"{os.getpid():x}{int(time.time()):x}"
+
+StreamEvent = Tuple[int, str, str]  # (numéro, type, données JSON)
+
+def format_sse(event_id: str, event: str, data: str) -> str:
+    """Trame SSE d'un événement"""
+    return f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+
+class EventStream:
+    """Journal d'événements borné, partagé par tous les clients SSE"""
+
+    def __init__(self, capacity: int = STREAM_CAPACITY):
+        self._events: deque = deque(maxlen=capacity)
+        self._next_seq = 1
+        self._condition = threading.Condition()
+        self.clients = 0
+
+    def publish(self, event: str, data: Any) -> int:
+        """Ajoute un événement et réveille les clients; retourne son numéro"""
+        return self.publish_serialized(event, dumps(data))
+
+    def publish_serialized(self, event: str, payload: str) -> int:
+        """Ajoute un événement déjà sérialisé (relais des événements du processus d'analyse)"""
+        with self._condition:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._events.append((seq, event, payload))
+            self._condition.notify_all()
+        return seq
+
+    def event_id(self, seq: int) -> str:
+        return f"{STREAM_BOOT_ID}-{seq}"
+
+    def last_seq(self) -> int:
+        return self._next_seq - 1
+
+    def parse_event_id(self, event_id: Optional[str]) -> Optional[int]:
+        """Numéro correspondant à un Last-Event-ID (None si absent, invalide ou d'un autre démarrage)"""
+        if not event_id:
+            return None
+        boot, _, seq = event_id.rpartition('-')
+        if boot != STREAM_BOOT_ID or not seq.isdigit() or int(seq) > self.last_seq():
+            return None
+        return int(seq)
+
+    def read_since(self, seq: int, timeout: float) -> Tuple[List[StreamEvent], bool]:
+        """
+        Événements postérieurs à `seq`, en attendant au plus `timeout` secondes s'il n'y en a aucun
+
+        Returns:
+            Tuple: (événements, trou) - trou=True si des événements ont été évincés du journal
+                   depuis `seq` (le client doit se resynchroniser sur le statut complet)
+        """
+        with self._condition:
+            if self._next_seq - 1 <= seq:
+                self._condition.wait(timeout)
+            if not self._events:
+                return [], False
+            oldest = self._events[0][0]
+            gap = seq + 1 < oldest
+            start = max(seq + 1 - oldest, 0)
+            return list(islice(self._events, start, None)), gap
+
+    def connect(self) -> int:
+        with self._condition:
+            self.clients += 1
+            return self.clients
+
+    def disconnect(self):
+        with self._condition:
+            self.clients -= 1
+
+# Flux global
+event_stream = EventStream()
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Contrôle des Appels Réseau pour le Bot Trading SP500
+Fenêtre de concurrence adaptative AIMD (augmentation additive, diminution multiplicative)
+appliquée aux récupérations de données des agents
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+# Signatures d'erreurs traitées comme un signal de congestion (throttling Yahoo, timeouts)
+CONGESTION_MARKERS = ('429', 'too many requests', 'rate limit', 'ratelimit', 'timed out', 'timeout')
+
+def is_congestion_error(error: BaseException) -> bool:
+    """True si l'erreur indique un throttling ou un timeout du fournisseur"""
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in CONGESTION_MARKERS)
+
+def _percentile(sorted_values, fraction: float) -> float:
+    """Percentile par rang le plus proche sur une liste déjà triée"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+class AIMDConcurrencyController:
+    """
+    Fenêtre de concurrence AIMD pour les appels réseau bloquants
+
+    La fenêtre augmente d'environ 1 par fenêtre d'appels réussis tant que la latence
+    reste sous la cible et que le taux d'erreur reste bas; elle est divisée par deux
+    sur un 429, un timeout ou un pic d'erreurs (au plus une fois par période de refroidissement).
+    """
+
+    def __init__(self, initial_window: int = 10, min_window: int = 2, max_window: int = 40,
+                 latency_target_ms: float = 4000.0, error_rate_threshold: float = 0.2,
+                 decrease_cooldown: float = 2.0, sample_size: int = 200):
+        """
+        Args:
+            initial_window (int): Appels simultanés autorisés au démarrage
+            min_window (int): Plancher de la fenêtre
+            max_window (int): Plafond de la fenêtre (≤ taille du pool d'E/S)
+            latency_target_ms (float): Latence au-delà de laquelle la fenêtre n'augmente plus
+            error_rate_threshold (float): Taux d'erreur récent déclenchant une diminution
+            decrease_cooldown (float): Délai minimal entre deux diminutions (secondes)
+            sample_size (int): Taille de l'historique de latences et d'erreurs
+        """
+        self.min_window = min_window
+        self.max_window = max_window
+        self.latency_target_ms = latency_target_ms
+        self.error_rate_threshold = error_rate_threshold
+        self.decrease_cooldown = decrease_cooldown
+
+        self._window = float(initial_window)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._latencies = deque(maxlen=sample_size)
+        self._outcomes = deque(maxlen=50)  # True = erreur, pour le taux d'erreur récent
+        self._last_decrease = 0.0
+        self.stats = {'calls': 0, 'errors': 0, 'congestion_signals': 0, 'increases': 0, 'decreases': 0}
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def window(self) -> int:
+        """Nombre d'appels simultanés actuellement autorisés"""
+        return int(self._window)
+
+    def acquire(self, cancel_event: Optional[threading.Event] = None) -> bool:
+        """Attend une place dans la fenêtre; False si l'arrêt est demandé pendant l'attente"""
+        with self._condition:
+            while self._in_flight >= int(self._window):
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                self._condition.wait(timeout=0.2)
+            self._in_flight += 1
+            return True
+
+    def try_acquire(self) -> bool:
+        """Prend une place sans attendre; False si la fenêtre est pleine"""
+        with self._condition:
+            if self._in_flight >= int(self._window):
+                return False
+            self._in_flight += 1
+            return True
+
+    def give_back(self):
+        """Rend une place réservée dont l'appel n'a finalement pas eu lieu (sans effet sur la fenêtre)"""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def release(self, latency_ms: float, error: Optional[BaseException] = None):
+        """Libère une place et ajuste la fenêtre selon le résultat de l'appel"""
+        with self._condition:
+            self._in_flight -= 1
+            self.stats['calls'] += 1
+            self._latencies.append(latency_ms)
+
+            if error is not None:
+                self._record_error(error)
+            else:
+                self._outcomes.append(False)
+                if latency_ms <= self.latency_target_ms:
+                    # Augmentation additive: +1 après une fenêtre complète d'appels sains
+                    previous = int(self._window)
+                    self._window = min(self.max_window, self._window + 1.0 / self._window)
+                    if int(self._window) > previous:
+                        self.stats['increases'] += 1
+
+            self._condition.notify_all()
+
+    def report_error(self, error: BaseException):
+        """Échec d'un fournisseur masqué par la bascule (l'appel a réussi via le secours): compte comme signal de congestion"""
+        with self._condition:
+            self._record_error(error)
+
+    def call(self, func: Callable[[], Any], cancel_event: Optional[threading.Event] = None) -> Any:
+        """Exécute un appel bloquant dans la fenêtre (à appeler depuis un thread du pool d'E/S)"""
+        if not self.acquire(cancel_event):
+            raise RuntimeError("Appel annulé avant exécution")
+        started = time.perf_counter()
+        try:
+            result = func()
+        except BaseException as e:
+            self.release((time.perf_counter() - started) * 1000, e)
+            raise
+        self.release((time.perf_counter() - started) * 1000)
+        return result
+
+    def batch_size(self, minimum: int) -> int:
+        """Taille de batch suivant la fenêtre (chaque symbole enchaîne deux appels)"""
+        with self._condition:
+            return max(minimum, int(self._window))
+
+    def batch_pause(self, default: float) -> float:
+        """Pause entre batches: aucune si le fournisseur est sain, la pause d'origine après une congestion récente"""
+        with self._condition:
+            recently_throttled = time.time() - self._last_decrease < 30
+        return default if recently_throttled else 0.0
+
+    def get_status(self) -> Dict:
+        """Fenêtre courante et percentiles de latence observés"""
+        with self._condition:
+            latencies = sorted(self._latencies)
+            return {
+                'window': int(self._window),
+                'in_flight': self._in_flight,
+                'min_window': self.min_window,
+                'max_window': self.max_window,
+                'latency_ms': {
+                    'p50': round(_percentile(latencies, 0.50), 1),
+                    'p95': round(_percentile(latencies, 0.95), 1),
+                    'p99': round(_percentile(latencies, 0.99), 1),
+                    'samples': len(latencies)
+                },
+                'recent_error_rate': round(self._recent_error_rate(), 3),
+                'last_decrease': datetime.fromtimestamp(self._last_decrease).isoformat() if self._last_decrease else None,
+                **self.stats
+            }
+
+    def _recent_error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def _record_error(self, error: BaseException):
+        """Comptabilise une erreur et diminue la fenêtre sur congestion ou pic d'erreurs (appelée sous verrou)"""
+        self._outcomes.append(True)
+        self.stats['errors'] += 1
+        congestion = is_congestion_error(error)
+        if congestion:
+            self.stats['congestion_signals'] += 1
+        error_spike = len(self._outcomes) >= 10 and self._recent_error_rate() > self.error_rate_threshold
+        if congestion or error_spike:
+            self._decrease()
+
+    def _decrease(self):
+        """Diminution multiplicative (appelée sous verrou)"""
+        now = time.time()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        self._window = max(float(self.min_window), self._window / 2)
+        self.stats['decreases'] += 1
+        self.logger.warning(f"🐢 Congestion détectée - fenêtre de concurrence réduite à {int(self._window)}")
+
+class CircuitOpenError(Exception):
+    """Levée quand le circuit d'un fournisseur est ouvert (échec immédiat)"""
+
+class CircuitBreaker:
+    """
+    Disjoncteur par fournisseur de données
+
+    Fermé: les appels passent. Ouvert après une rafale d'échecs (au moins failure_threshold
+    échecs et un taux d'échec ≥ failure_rate sur la fenêtre glissante): les appels échouent
+    immédiatement. Après open_duration, un seul appel de sonde est autorisé (semi-ouvert):
+    succès → fermé, échec → ouvert à nouveau avec une durée doublée (plafonnée).
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 8, failure_rate: float = 0.5,
+                 window_seconds: float = 30.0, open_duration: float = 30.0, max_open_duration: float = 300.0):
+        """
+        Args:
+            name (str): Nom du fournisseur
+            failure_threshold (int): Nombre minimal d'échecs récents pour ouvrir le circuit
+            failure_rate (float): Taux d'échec récent minimal pour ouvrir le circuit
+            window_seconds (float): Fenêtre glissante d'observation (secondes)
+            open_duration (float): Durée d'ouverture avant la sonde (secondes)
+            max_open_duration (float): Durée d'ouverture maximale après sondes ratées
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.window_seconds = window_seconds
+        self.base_open_duration = open_duration
+        self.max_open_duration = max_open_duration
+
+        self.state = self.CLOSED
+        self.open_duration = open_duration
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._events = deque()  # (timestamp, échec)
+        self._lock = threading.Lock()
+        self.stats = {'successes': 0, 'failures': 0, 'rejected': 0, 'opened': 0, 'last_error': None}
+        self.logger = logging.getLogger(__name__)
+
+    def allow(self) -> bool:
+        """True si un appel peut être tenté maintenant (False = échec immédiat)"""
+        with self._lock:
+            if self.state == self.OPEN and time.time() - self._opened_at >= self.open_duration:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+                self.logger.info(f"🔌 Circuit {self.name} semi-ouvert - sonde autorisée")
+
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.stats['rejected'] += 1
+            return False
+
+    def record_success(self):
+        """Enregistre un appel réussi (referme le circuit après une sonde)"""
+        with self._lock:
+            self.stats['successes'] += 1
+            self._record(False)
+            if self.state == self.HALF_OPEN:
+                self.state = self.CLOSED
+                self.open_duration = self.base_open_duration
+                self._events.clear()
+                self.logger.info(f"✅ Circuit {self.name} refermé - fournisseur rétabli")
+
+    def record_failure(self, error: Optional[BaseException] = None):
+        """Enregistre un échec (ouvre le circuit sur rafale, ou après une sonde ratée)"""
+        with self._lock:
+            self.stats['failures'] += 1
+            self.stats['last_error'] = str(error)[:200] if error else None
+            self._record(True)
+
+            if self.state == self.HALF_OPEN:
+                self.open_duration = min(self.max_open_duration, self.open_duration * 2)
+                self._open()
+            elif self.state == self.CLOSED:
+                failures = sum(1 for _, failed in self._events if failed)
+                if failures >= self.failure_threshold and failures / len(self._events) >= self.failure_rate:
+                    self._open()
+
+    def call(self, func: Callable[[], Any]) -> Any:
+        """Exécute un appel protégé par le disjoncteur"""
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit {self.name} ouvert")
+        try:
+            result = func()
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def get_status(self) -> Dict:
+        """État du disjoncteur pour le statut"""
+        with self._lock:
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = round(max(0.0, self.open_duration - (time.time() - self._opened_at)), 1)
+            return {
+                'state': self.state,
+                'open_duration': self.open_duration,
+                'retry_in_seconds': retry_in,
+                **self.stats
+            }
+
+    def _record(self, failed: bool):
+        """Ajoute un résultat à la fenêtre glissante (appelée sous verrou)"""
+        now = time.time()
+        self._events.append((now, failed))
+        while self._events and now - self._events[0][0] > self.window_seconds:
+            self._events.popleft()
+
+    def _open(self):
+        """Ouvre le circuit (appelée sous verrou)"""
+        self.state = self.OPEN
+        self._opened_at = time.time()
+        self._probe_in_flight = False
+        self.stats['opened'] += 1
+        self.logger.warning(f"⚡ Circuit {self.name} ouvert pour {self.open_duration:.0f}s - bascule sur les fournisseurs de secours")
+
+# Disjoncteurs globaux par fournisseur de données
+circuit_breakers = {name: CircuitBreaker(name) for name in ('yahoo', 'polygon')}
+
+class HedgePolicy:
+    """
+    Requêtes couvertes (hedging) pour les symboles à latence de queue
+
+    Si l'appel principal n'a pas répondu au p95 observé, un doublon est lancé vers le
+    fournisseur de secours; le premier résultat l'emporte. Le nombre de doublons est
+    plafonné à une fraction du nombre de requêtes (budget de charge supplémentaire).
+    """
+
+    def __init__(self, enabled: bool = False, budget_fraction: float = 0.05, percentile: float = 0.95,
+                 min_samples: int = 20, sample_size: int = 500):
+        """
+        Args:
+            enabled (bool): Active le hedging
+            budget_fraction (float): Fraction maximale de requêtes doublées
+            percentile (float): Percentile de latence au-delà duquel le doublon est lancé
+            min_samples (int): Latences nécessaires avant le premier doublon
+            sample_size (int): Taille de l'historique de latences
+        """
+        self.enabled = enabled
+        self.budget_fraction = budget_fraction
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=sample_size)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'hedges': 0, 'hedge_wins': 0, 'budget_exhausted': 0, 'window_full': 0}
+
+    def hedge_delay(self) -> Optional[float]:
+        """Délai (secondes) avant de doubler une requête; None si le hedging ne s'applique pas"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self.stats['requests'] += 1
+            if len(self._latencies) < self.min_samples:
+                return None
+            return _percentile(sorted(self._latencies), self.percentile) / 1000
+
+    def record_latency(self, latency_ms: float):
+        """Latence d'un appel principal terminé"""
+        with self._lock:
+            self._latencies.append(latency_ms)
+
+    def acquire_hedge(self, controller: Optional[AIMDConcurrencyController] = None) -> bool:
+        """Réserve un doublon si le budget le permet et, avec une fenêtre AIMD, si elle a une place libre
+
+        La place prise dans `controller` est à libérer (release) à la fin du doublon.
+        """
+        with self._lock:
+            if self.stats['hedges'] + 1 > self.budget_fraction * self.stats['requests']:
+                self.stats['budget_exhausted'] += 1
+                return False
+            if controller is not None and not controller.try_acquire():
+                self.stats['window_full'] += 1
+                return False
+            self.stats['hedges'] += 1
+            return True
+
+    def record_hedge_win(self):
+        with self._lock:
+            self.stats['hedge_wins'] += 1
+
+    def get_status(self) -> Dict:
+        """Configuration, délai courant et compteurs"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                'enabled': self.enabled,
+                'budget_fraction': self.budget_fraction,
+                'hedge_delay_ms': round(_percentile(latencies, self.percentile), 1) if len(latencies) >= self.min_samples else None,
+                'samples': len(latencies),
+                **self.stats
+            }
@@ -14,14 +14,15 @@ from typing import Dict, List, Optional, Tuple, Any, Union
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass, asdict
-import yfinance as yf
-import requests
 import warnings
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
 import os
 import sys
 import math
+import threading
+from concurrent.futures import Executor
+
+from fetch_control import AIMDConcurrencyController
+from data_providers import fetch_history, fetch_info
 
 warnings.filterwarnings('ignore')
 
@@ -121,6 +122,7 @@ class AIAnalysisResult:
     # Nouveaux composants V3 avec valeurs par défaut (À LA FIN)
     momentum_score: float = 50.0  # Nouveau composant V3
     diversity_bonus: float = 0.0  # Nouveau bonus V3
+    base_equitable_score: float = 0.0  # Score avant bonus de diversité (passe 1)
     
     # Métadonnées
     analysis_version: str = "V3_Complete"
@@ -897,9 +899,17 @@ class EquitableDistributionEngine:
     
     def calculate_diversity_bonus(self, market_data: MarketData, sector_stats: Dict, quintile_stats: Dict) -> float:
         """Calcule le bonus de diversité pour équilibrer la sélection"""
+        sector_count = sector_stats.get(market_data.sector, 0)
+        total_analyzed = sum(sector_stats.values())
         
-        # Bonus selon quintile de capitalisation (favorise les plus petites caps)
-        quintile = self._determine_quintile(market_data.market_cap)
+        total_bonus = (self.calculate_quintile_diversity_bonus(market_data.market_cap) +
+                       self.calculate_sector_diversity_bonus(sector_count, total_analyzed))
+        return round(total_bonus, 1)
+    
+    def calculate_quintile_diversity_bonus(self, market_cap: float) -> float:
+        """Bonus selon quintile de capitalisation, indépendant de l'ordre de traitement (NOUVEAU V3)"""
+        # Favorise les plus petites caps
+        quintile = self._determine_quintile(market_cap)
         quintile_bonuses = {
             1: 0.0,   # Large Cap - pas de bonus
             2: 3.7,   # Large-Mid Cap
@@ -907,10 +917,11 @@ class EquitableDistributionEngine:
             4: 11.8,  # Small-Mid Cap
             5: 16.4   # Small Cap - bonus maximum
         }
-        
+        return quintile_bonuses[quintile]
+    
+    def calculate_sector_diversity_bonus(self, sector_count: int, total_analyzed: int) -> float:
+        """Bonus de sous-représentation sectorielle + pénalité anti-concentration (NOUVEAU V3)"""
         # Bonus selon sous-représentation sectorielle
-        sector = market_data.sector
-        sector_count = sector_stats.get(sector, 0)
         if sector_count == 0:
             sector_bonus = 12.7  # Premier du secteur
         elif sector_count == 1:
@@ -921,7 +932,6 @@ class EquitableDistributionEngine:
             sector_bonus = 0.0   # Secteur déjà bien représenté
         
         # Bonus anti-concentration
-        total_analyzed = sum(sector_stats.values())
         if total_analyzed > 0:
             sector_concentration = sector_count / total_analyzed
             if sector_concentration > 0.22:  # Plus de 22% du même secteur
@@ -933,8 +943,7 @@ class EquitableDistributionEngine:
         else:
             concentration_penalty = 0.0
         
-        total_bonus = quintile_bonuses[quintile] + sector_bonus + concentration_penalty
-        return round(total_bonus, 1)
+        return sector_bonus + concentration_penalty
     
     def _determine_quintile(self, market_cap: float) -> int:
         """Détermine le quintile basé sur la capitalisation boursière"""
@@ -952,12 +961,29 @@ class EquitableDistributionEngine:
 class AdvancedIndividualAgentV3:
     """Agent individuel avancé V3 COMPLET avec toutes les fonctions préservées"""
     
-    def __init__(self, symbol: str, polygon_key: str, sector_data: Dict = None, quintile_data: Dict = None):
+    def __init__(self, symbol: str, polygon_key: str, sector_data: Dict = None, quintile_data: Dict = None,
+                 defer_diversity_bonus: bool = False, cancel_event: Optional[threading.Event] = None,
+                 executor: Optional[Executor] = None, light_mode: bool = False,
+                 fetch_controller: Optional[AIMDConcurrencyController] = None):
         self.symbol = symbol.upper()
         self.polygon_key = polygon_key
         self.sector_data = sector_data or {}
         self.quintile_data = quintile_data or {}
         
+        # Si activé, le bonus de diversité (dépendant des autres symboles) est laissé
+        # à l'orchestrateur qui l'applique sur le jeu complet de résultats (passe 2)
+        self.defer_diversity_bonus = defer_diversity_bonus
+        
+        # Annulation coopérative et pool pour les appels réseau bloquants
+        self.cancel_event = cancel_event
+        self.executor = executor
+        
+        # Fenêtre de concurrence adaptative partagée entre agents (None = pas de limitation)
+        self.fetch_controller = fetch_controller
+        
+        # Mode allégé (échéance serrée): Stochastic RSI et détection de patterns ignorés
+        self.light_mode = light_mode
+        
         # Configuration logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(f"AgentV3_{self.symbol}")
@@ -973,6 +999,9 @@ class AdvancedIndividualAgentV3:
         self.technical_indicators = None
         self.historical_data = None
         
+        # Fournisseur ayant servi chaque type de données (yahoo, polygon ou local)
+        self.data_sources = {}
+        
         self.logger.info(f"🤖 Agent V3 Complet initialisé pour {self.symbol}")
     
     async def run_complete_analysis(self) -> Dict[str, Any]:
@@ -984,6 +1013,9 @@ class AdvancedIndividualAgentV3:
             self.logger.info(f"📊 Récupération données de marché pour {self.symbol}")
             market_data = await self._fetch_market_data()
             
+            if self._is_cancelled():
+                return {'error': f'Analyse annulée pour {self.symbol}', 'cancelled': True}
+            
             if not market_data:
                 return {'error': f'Impossible de récupérer les données pour {self.symbol}'}
             
@@ -991,6 +1023,9 @@ class AdvancedIndividualAgentV3:
             self.logger.info(f"📈 Récupération données historiques pour {self.symbol}")
             historical_data = await self._fetch_historical_data()
             
+            if self._is_cancelled():
+                return {'error': f'Analyse annulée pour {self.symbol}', 'cancelled': True}
+            
             if historical_data is None or len(historical_data) < 50:
                 return {'error': f'Données historiques insuffisantes pour {self.symbol}'}
             
@@ -1012,6 +1047,8 @@ class AdvancedIndividualAgentV3:
                 'ai_analysis': asdict(ai_analysis),
                 'analysis_time': round(analysis_time, 2),
                 'analysis_version': 'V3_Complete',
+                'analysis_depth': 'light' if self.light_mode else 'full',
+                'data_sources': self.data_sources,
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -1024,12 +1061,24 @@ class AdvancedIndividualAgentV3:
             self.logger.error(f"❌ Erreur analyse V3 complète {self.symbol}: {e}")
             return {'error': str(e)}
     
+    def _is_cancelled(self) -> bool:
+        """Vérifie si l'orchestrateur a demandé l'arrêt de l'analyse"""
+        return self.cancel_event is not None and self.cancel_event.is_set()
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Exécute un appel bloquant (yfinance) hors de la boucle asyncio pour qu'il reste annulable"""
+        loop = asyncio.get_running_loop()
+        if self.fetch_controller is not None:
+            return await loop.run_in_executor(
+                self.executor, lambda: self.fetch_controller.call(lambda: func(*args, **kwargs), self.cancel_event))
+        return await loop.run_in_executor(self.executor, lambda: func(*args, **kwargs))
+    
     async def _fetch_market_data(self) -> Optional[MarketData]:
         """Récupère les données de marché actuelles (PRÉSERVÉ INTÉGRALEMENT)"""
         try:
-            # Utilisation de yfinance pour les données de base
-            ticker = yf.Ticker(self.symbol)
-            info = ticker.info
+            # Yahoo Finance, avec bascule automatique si son circuit est ouvert
+            info, provider = await self._run_blocking(fetch_info, self.symbol, controller=self.fetch_controller)
+            self.data_sources['market_data'] = provider
             
             # Données de base
             current_price = info.get('currentPrice', info.get('regularMarketPrice', 0))
@@ -1070,8 +1119,8 @@ class AdvancedIndividualAgentV3:
     async def _fetch_historical_data(self, period: str = "6mo") -> Optional[pd.DataFrame]:
         """Récupère les données historiques (PRÉSERVÉ INTÉGRALEMENT)"""
         try:
-            ticker = yf.Ticker(self.symbol)
-            data = ticker.history(period=period)
+            data, provider = await self._run_blocking(fetch_history, self.symbol, period=period, controller=self.fetch_controller)
+            self.data_sources['historical_data'] = provider
             
             if data.empty:
                 return None
@@ -1102,7 +1151,7 @@ class AdvancedIndividualAgentV3:
             rsi_7 = self.tech_calc.calculate_rsi(prices, 7)
             rsi_14 = self.tech_calc.calculate_rsi(prices, 14)
             rsi_21 = self.tech_calc.calculate_rsi(prices, 21)
-            stochastic_rsi = self.tech_calc.calculate_stochastic_rsi(prices, 14)
+            stochastic_rsi = 50.0 if self.light_mode else self.tech_calc.calculate_stochastic_rsi(prices, 14)
             
             # MACD (amélioré V3)
             macd_short, signal_short, hist_short = self.tech_calc.calculate_macd(prices, 5, 15, 9)
@@ -1132,7 +1181,10 @@ class AdvancedIndividualAgentV3:
                 vpt = round(volumes.iloc[-1] * price_change, 2)
             
             # Patterns (préservé intégralement)
-            pattern, pattern_confidence = self.pattern_detector.detect_patterns(prices, volumes)
+            if self.light_mode:
+                pattern, pattern_confidence = "NO_PATTERN", 0.0
+            else:
+                pattern, pattern_confidence = self.pattern_detector.detect_patterns(prices, volumes)
             
             # Support et Résistance
             support_level = round(prices.rolling(window=20).min().iloc[-1] if len(prices) >= 20 else prices.iloc[-1], 2)
@@ -1234,21 +1286,27 @@ class AdvancedIndividualAgentV3:
             quintile_rank = self._determine_quintile(market_data.market_cap)
             quintile_bonus = self._get_quintile_bonus(quintile_rank)
             
-            # 5. Bonus de diversité V3 (NOUVEAU)
-            diversity_bonus = self.distribution_engine.calculate_diversity_bonus(
-                market_data, self.sector_data, self.quintile_data
-            )
+            # 5. Score brut (passe 1) - indépendant de l'ordre de traitement
+            base_equitable_score = overall_score * sector_factor * (1 + quintile_bonus/100)
+            
+            # 6. Bonus de diversité V3 (différé en passe 2 si demandé)
+            if self.defer_diversity_bonus:
+                diversity_bonus = 0.0
+            else:
+                diversity_bonus = self.distribution_engine.calculate_diversity_bonus(
+                    market_data, self.sector_data, self.quintile_data
+                )
             
-            # 6. Score équitable final V3
-            equitable_score = min(100.0, overall_score * sector_factor * (1 + quintile_bonus/100) + diversity_bonus)
+            # 7. Score équitable final V3
+            equitable_score = min(100.0, base_equitable_score + diversity_bonus)
             
-            # 7. Génération des signaux (préservée + améliorée)
+            # 8. Génération des signaux (préservée + améliorée)
             buy_signals, sell_signals = self._generate_signals(indicators, market_data)
             
-            # 8. Recommandation finale V3 (seuils précis)
+            # 9. Recommandation finale V3 (seuils précis)
             recommendation, confidence = self._generate_recommendation_v3(equitable_score, buy_signals, sell_signals)
             
-            # 9. Raisonnement (préservé + amélioré)
+            # 10. Raisonnement (préservé + amélioré)
             reasoning = self._generate_reasoning(indicators, market_data, equitable_score)
             
             return AIAnalysisResult(
@@ -1265,6 +1323,7 @@ class AdvancedIndividualAgentV3:
                 sector_rank=50,  # Sera calculé par l'orchestrateur
                 quintile_bonus=quintile_bonus,
                 diversity_bonus=diversity_bonus,  # NOUVEAU V3
+                base_equitable_score=round(base_equitable_score, 2),
                 buy_signals=buy_signals,
                 sell_signals=sell_signals,
                 recommendation=recommendation,
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Sérialisation JSON Rapide pour le Bot Trading SP500
+- Encodeur orjson s'il est installé (repli sur json de la bibliothèque standard)
+- Dataclasses sérialisées directement, sans la copie profonde de dataclasses.asdict
+- Compression gzip/brotli des réponses JSON volumineuses, négociée par Accept-Encoding
+
+Banc d'essai sur le payload complet des 500 résultats: python json_codec.py
+"""
+
+import gzip
+import json
+import time
+import dataclasses
+from collections import deque
+from collections.abc import Mapping
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+from flask.json.provider import JSONProvider
+
+# Encodeur et compression optionnels (pip install orjson brotli)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+# Clés non chaînes (compteurs par quintile), tableaux et scalaires numpy acceptés nativement
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if ORJSON_AVAILABLE else 0
+
+COMPRESSION_MIN_SIZE = 1024  # En dessous, l'en-tête et le coût CPU dépassent le gain
+GZIP_LEVEL = 5               # Compromis débit/taille pour une compression à chaque requête
+BROTLI_QUALITY = 4           # Qualité "dynamique": plus compact que gzip à coût comparable
+COMPRESSIBLE_MIMETYPES = {'application/json'}
+
+def json_default(obj: Any) -> Any:
+    """Types non natifs: appelé par l'encodeur pour chaque objet inconnu (les enfants restent à sa charge)"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # Un niveau seulement: l'encodeur descend lui-même dans les champs, sans copie profonde
+        return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+    if isinstance(obj, Mapping):
+        return dict(obj)  # Instantanés en lecture seule (MappingProxyType)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if type(obj).__module__ == 'numpy':
+        # Scalaires et tableaux numpy, sans importer numpy (chargé uniquement par la pile d'analyse)
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset, deque)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return str(obj)
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Sérialise en JSON compact UTF-8"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, default=json_default, option=ORJSON_OPTIONS)
+        except TypeError:
+            pass  # Entier hors 64 bits, sous-classe exotique...: repli sur l'encodeur standard
+    return json.dumps(obj, default=json_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def dumps(obj: Any) -> str:
+    return dumps_bytes(obj).decode('utf-8')
+
+def loads(data) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class FastJSONProvider(JSONProvider):
+    """Fournisseur JSON de Flask (jsonify, request.get_json) basé sur l'encodeur rapide"""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj)
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        # Corps en octets directement (pas d'aller-retour str -> bytes)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
+
+def negotiate_encoding(accept_encodings) -> Optional[str]:
+    """Meilleur codage accepté par le client: brotli si disponible, sinon gzip"""
+    if BROTLI_AVAILABLE and accept_encodings.quality('br') > 0:
+        return 'br'
+    if accept_encodings.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+def compress_response(response, accept_encodings):
+    """
+    Compresse une réponse JSON complète si le client l'accepte
+
+    Les flux (SSE), fichiers statiques, réponses déjà codées (relayées par le processus
+    d'analyse) et petits corps sont laissés tels quels. L'ETag devient faible: le corps
+    compressé diffère octet par octet mais représente la même version.
+    """
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    body = response.get_data()
+    encoding = negotiate_encoding(accept_encodings)
+    if encoding is None or len(body) < COMPRESSION_MIN_SIZE:
+        return response
+
+    response.set_data(compress_body(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def run_benchmark(count: int = 500, rounds: int = 20):
+    """Compare jsonify + asdict (chemin d'origine) au chemin rapide sur le payload complet des résultats"""
+    import random
+    from flask import Flask
+    from central_orchestrator import EquitableAnalysisResult
+
+    random.seed(42)
+    sectors = ['Technology', 'Healthcare', 'Financials', 'Energy', 'Industrials', 'Utilities']
+    results = [
+        EquitableAnalysisResult(
+            symbol=f"SYM{i:03d}", overall_score=random.uniform(0, 100), equitable_score=random.uniform(0, 100),
+            rsi_score=random.uniform(0, 100), macd_score=random.uniform(0, 100), bollinger_score=random.uniform(0, 100),
+            ma_score=random.uniform(0, 100), volume_score=random.uniform(0, 100), pattern_score=random.uniform(0, 100),
+            risk_score=random.uniform(0, 100), price=random.uniform(10, 900), change_percent=random.uniform(-5, 5),
+            volume=random.randint(10**5, 10**8), market_cap=random.uniform(1e9, 3e12),
+            sector=random.choice(sectors), industry='Industrie', beta=random.uniform(0.5, 2),
+            sector_rank=random.randint(1, 50), quintile_rank=random.randint(1, 5), quintile_name='Q3 - Mid Cap',
+            buy_signals=['RSI survente', 'Croisement MACD haussier', 'Volume en hausse'],
+            sell_signals=['Résistance proche'], recommendation='BUY', confidence=random.random(),
+            reasoning=['Momentum positif sur 5 jours', 'Score équitable au-dessus de la médiane sectorielle',
+                       'Volatilité contenue', 'Tendance MA50 haussière'],
+            source='benchmark', timestamp=datetime.now(), analysis_version='V3'
+        )
+        for i in range(count)
+    ]
+
+    app = Flask(__name__)
+
+    def measure(label, serialize):
+        serialize()
+        started = time.perf_counter()
+        for _ in range(rounds):
+            body = serialize()
+        elapsed = (time.perf_counter() - started) / rounds * 1000
+        print(f"{label:<44} {elapsed:8.2f} ms {len(body) / 1024:9.1f} Ko")
+        return body
+
+    print(f"Payload: {count} résultats, moyenne sur {rounds} itérations "
+          f"(orjson: {'oui' if ORJSON_AVAILABLE else 'non'}, brotli: {'oui' if BROTLI_AVAILABLE else 'non'})")
+    with app.app_context():
+        measure("jsonify([asdict(r)]) - chemin d'origine",
+                lambda: app.json.response([dataclasses.asdict(r) for r in results]).get_data())
+    body = measure("dumps_bytes(results) - chemin rapide", lambda: dumps_bytes(results))
+    measure("  + gzip", lambda: compress_body(body, 'gzip'))
+    if BROTLI_AVAILABLE:
+        measure("  + brotli", lambda: compress_body(body, 'br'))
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Initialisation Différée pour le Bot Trading SP500
+Les composants coûteux (orchestrateur et pile d'analyse pandas/yfinance, connexion Alpaca)
+ne sont plus créés à l'import: ils le sont au premier usage, ou préchargés en arrière-plan
+une fois le serveur démarré (démarrage à froid rapide sur Render et pour chaque worker)
+"""
+
+import threading
+import time
+import logging
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class LazyInstance:
+    """
+    Mandataire d'une instance unique créée au premier accès à l'un de ses attributs
+
+    La création est protégée par un verrou: les threads qui arrivent pendant le chargement
+    attendent la même instance. Les attributs du mandataire sont préfixés _lazy_ pour ne
+    jamais masquer ceux de l'instance.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, '_lazy_factory', factory)
+        object.__setattr__(self, '_lazy_instance', None)
+        object.__setattr__(self, '_lazy_lock', threading.Lock())
+
+    def _lazy_get(self) -> Any:
+        instance = self._lazy_instance
+        if instance is None:
+            with self._lazy_lock:
+                instance = self._lazy_instance
+                if instance is None:
+                    instance = self._lazy_factory()
+                    object.__setattr__(self, '_lazy_instance', instance)
+        return instance
+
+    def __getattr__(self, name):
+        return getattr(self._lazy_get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._lazy_get(), name, value)
+
+def is_loaded(proxy: Optional[LazyInstance]) -> bool:
+    """True si l'instance existe déjà (consultation sans déclencher le chargement)"""
+    return proxy is not None and proxy._lazy_instance is not None
+
+def warm_up(tasks: List[Callable[[], Any]], name: str = "sp500-warmup") -> threading.Thread:
+    """Précharge en arrière-plan (thread démon): le serveur répond pendant le chargement"""
+    def run():
+        started = time.perf_counter()
+        for task in tasks:
+            try:
+                task()
+            except Exception as e:
+                logger.warning(f"Préchargement incomplet: {e}")
+        logger.info(f"🔥 Préchargement terminé en {time.perf_counter() - started:.2f}s")
+
+    thread = threading.Thread(target=run, daemon=True, name=name)
+    thread.start()
+    return thread
@@ -5,23 +5,24 @@ Version complète intégrant TOUTES les fonctionnalités existantes + améliorat
 FICHIER À COPIER/COLLER : sp500-api/src/main.py
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
-import pandas as pd
 import os
 import sys
 import asyncio
 import threading
+import importlib
+import importlib.util
 from datetime import datetime, timedelta
-import yfinance as yf
-import numpy as np
-from textblob import TextBlob
-import requests
 import warnings
 import time
-import schedule
 from threading import Timer
+from concurrent.futures import Future
 import json
+import bisect
+import heapq
+import queue
+from collections import deque
 
 # AJOUT DES IMPORTS POUR LE NOUVEAU SYSTÈME ÉQUITABLE
 from dotenv import load_dotenv
@@ -30,16 +31,25 @@ load_dotenv()
 # NOUVEAUX IMPORTS POUR LE MODE AUTOMATIQUE AVEC HORLOGE
 import pytz
 from schedule_manager import schedule_manager
-
-# Import des nouveaux modules améliorés (avec fallback si non disponibles)
-try:
-    from individual_agent_v2 import AdvancedIndividualAgentV3, create_advanced_agent, analyze_symbol_advanced
-    from central_orchestrator import AdvancedCentralOrchestratorV3, create_advanced_orchestrator
-    EQUITABLE_SYSTEM_AVAILABLE = True
-    print("✅ Système équitable V3 chargé")
-except ImportError as e:
-    EQUITABLE_SYSTEM_AVAILABLE = False
-    print(f"⚠️ Système équitable V3 non disponible: {e}")
+from event_bus import event_bus, SCAN_COMPLETED, FINALISTS_READY, RECOMMENDATION_READY, ORDER_SUBMITTED, ORDER_FILLED
+from event_stream import event_stream, format_sse
+from scan_checkpoint import ScanCheckpoint
+from scan_deadline import DeadlinePassedError, parse_deadline, upcoming_deadline, deadline_pressure, build_completeness
+from fetch_control import circuit_breakers
+from data_providers import fetch_history, get_providers_status, get_hedging_status
+from status_store import VersionedStatusStore
+from analysis_worker import WORKER_MODE, SNAPSHOT_STALE_AFTER, LeaderLock, WorkerClient, WorkerServer, WorkerUnavailableError
+from json_codec import FastJSONProvider, compress_response, dumps_bytes, loads as json_loads
+from lazy_init import LazyInstance, is_loaded, warm_up
+
+# Système équitable V3: importé au premier usage (pandas, yfinance, agents); disponibilité vérifiée sans import
+EQUITABLE_REQUIREMENTS = ('pandas', 'numpy', 'yfinance', 'central_orchestrator', 'individual_agent_v2')
+missing_requirements = [module for module in EQUITABLE_REQUIREMENTS if importlib.util.find_spec(module) is None]
+EQUITABLE_SYSTEM_AVAILABLE = not missing_requirements
+if EQUITABLE_SYSTEM_AVAILABLE:
+    print("✅ Système équitable V3 disponible (chargement différé)")
+else:
+    print(f"⚠️ Système équitable V3 non disponible: modules manquants {', '.join(missing_requirements)}")
 
 # Import du module de trading Alpaca CORRIGÉ
 try:
@@ -90,6 +100,8 @@ else:
 # Configuration Flask
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
+# Sérialisation rapide (orjson si installé, dataclasses sans asdict)
+app.json = FastJSONProvider(app)
 
 # Configuration CORS pour Render + Netlify
 CORS(app, origins=[
@@ -98,14 +110,58 @@ CORS(app, origins=[
     'https://sensational-pavlova-7f2b18.netlify.app',  # Votre URL Netlify réelle
     'https://sp500-day-tradingbot-dashboard.netlify.app',  # URL alternative
     'https://main--sp500-day-tradingbot-dashboard.netlify.app'  # URL de branche
-], supports_credentials=True )
+], supports_credentials=True,
+   # Requêtes conditionnelles du tableau de bord: ETag lisible en cross-origin, preflight mis en cache
+   expose_headers=['ETag', 'Last-Modified'], max_age=600)
 
-# Instance globale de l'orchestrateur équitable V3 (si disponible)
-if EQUITABLE_SYSTEM_AVAILABLE:
-    orchestrator_v2 = AdvancedCentralOrchestratorV3()
+# Mode web séparé (ANALYSIS_WORKER_MODE=web): les routes API s'exécutent dans le processus d'analyse
+worker_client = WorkerClient() if WORKER_MODE == 'web' else None
+
+# Rôle de leader (horloges, analyses planifiées, trading): un seul processus par machine
+leader_lock = LeaderLock()
+
+@app.before_request
+def forward_to_analysis_worker():
+    """Relaie les requêtes API au processus d'analyse; /api/status est servi depuis l'instantané partagé"""
+    if not worker_client or not request.path.startswith('/api/') or request.path == '/api/stream':
+        return None
+    
+    if request.path == '/api/status':
+        snapshot = worker_client.read_snapshot()
+        if snapshot is None:
+            return jsonify({'success': False, 'message': "Processus d'analyse non démarré"}), 503
+        payload, age = snapshot
+        response = Response(payload, mimetype='application/json')
+        response.headers['X-Snapshot-Age'] = f"{age:.1f}"
+        if age > SNAPSHOT_STALE_AFTER:
+            response.headers['Warning'] = '110 - "Instantané périmé"'
+        response.add_etag()
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    
+    try:
+        headers = {k: v for k, v in request.headers.items()
+                   if k.lower() in ('content-type', 'accept', 'accept-encoding', 'if-none-match', 'if-modified-since')}
+        status, response_headers, body = worker_client.forward(
+            request.method, request.path, request.query_string, request.get_data(), headers)
+    except WorkerUnavailableError as e:
+        return jsonify({'success': False, 'message': f'Erreur: {str(e)}'}), 503
+    return Response(body, status=status, headers=response_headers)
+
+@app.after_request
+def compress_json_responses(response):
+    """Compression gzip/brotli des réponses JSON volumineuses (déjà compressées si relayées par le worker)"""
+    return compress_response(response, request.accept_encodings)
+
+def create_orchestrator():
+    """Crée l'orchestrateur équitable V3 (import de la pile d'analyse au premier usage)"""
+    from central_orchestrator import AdvancedCentralOrchestratorV3
+    orchestrator = AdvancedCentralOrchestratorV3()
     print("🚀 Orchestrateur Central Avancé V3 initialisé")
-else:
-    orchestrator_v2 = None
+    return orchestrator
+
+# Instance globale de l'orchestrateur équitable V3 (si disponible), créée au premier accès
+orchestrator_v2 = LazyInstance(create_orchestrator) if EQUITABLE_SYSTEM_AVAILABLE else None
 
 
 # ===== FONCTION DE SYNCHRONISATION AJOUTÉE =====
@@ -143,7 +199,8 @@ def sync_trading_config_with_analysis():
         return {'success': False, 'message': str(e)}
 
 # Variables globales pour les modes (système original conservé)
-system_status = {
+# Magasin versionné: écritures verrouillées, instantané immuable publié à chaque écriture
+system_status = VersionedStatusStore({
     'running': False,
     'analyzed_stocks': 0,
     'total_stocks': 0,
@@ -168,9 +225,26 @@ system_status = {
     'use_final_recommendation': False,
     # NOUVEAU: Tracker pour éviter les doubles achats
     'processed_recommendations': set()  # Set des recommandations déjà traitées (symbol + timestamp)
-}
+}, private_keys=('processed_recommendations',))
 analysis_thread = None
 stop_analysis_flag = False
+stop_analysis_event = threading.Event()  # Réveille immédiatement les attentes en cas d'arrêt
+
+# Séries prix/volumes de la dernière passe complète (base des cycles delta du mode seuil)
+price_series_cache = {}
+PRICE_SERIES_WINDOW = 100
+# Cycles delta: dernier score rapide par symbole (cached_at de sa série, score) et analyses approfondies de la bande
+delta_state = {'scores': {}, 'deep': {}, 'day': None}
+
+def reset_delta_state():
+    """Oublie les scores et analyses approfondies des cycles delta (nouveau run seuil, nouvelle passe complète)"""
+    delta_state.update({'scores': {}, 'deep': {}, 'day': datetime.now().date()})
+# Pipeline spéculatif des finalistes (analyse approfondie pendant la fin du scan des 500)
+PIPELINE_FINALISTS_ENABLED = True
+PIPELINE_DELTA_HISTORY = 5    # Scans complets dont les variations de score mesurées bornent les symboles restants
+last_scan_scores = {}         # Scores du dernier scan complet des 500 (bornes pour le verrouillage)
+score_delta_history = deque(maxlen=PIPELINE_DELTA_HISTORY)  # Plus grande variation |score| mesurée par scan complet
+scan_checkpoint_500 = ScanCheckpoint('original')  # Journal de reprise du scan des 500 (mode original)
 auto_timer_500 = None  # DEPRECATED - à remplacer par schedule_job_500
 auto_timer_10 = None   # DEPRECATED - à remplacer par schedule_job_10
 schedule_job_500 = None  # Job de planification pour analyse 500
@@ -333,16 +407,23 @@ def calculate_bollinger_bands(prices, period=20, std_dev=2):
 
 def analyze_stock_with_polygon(symbol):
     """Analyse d'une action avec Polygon uniquement"""
+    import numpy as np
+    import requests
     try:
         # Utilisation de Polygon
         polygon_key = os.getenv('POLYGON_API_KEY')
-        if polygon_key:
+        polygon_breaker = circuit_breakers['polygon']
+        # Circuit ouvert: Polygon est ignoré immédiatement au lieu d'attendre son échec
+        if polygon_key and polygon_breaker.allow():
             try:
                 url = f"https://api.polygon.io/v2/aggs/ticker/{symbol}/prev"
                 params = {"apikey": polygon_key}
                 
                 response = requests.get(url, params=params, timeout=10)
-                if response.status_code == 200:
+                if response.status_code != 200:
+                    polygon_breaker.record_failure(RuntimeError(f"HTTP {response.status_code}"))
+                else:
+                    polygon_breaker.record_success()
                     data = response.json()
                     if data.get('results'):
                         result = data['results'][0]
@@ -350,9 +431,12 @@ def analyze_stock_with_polygon(symbol):
                         current_price = result['c']
                         prices = [current_price * (1 + np.random.normal(0, 0.01)) for _ in range(50)]
                         volumes = [result['v']] * 50
+                        # Date de séance de la barre (horodatage Polygon en millisecondes)
+                        as_of = datetime.fromtimestamp(result['t'] / 1000).date() if result.get('t') else None
                         
-                        return analyze_with_prices(symbol, prices, volumes, "Polygon")
+                        return analyze_with_prices(symbol, prices, volumes, "Polygon", as_of)
             except Exception as e:
+                polygon_breaker.record_failure(e)
                 print(f"Erreur Polygon pour {symbol}: {e}")
         
         # Fallback: Yahoo Finance
@@ -362,8 +446,14 @@ def analyze_stock_with_polygon(symbol):
         print(f"Erreur analyse pour {symbol}: {e}")
         return analyze_stock_simple(symbol)
 
-def analyze_with_prices(symbol, prices, volumes, source):
-    """Analyse avec données de prix et volumes"""
+def analyze_with_prices(symbol, prices, volumes, source, as_of=None, cache=True):
+    """
+    Analyse avec données de prix et volumes
+    
+    `as_of` est la date de séance de la dernière barre: avec `cache`, la série est conservée
+    pour les cycles delta (jamais sans date de séance, la barre suivante serait mal placée)
+    """
+    import numpy as np
     try:
         if not prices:
             return None
@@ -476,7 +566,19 @@ def analyze_with_prices(symbol, prices, volumes, source):
             change = ((prices[-1] - prices[-2]) / prices[-2]) * 100
         else:
             change = 0
-        
+
+        # Conservation de la série pour un re-scoring incrémental ultérieur
+        if cache and as_of:
+            price_series_cache[symbol] = {
+                'prices': list(prices[-PRICE_SERIES_WINDOW:]),
+                'volumes': list(volumes[-PRICE_SERIES_WINDOW:]) if volumes else [],
+                'source': source,
+                'date': as_of,                        # Séance de la dernière barre de la série
+                'fetched_on': datetime.now().date(),  # Jour de la passe complète
+                'cached_at': time.time(),
+                'score': round(score, 1)
+            }
+
         return {
             'symbol': symbol,
             'price': round(current_price, 2),
@@ -497,9 +599,8 @@ def analyze_with_prices(symbol, prices, volumes, source):
 def analyze_stock_simple(symbol):
     """Analyse simplifiée d'une action avec Yahoo Finance (fallback)"""
     try:
-        # Récupération des données
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period="3mo")
+        # Récupération des données (bascule Polygon / magasin local si le circuit Yahoo est ouvert)
+        hist, provider = fetch_history(symbol, period="3mo")
         
         if hist.empty:
             return None
@@ -507,7 +608,8 @@ def analyze_stock_simple(symbol):
         prices = hist['Close'].tolist()
         volumes = hist['Volume'].tolist()
         
-        return analyze_with_prices(symbol, prices, volumes, "Yahoo Finance")
+        source = {'yahoo': "Yahoo Finance", 'polygon': "Polygon", 'local': "Local Store"}[provider]
+        return analyze_with_prices(symbol, prices, volumes, source, hist.index[-1].date())
         
     except Exception as e:
         print(f"Erreur analyse simple pour {symbol}: {e}")
@@ -515,6 +617,7 @@ def analyze_stock_simple(symbol):
 
 def load_sp500_symbols():
     """Charge la liste complète des symboles S&P 500"""
+    import pandas as pd
     try:
         # Essayer de charger le fichier CSV
         csv_path = os.path.join(os.path.dirname(__file__), 'S&P_list.csv')
@@ -607,6 +710,9 @@ def load_sp500_symbols():
 
 def analyze_news_sentiment(symbol):
     """Analyse du sentiment des news Yahoo Finance"""
+    import numpy as np
+    import yfinance as yf
+    from textblob import TextBlob
     try:
         ticker = yf.Ticker(symbol)
         news = ticker.news
@@ -639,14 +745,13 @@ def start_auto_schedule_500():
         
         def auto_start_500():
             print(f"🕐 Démarrage automatique de l'analyse des 500 tickers à {schedule_time}")
-            if start_analysis_500():
+            if start_analysis_500(scheduled_deadline()):
                 print("✅ Analyse 500 démarrée automatiquement")
             else:
                 print("❌ Impossible de démarrer l'analyse 500 automatiquement")
         
         # Programmer l'exécution quotidienne à l'heure spécifiée
-        schedule.every().day.at(schedule_time).do(auto_start_500)
-        schedule_job_500 = True
+        schedule_job_500 = schedule_manager.add_schedule(schedule_time, auto_start_500, 'auto_analysis_500', weekdays_only=False)
         print(f"📅 Analyse 500 tickers programmée quotidiennement à {schedule_time}")
 
 def start_auto_schedule_10():
@@ -661,7 +766,7 @@ def start_auto_schedule_10():
             print(f"🕐 Démarrage automatique de l'analyse des 10 finalistes à {schedule_time}")
             # Vérifier qu'on a bien un Top 10 avant de lancer
             if system_status.get('phase') == 'completed_500' and system_status.get('top_10_candidates'):
-                if start_analysis_10():
+                if start_analysis_10(scheduled_deadline()):
                     print("✅ Analyse 10 finalistes démarrée automatiquement")
                 else:
                     print("❌ Impossible de démarrer l'analyse 10 finalistes automatiquement")
@@ -669,16 +774,17 @@ def start_auto_schedule_10():
                 print("❌ Pas de Top 10 disponible pour l'analyse automatique")
         
         # Programmer l'exécution quotidienne à l'heure spécifiée
-        schedule.every().day.at(schedule_time).do(auto_start_10)
-        schedule_job_10 = True
+        schedule_job_10 = schedule_manager.add_schedule(schedule_time, auto_start_10, 'auto_analysis_10', weekdays_only=False)
         print(f"📅 Analyse 10 finalistes programmée quotidiennement à {schedule_time}")
 
 def start_auto_schedule_sequence():
     """Démarre la séquence automatique avec horaires programmés"""
     global schedule_job_500, schedule_job_10
     
-    # Arrêter les planifications existantes
-    schedule.clear()
+    # Arrêter les planifications existantes (les autres tâches du gestionnaire sont conservées)
+    for job_id in ('auto_analysis_500', 'auto_analysis_10'):
+        if job_id in schedule_manager.scheduled_jobs:
+            schedule_manager.remove_schedule(job_id)
     schedule_job_500 = None
     schedule_job_10 = None
     
@@ -696,90 +802,163 @@ def start_auto_schedule_sequence():
     start_schedule_monitor()
 
 def start_schedule_monitor():
-    """Démarre le thread de surveillance des planifications"""
-    def schedule_monitor():
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Vérifier toutes les minutes
-    
-    monitor_thread = threading.Thread(target=schedule_monitor)
-    monitor_thread.daemon = True
-    monitor_thread.start()
+    """S'assure que le gestionnaire d'horaires unique (tas de minuteries) est démarré"""
+    if not schedule_manager.running:
+        schedule_manager.start_scheduler()
     print("📊 Moniteur de planification démarré")
 
 # ===== FONCTIONS D'ANALYSE PRINCIPALES =====
 
-def start_analysis_500():
-    """Démarre l'analyse des 500 tickers"""
+# Phases terminales considérées comme un succès pour chaque étape
+SCAN_SUCCESS_PHASES = ('completed_500', 'completed_500_equitable')
+FINALISTS_SUCCESS_PHASES = ('completed_10', 'completed_10_equitable')
+
+def _launch_analysis(target, stage, *args):
+    """Lance une analyse dans le thread d'analyse et retourne un future résolu à sa fin"""
     global analysis_thread, stop_analysis_flag
     
-    if system_status['running']:
-        return False
-    
     stop_analysis_flag = False
+    stop_analysis_event.clear()
+    future = Future()
     
-    # Choisir le mode d'analyse selon la disponibilité du système équitable
-    if system_status.get('equitable_mode', False) and EQUITABLE_SYSTEM_AVAILABLE:
-        analysis_thread = threading.Thread(target=run_equitable_analysis_500)
-    else:
-        analysis_thread = threading.Thread(target=run_analysis_500)
+    def runner():
+        try:
+            target(*args)
+        finally:
+            future.set_result(_publish_stage_completion(stage))
     
+    analysis_thread = threading.Thread(target=runner)
     analysis_thread.daemon = True
     analysis_thread.start()
+    return future
+
+def _publish_stage_completion(stage):
+    """Publie les événements de fin d'étape et retourne le résultat du future"""
+    phase = system_status.get('phase')
+    
+    if stage == '500':
+        candidates = system_status.get('top_10_candidates') or []
+        success = phase in SCAN_SUCCESS_PHASES
+        result = {'stage': stage, 'phase': phase, 'success': success, 'candidates': len(candidates)}
+        event_bus.publish(SCAN_COMPLETED, result)
+        if success and candidates:
+            event_bus.publish(FINALISTS_READY, {'phase': phase, 'symbols': [c.get('symbol') for c in candidates]})
+        return result
     
-    return True
+    # RECOMMENDATION_READY est publié par l'analyse elle-même, dès l'enregistrement de la recommandation
+    recommendation = system_status.get('final_recommendation')
+    success = phase in FINALISTS_SUCCESS_PHASES
+    return {'stage': stage, 'phase': phase, 'success': success, 'has_recommendation': bool(recommendation)}
 
-def start_analysis_10():
-    """Démarre l'analyse des 10 finalistes"""
-    global analysis_thread, stop_analysis_flag
+def _publish_recommendation(phase, recommendation):
+    """Signale la recommandation finale dès sa publication (réveille l'attente du trading en mémoire)"""
+    if recommendation:
+        event_bus.publish(RECOMMENDATION_READY, {
+            'phase': phase,
+            'symbol': recommendation.get('symbol'),
+            'score': recommendation.get('score')
+        })
+
+def submit_analysis_500(deadline=None, resume=False):
+    """Démarre l'analyse des 500 tickers, retourne son future (None si une analyse est déjà en cours)
     
+    deadline: timestamp epoch auquel le meilleur Top 10 disponible doit être publié
+    resume: reprend le dernier scan interrompu (symboles déjà traités rechargés du journal)
+    """
     if system_status['running']:
-        return False
+        return None
+    
+    # Nouvelle passe complète: les cycles delta repartiront de ses finalistes
+    reset_delta_state()
+    
+    # Choisir le mode d'analyse selon la disponibilité du système équitable
+    if system_status.get('equitable_mode', False) and EQUITABLE_SYSTEM_AVAILABLE:
+        return _launch_analysis(run_equitable_analysis_500, '500', deadline, resume)
+    return _launch_analysis(run_analysis_500, '500', deadline, resume)
+
+def submit_analysis_10(deadline=None):
+    """Démarre l'analyse des 10 finalistes, retourne son future (None si impossible)"""
+    if system_status['running']:
+        return None
     
     # Vérifier qu'on a des candidats
     if not system_status.get('top_10_candidates'):
         print("❌ Aucun candidat Top 10 disponible")
-        return False
-    
-    stop_analysis_flag = False
+        return None
     
     # Choisir le mode d'analyse selon la disponibilité du système équitable
     if system_status.get('equitable_mode', False) and EQUITABLE_SYSTEM_AVAILABLE:
-        analysis_thread = threading.Thread(target=run_equitable_analysis_10)
-    else:
-        analysis_thread = threading.Thread(target=run_analysis_10)
-    
-    analysis_thread.daemon = True
-    analysis_thread.start()
-    
-    return True
+        return _launch_analysis(run_equitable_analysis_10, '10')
+    return _launch_analysis(run_analysis_10, '10', deadline)
+
+def start_analysis_500(deadline=None, resume=False):
+    """Démarre l'analyse des 500 tickers"""
+    return submit_analysis_500(deadline, resume) is not None
 
-def run_analysis_500():
+def start_analysis_10(deadline=None):
+    """Démarre l'analyse des 10 finalistes"""
+    return submit_analysis_10(deadline) is not None
+
+def run_analysis_500(deadline=None, resume=False):
     """Exécute l'analyse des 500 tickers S&P 500 (mode original)"""
     global stop_analysis_flag
     
     try:
         symbols = load_sp500_symbols()
         
+        # Pipeline spéculatif: gagnants probables d'abord (ordre du planificateur du scan V3), pour verrouiller tôt le Top 10
+        pipeline_enabled = PIPELINE_FINALISTS_ENABLED
+        if pipeline_enabled:
+            if scan_planner_500 is not None:
+                scan_planner_500.previous_scores = dict(last_scan_scores)
+                symbols = scan_planner_500.build_order(symbols)
+            remaining_bounds = sorted(_score_upper_bound(sym) for sym in symbols)
+            scanned_scores = []
+            finalist_pipeline.start()
+        
+        # Journal de reprise: en mode "resume", les symboles déjà traités (même date de données) sont rechargés
+        restored = scan_checkpoint_500.begin(len(symbols), resume=resume)
+        restored = {symbol: restored[symbol] for symbol in symbols if symbol in restored}
+        results = list(restored.values())
+        if pipeline_enabled:
+            for analysis in results:
+                remaining_bounds.pop(bisect.bisect_left(remaining_bounds, _score_upper_bound(analysis['symbol'])))
+                bisect.insort(scanned_scores, analysis['score'])
+        
         # Mise à jour du statut initial
         system_status.update({
             'running': True,
             'analyzed_stocks': 0,
             'total_stocks': len(symbols),
             'start_time': datetime.now().isoformat(),
-            'phase': 'analyzing_500'
+            'phase': 'analyzing_500',
+            'speculative_finalists': [],
+            'completeness': None,
+            'resumed_symbols': len(restored)
         })
         
         print(f"🚀 Démarrage de l'analyse de {len(symbols)} tickers S&P 500 (mode original)")
+        if restored:
+            print(f"♻️ Reprise: {len(restored)} symboles rechargés du journal, {len(symbols) - len(restored)} restants")
         
-        results = []
+        pending = [symbol for symbol in symbols if symbol not in restored]
+        scan_started = time.time()
+        scanned = len(restored)
+        deadline_hit = False
         
-        for i, symbol in enumerate(symbols):
+        for i, symbol in enumerate(pending, start=len(restored)):
             if stop_analysis_flag:
                 print("⏹️ Analyse arrêtée par l'utilisateur")
                 break
+            
+            # Échéance atteinte: le meilleur Top 10 disponible est publié
+            if deadline and time.time() >= deadline:
+                deadline_hit = True
+                print(f"⏰ Échéance atteinte après {scanned}/{len(symbols)} symboles - publication du meilleur Top 10")
+                break
                 
             try:
+                scanned = i + 1
                 print(f"📊 Analyse {i+1}/{len(symbols)}: {symbol}")
                 
                 # Analyse de l'action
@@ -787,46 +966,75 @@ def run_analysis_500():
                 
                 if analysis:
                     results.append(analysis)
+                    scan_checkpoint_500.append([analysis])
+                    event_stream.publish('symbol_results', [{
+                        'symbol': symbol,
+                        'score': analysis['score'],
+                        'recommendation': analysis['recommendation']
+                    }])
                     print(f"✅ {symbol}: Score {analysis['score']} - {analysis['recommendation']} (Source: {analysis.get('source', 'Unknown')})")
                 else:
                     print(f"❌ Échec analyse {symbol}")
                 
+                if pipeline_enabled:
+                    remaining_bounds.pop(bisect.bisect_left(remaining_bounds, _score_upper_bound(symbol)))
+                    if analysis:
+                        bisect.insort(scanned_scores, analysis['score'])
+                    system_status['speculative_finalists'] = _lock_finalists(results, scanned_scores, remaining_bounds)
+                
                 # Mise à jour du statut
                 system_status.update({
                     'analyzed_stocks': i + 1,
                     'last_update': datetime.now().isoformat()
                 })
                 
-                # Pause entre analyses
-                time.sleep(0.5)
+                # Pause entre analyses (interrompue dès l'arrêt, supprimée si l'échéance est menacée)
+                if not deadline_pressure(deadline, scan_started, i + 1 - len(restored), len(symbols) - i - 1):
+                    stop_analysis_event.wait(0.5)
                 
             except Exception as e:
                 print(f"❌ Erreur analyse {symbol}: {e}")
         
+        # Scan mené à son terme: journal supprimé (seul un scan interrompu reste reprenable)
+        if not stop_analysis_flag and not deadline_hit:
+            scan_checkpoint_500.clear()
+        
         # Tri et sélection du Top 10
         results.sort(key=lambda x: x['score'], reverse=True)
         top_10 = results[:10]
         
+        if pipeline_enabled:
+            if stop_analysis_flag:
+                finalist_pipeline.reset()
+            else:
+                # Les finalistes restants rejoignent le pipeline dès la fermeture du scan
+                record_scan_scores(results, complete=not deadline_hit)
+                finalist_pipeline.close_scan([r['symbol'] for r in top_10])
+        
         # Mise à jour du statut final
         system_status.update({
             'running': False,
             'phase': 'completed_500',
             'last_update': datetime.now().isoformat(),
             'top_10_candidates': top_10,
-            'top_opportunities': results[:20]  # Top 20 pour affichage
+            'top_opportunities': results[:20],  # Top 20 pour affichage
+            'completeness': build_completeness(scanned, len(symbols), len(results),
+                                               deadline_hit=deadline_hit, deadline_ts=deadline)
         })
         
         print(f"✅ Analyse des 500 tickers terminée - Top 10 sélectionné")
         
     except Exception as e:
         print(f"❌ Erreur critique dans l'analyse 500: {e}")
+        # Analyses spéculatives du scan échoué abandonnées (la prochaine analyse repart de zéro)
+        finalist_pipeline.reset()
         system_status.update({
             'running': False,
             'phase': 'error',
             'last_update': datetime.now().isoformat()
         })
 
-def run_equitable_analysis_500():
+def run_equitable_analysis_500(deadline=None, resume=False):
     """Exécute l'analyse équitable des 500 tickers avec le système V2"""
     global stop_analysis_flag
     
@@ -834,28 +1042,29 @@ def run_equitable_analysis_500():
         print("🚀 Démarrage de l'analyse équitable des 500 tickers (Système V2)")
         
         # Utilisation de l'orchestrateur équitable V2
-        result = asyncio.run(orchestrator_v2.start_equitable_analysis_500())
+        result = asyncio.run(orchestrator_v2.start_equitable_analysis_500(deadline=deadline, resume=resume))
         
         if result['success']:
             print("✅ Analyse équitable démarrée avec succès")
             
-            # Surveillance de l'avancement
-            while orchestrator_v2.status.running and not stop_analysis_flag:
-                status = orchestrator_v2.get_status()
-                
-                # Mise à jour du statut système
-                system_status.update({
-                    'running': True,
-                    'analyzed_stocks': status.get('analyzed_stocks', 0),
-                    'total_stocks': status.get('total_stocks', 500),
-                    'phase': 'analyzing_500_equitable',
-                    'last_update': datetime.now().isoformat()
-                })
-                
-                time.sleep(2)  # Vérifier toutes les 2 secondes
+            # La progression est lue en direct par /api/status; on attend simplement la fin du scan
+            system_status.update({
+                'running': True,
+                'analyzed_stocks': 0,
+                'total_stocks': orchestrator_v2.status.total_stocks or 500,
+                'phase': 'analyzing_500_equitable',
+                'completeness': None,
+                'last_update': datetime.now().isoformat()
+            })
+            scan_result = orchestrator_v2.run_future.result()
+            system_status.update({
+                'analyzed_stocks': scan_result.get('analyzed_stocks', 0),
+                'completeness': orchestrator_v2.status.completeness,
+                'resumed_symbols': orchestrator_v2.status.resumed_symbols
+            })
             
             # Récupération des résultats finaux
-            if not stop_analysis_flag:
+            if not stop_analysis_flag and not scan_result.get('cancelled'):
                 top_10_result = orchestrator_v2.get_top_10()
                 diversity_metrics = orchestrator_v2.status.diversity_metrics
                 
@@ -874,6 +1083,11 @@ def run_equitable_analysis_500():
                 else:
                     raise Exception("Aucun résultat Top 10 équitable obtenu")
             else:
+                system_status.update({
+                    'running': False,
+                    'phase': 'stopped',
+                    'last_update': datetime.now().isoformat()
+                })
                 print("⏹️ Analyse équitable arrêtée par l'utilisateur")
         else:
             raise Exception(f"Échec démarrage analyse équitable: {result.get('message', 'Erreur inconnue')}")
@@ -886,7 +1100,7 @@ def run_equitable_analysis_500():
             'last_update': datetime.now().isoformat()
         })
 
-def run_analysis_10():
+def run_analysis_10(deadline=None):
     """Exécute l'analyse approfondie des 10 finalistes (mode original)"""
     global stop_analysis_flag
     
@@ -909,31 +1123,49 @@ def run_analysis_10():
         print(f"🔍 Analyse approfondie des {len(candidates)} finalistes (mode original)")
         
         enhanced_results = []
+        started = time.time()
+        analyzed = 0
+        degraded = 0
+        deadline_hit = False
         
         for i, candidate in enumerate(candidates):
             if stop_analysis_flag:
                 print("⏹️ Analyse arrêtée par l'utilisateur")
                 break
+            
+            # Échéance atteinte: les finalistes restants gardent leur score du scan
+            if deadline and time.time() >= deadline:
+                deadline_hit = True
+                print(f"⏰ Échéance atteinte - {len(candidates) - i} finaliste(s) conservé(s) avec leur score du scan")
+                enhanced_results.extend(dict(c, analysis_depth='scan_only') for c in candidates[i:])
+                break
                 
             try:
+                analyzed = i + 1
                 symbol = candidate['symbol']
                 print(f"🔬 Analyse approfondie {i+1}/{len(candidates)}: {symbol}")
                 
-                # Analyse approfondie avec sentiment
-                enhanced_analysis = analyze_stock_with_polygon(symbol)
+                # Analyse approfondie déjà réalisée pendant la fin du scan ?
+                enhanced_analysis = finalist_pipeline.take(symbol)
+                if enhanced_analysis:
+                    enhanced_results.append(enhanced_analysis)
+                    print(f"⚡ {symbol}: analyse approfondie anticipée réutilisée (score {enhanced_analysis['score']:.1f})")
+                    system_status.update({
+                        'analyzed_stocks': i + 1,
+                        'last_update': datetime.now().isoformat()
+                    })
+                    continue
+
+                # Échéance menacée: finalistes les moins bien classés analysés sans sentiment
+                light = deadline_pressure(deadline, started, i, len(candidates) - i)
+                if light:
+                    degraded += 1
                 
+                # Analyse approfondie avec sentiment
+                enhanced_analysis = deep_analyze_candidate(symbol, with_sentiment=not light)
+
                 if enhanced_analysis:
-                    # Ajout de l'analyse de sentiment
-                    sentiment = analyze_news_sentiment(symbol)
-                    enhanced_analysis['sentiment'] = round(sentiment, 3)
-                    
-                    # Ajustement du score avec le sentiment
-                    sentiment_bonus = sentiment * 10  # Bonus/malus basé sur le sentiment
-                    enhanced_analysis['score'] = min(100, max(0, enhanced_analysis['score'] + sentiment_bonus))
-                    enhanced_analysis['score'] = round(enhanced_analysis['score'], 1)
-                    
                     enhanced_results.append(enhanced_analysis)
-                    print(f"✅ {symbol}: Score final {enhanced_analysis['score']:.1f} (sentiment: {sentiment:.3f})")
                 
                 # Mise à jour du statut
                 system_status.update({
@@ -941,12 +1173,181 @@ def run_analysis_10():
                     'last_update': datetime.now().isoformat()
                 })
                 
-                # Pause plus longue pour l'analyse approfondie
-                time.sleep(1)
+                # Pause plus longue pour l'analyse approfondie (interrompue dès l'arrêt)
+                if not light:
+                    stop_analysis_event.wait(1)
                 
             except Exception as e:
                 print(f"❌ Erreur analyse approfondie {candidate['symbol']}: {e}")
-        
+
+        # Résultats spéculatifs consommés: une nouvelle analyse des 10 repartira de zéro
+        finalist_pipeline.reset()
+        finalize_analysis_10(enhanced_results, extra_status={
+            'completeness': build_completeness(analyzed, len(candidates), len(enhanced_results),
+                                               degraded, deadline_hit, deadline)
+        })
+
+    except Exception as e:
+        print(f"❌ Erreur critique dans l'analyse 10: {e}")
+        system_status.update({
+            'running': False,
+            'phase': 'error',
+            'last_update': datetime.now().isoformat()
+        })
+
+def deep_analyze_candidate(symbol, with_sentiment=True):
+    """Analyse approfondie d'un finaliste: analyse technique + ajustement par le sentiment des news"""
+    enhanced_analysis = analyze_stock_with_polygon(symbol)
+
+    if enhanced_analysis and not with_sentiment:
+        # Mode allégé sous échéance: pas de récupération des news
+        enhanced_analysis['analysis_depth'] = 'light'
+        return enhanced_analysis
+
+    if enhanced_analysis:
+        # Ajout de l'analyse de sentiment
+        sentiment = analyze_news_sentiment(symbol)
+        enhanced_analysis['sentiment'] = round(sentiment, 3)
+
+        # Ajustement du score avec le sentiment
+        sentiment_bonus = sentiment * 10  # Bonus/malus basé sur le sentiment
+        enhanced_analysis['score'] = min(100, max(0, enhanced_analysis['score'] + sentiment_bonus))
+        enhanced_analysis['score'] = round(enhanced_analysis['score'], 1)
+
+        print(f"✅ {symbol}: Score final {enhanced_analysis['score']:.1f} (sentiment: {sentiment:.3f})")
+
+    return enhanced_analysis
+
+class SpeculativeFinalistPipeline:
+    """Analyse approfondie des finalistes verrouillés pendant que le scan des 500 se termine"""
+    
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._queue = queue.Queue()
+        self._worker = None
+        self.submitted = []    # Ordre de soumission
+        self.wanted = set()    # Symboles encore utiles (finalistes verrouillés ou définitifs)
+        self.results = {}      # Analyses approfondies terminées
+        self.scan_closed = False
+    
+    def start(self):
+        """Réinitialise le pipeline pour un nouveau scan et démarre le worker"""
+        self.reset()
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, args=(self._queue,), daemon=True)
+        self._worker.start()
+    
+    def reset(self):
+        """Oublie les résultats spéculatifs (nouveau scan ou résultats consommés)"""
+        with self._condition:
+            if self._worker and self._worker.is_alive():
+                self._queue.put(None)
+            self._worker = None
+            self.submitted = []
+            self.wanted = set()
+            self.results = {}
+            self.scan_closed = False
+            self._condition.notify_all()
+    
+    def submit(self, symbol):
+        """Soumet un finaliste pour l'analyse approfondie (une seule fois par scan)"""
+        with self._condition:
+            self.wanted.add(symbol)
+            if symbol in self.submitted or not self._worker:
+                return False
+            self.submitted.append(symbol)
+        self._queue.put(symbol)
+        return True
+    
+    def close_scan(self, finalists):
+        """Fin du scan: ajoute les finalistes restants et abandonne les spéculations devenues inutiles"""
+        with self._condition:
+            self.wanted = set(finalists)
+            self.scan_closed = True
+        for symbol in finalists:
+            self.submit(symbol)
+        self._queue.put(None)
+    
+    def take(self, symbol, timeout=120):
+        """Retourne l'analyse approfondie d'un finaliste (attend si elle est en cours), None sinon"""
+        with self._condition:
+            if symbol not in self.submitted:
+                return None
+            self._condition.wait_for(
+                lambda: symbol in self.results or not (self._worker and self._worker.is_alive()),
+                timeout=timeout
+            )
+            return self.results.get(symbol)
+    
+    def _run(self, work_queue):
+        """Worker: analyse les finalistes dans l'ordre de verrouillage"""
+        try:
+            while True:
+                symbol = work_queue.get()
+                if symbol is None or stop_analysis_flag:
+                    break
+                with self._condition:
+                    if work_queue is not self._queue or symbol not in self.wanted:
+                        continue
+                try:
+                    enhanced = deep_analyze_candidate(symbol)
+                except Exception as e:
+                    print(f"❌ Erreur analyse spéculative {symbol}: {e}")
+                    enhanced = None
+                with self._condition:
+                    if work_queue is self._queue and enhanced:
+                        self.results[symbol] = enhanced
+                    self._condition.notify_all()
+        finally:
+            with self._condition:
+                self._condition.notify_all()
+
+finalist_pipeline = SpeculativeFinalistPipeline()
+
+def create_scan_planner():
+    """Planificateur d'ordre du scan V3 (score attendu: scan précédent + instantané groupé), pour le mode original"""
+    from central_orchestrator import ScanPriorityPlanner
+    return ScanPriorityPlanner()
+
+scan_planner_500 = LazyInstance(create_scan_planner) if EQUITABLE_SYSTEM_AVAILABLE else None
+
+def record_scan_scores(results, complete=True):
+    """Mémorise les scores du scan et, pour un scan complet, la plus grande variation mesurée depuis le précédent"""
+    scores = {r['symbol']: r['score'] for r in results}
+    if complete:
+        deltas = [abs(score - last_scan_scores[symbol]) for symbol, score in scores.items() if symbol in last_scan_scores]
+        if deltas:
+            score_delta_history.append(max(deltas))
+    last_scan_scores.clear()
+    last_scan_scores.update(scores)
+
+def _score_upper_bound(symbol):
+    """
+    Score maximal d'un symbole non encore scanné: score du scan précédent plus la plus grande variation
+    mesurée sur les derniers scans complets (100, borne réelle du score, si l'un ou l'autre manque)
+    """
+    previous = last_scan_scores.get(symbol)
+    if previous is None or not score_delta_history:
+        return 100.0
+    return min(100.0, previous + max(score_delta_history))
+
+def _lock_finalists(results, scanned_scores, remaining_bounds, k=10):
+    """Soumet au pipeline les membres du Top K que les symboles restants ne peuvent plus dépasser"""
+    locked = []
+    for candidate in heapq.nlargest(k, results, key=lambda x: x['score']):
+        score = candidate['score']
+        # Symboles déjà scannés classés devant (égalités comptées prudemment) + menaces restantes
+        ahead = len(scanned_scores) - bisect.bisect_left(scanned_scores, score) - 1
+        threats = len(remaining_bounds) - bisect.bisect_left(remaining_bounds, score)
+        if ahead + threats < k:
+            locked.append(candidate['symbol'])
+            if finalist_pipeline.submit(candidate['symbol']):
+                print(f"🔒 Finaliste verrouillé: {candidate['symbol']} ({score}) - analyse approfondie anticipée")
+    return locked
+
+def finalize_analysis_10(enhanced_results, extra_status=None):
+    """Trie les finalistes, publie la recommandation finale (phase completed_10) et déclenche l'achat si autorisé"""
+    try:
         # CORRECTION FINALE: Tri final et création de la recommandation (toujours créée pour l'affichage)
         enhanced_results.sort(key=lambda x: x['score'], reverse=True)
         final_recommendation = enhanced_results[0] if enhanced_results else None
@@ -977,9 +1378,11 @@ def run_analysis_10():
             'phase': 'completed_10',
             'last_update': datetime.now().isoformat(),
             'top_10_candidates': enhanced_results,
-            'final_recommendation': final_recommendation
+            'final_recommendation': final_recommendation,
+            **(extra_status or {})
         })
-        
+        _publish_recommendation('completed_10', final_recommendation)
+
         print(f"✅ Analyse des 10 finalistes terminée")
         
         # ===== CORRECTION FINALE: DÉCLENCHER L'ACHAT IMMÉDIAT SEULEMENT SI AUTORISÉ =====
@@ -1019,23 +1422,21 @@ def run_equitable_analysis_10():
         if result['success']:
             print("✅ Analyse équitable approfondie démarrée avec succès")
             
-            # Surveillance de l'avancement
-            while orchestrator_v2.status.running and not stop_analysis_flag:
-                status = orchestrator_v2.get_status()
-                
-                # Mise à jour du statut système
-                system_status.update({
-                    'running': True,
-                    'analyzed_stocks': status.get('analyzed_stocks', 0),
-                    'total_stocks': status.get('total_stocks', 10),
-                    'phase': 'analyzing_10_equitable',
-                    'last_update': datetime.now().isoformat()
-                })
-                
-                time.sleep(1)  # Vérifier toutes les secondes
+            # La progression est lue en direct par /api/status; on attend simplement la fin de l'analyse
+            system_status.update({
+                'running': True,
+                'analyzed_stocks': 0,
+                'total_stocks': orchestrator_v2.status.total_stocks or 10,
+                'phase': 'analyzing_10_equitable',
+                'last_update': datetime.now().isoformat()
+            })
+            run_result = orchestrator_v2.run_future.result()
+            system_status['analyzed_stocks'] = orchestrator_v2.status.analyzed_stocks
+            if run_result.get('phase') == 'error':
+                raise Exception("Échec de l'analyse équitable approfondie (voir les journaux de l'orchestrateur)")
             
             # Récupération des résultats finaux
-            if not stop_analysis_flag:
+            if not stop_analysis_flag and not run_result.get('cancelled'):
                 final_result = orchestrator_v2.get_final_recommendation()
                 top_10_result = orchestrator_v2.get_top_10()
                 
@@ -1047,6 +1448,7 @@ def run_equitable_analysis_10():
                     'final_recommendation': final_result.get('recommendation'),
                     'last_update': datetime.now().isoformat()
                 })
+                _publish_recommendation('completed_10_equitable', final_result.get('recommendation'))
                 
                 print(f"✅ Analyse équitable approfondie terminée")
                 
@@ -1076,6 +1478,11 @@ def run_equitable_analysis_10():
                         else:
                             print(f"✅ Recommandation équitable créée - Déclencheur équitable désactivé (évite double ordre)")
             else:
+                system_status.update({
+                    'running': False,
+                    'phase': 'stopped',
+                    'last_update': datetime.now().isoformat()
+                })
                 print("⏹️ Analyse équitable approfondie arrêtée par l'utilisateur")
         else:
             raise Exception(f"Échec démarrage analyse équitable approfondie: {result.get('message', 'Erreur inconnue')}")
@@ -1129,6 +1536,12 @@ def reset_analysis_data():
         'equitable_mode': equitable_mode
     })
     
+    # Journaux de reprise: les données de la veille ne sont plus reprenables
+    scan_checkpoint_500.clear()
+    if orchestrator_v2:
+        for checkpoint in orchestrator_v2.checkpoints.values():
+            checkpoint.clear()
+    
     print("✅ Données d'analyse réinitialisées")
 
 # ===== VIDAGE QUOTIDIEN AUTOMATIQUE DU CACHE =====
@@ -1159,21 +1572,14 @@ def daily_cache_cleanup():
 def setup_daily_cache_cleanup():
     """Configure le vidage quotidien à minuit US (EST)"""
     try:
-        # Programmer pour minuit heure US (EST)
-        schedule.every().day.at("00:00").do(daily_cache_cleanup)
+        # Programmer pour minuit heure US (EST), quel que soit le fuseau du serveur
+        schedule_manager.add_schedule("00:00", daily_cache_cleanup, 'daily_cache_cleanup',
+                                      weekdays_only=False, timezone='America/New_York')
         print("📅 Vidage quotidien programmé à minuit US (EST)")
         # TEST - À ACTIVER POUR TESTER SANS ATTENDRE MINUIT
-        # schedule.every(2).minutes.do(daily_cache_cleanup)  # Test toutes les 2 minutes
-        def run_scheduler():
-            while True:
-                try:
-                    schedule.run_pending()
-                    time.sleep(60)
-                except Exception as e:
-                    print(f"⚠️ Erreur scheduler: {e}")
-                    time.sleep(300)
-        scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-        scheduler_thread.start()
+        # schedule_manager.add_interval('daily_cache_cleanup_test', daily_cache_cleanup, 120)  # Test toutes les 2 minutes
+        if not schedule_manager.running:
+            schedule_manager.start_scheduler()
         print("🚀 Scheduler de vidage quotidien démarré")
     except Exception as e:
         print(f"❌ Erreur configuration scheduler: {e}")
@@ -1208,23 +1614,104 @@ def home():
         }
     })
 
-@app.route('/api/status', methods=['GET'])
-def get_status():
-    """Retourne le statut actuel du système"""
-    # Récupération des paramètres de configuration
-    mode = system_status.get('mode', 'manual')
-    schedule_500_time = system_status.get('schedule_500_time')
-    schedule_10_time = system_status.get('schedule_10_time')
-    schedule_500_enabled = system_status.get('schedule_500_enabled', False)
-    schedule_10_enabled = system_status.get('schedule_10_enabled', False)
-    equitable_mode = system_status.get('equitable_mode', False)
+# Vue composée de /api/status: reconstruite seulement quand une de ses sources change
+STATUS_DIAGNOSTICS_TTL = 1.0  # Fraîcheur des diagnostics (disjoncteurs, hedging, concurrence, événements)
+status_view = {'key': None, 'version': 0, 'response': None, 'built_at': 0.0, 'diagnostics': None, 'diagnostics_at': 0.0}
+status_view_lock = threading.Lock()
+ETAG_BOOT_ID = f"{os.getpid():x}{int(time.time()):x}"  # Les versions repartent de 1 au redémarrage
+
+def conditional_json(version_tag, build_payload, last_modified=None):
+    """
+    Réponse conditionnelle liée à une version d'état
+    
+    304 sans corps (ni construction, ni sérialisation du payload) si le client possède déjà
+    cette version (If-None-Match, ou If-Modified-Since à défaut d'ETag).
+    
+    Args:
+        version_tag (str): Identifiant de la version de l'état servi
+        build_payload (Callable): Construit le payload JSON (appelé seulement si nécessaire)
+        last_modified (float): Horodatage de la dernière modification de l'état
+    """
+    etag = f"{ETAG_BOOT_ID}-{version_tag}"
+    if request.if_none_match:
+        # Comparaison faible: l'ETag d'une réponse compressée est rendu faible (W/)
+        not_modified = request.if_none_match.contains_weak(etag)
+    else:
+        # Résolution d'une seconde: une modification dans la seconde courante reste possible
+        not_modified = bool(last_modified and request.if_modified_since
+                            and last_modified < time.time() - 1
+                            and int(last_modified) <= request.if_modified_since.timestamp())
+    
+    response = Response(status=304) if not_modified else jsonify(build_payload())
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = datetime.fromtimestamp(int(last_modified), pytz.utc)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def content_conditional_json(payload):
+    """Réponse conditionnelle pour un état sans version (ETag calculé sur le corps sérialisé)"""
+    response = jsonify(payload)
+    response.add_etag()
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def build_status_diagnostics():
+    """Diagnostics d'exécution inclus dans le statut"""
+    diagnostics = {
+        # Dernières fins de phase publiées sur le bus d'événements
+        'pipeline_events': event_bus.get_last_events(),
+        # Disjoncteurs des fournisseurs de données (fermé, ouvert, semi-ouvert)
+        'data_providers': get_providers_status(),
+        'fetch_hedging': get_hedging_status()
+    }
+    # Fenêtre de concurrence adaptative des récupérations de données (orchestrateur V3, s'il est chargé)
+    if is_loaded(orchestrator_v2):
+        diagnostics['fetch_concurrency'] = orchestrator_v2.fetch_controller.get_status()
+    # Processus servant ce statut et leader élu (déploiement multi-processus)
+    diagnostics['process'] = {'pid': os.getpid(), 'mode': WORKER_MODE, 'leader': leader_lock.held}
+    return diagnostics
+
+def get_status_view():
+    """
+    Statut courant et sa version
+    
+    O(1) tant que le magasin de statut, le statut de l'orchestrateur et les diagnostics
+    n'ont pas changé; la version croît à chaque reconstruction (requêtes conditionnelles).
+    """
+    now = time.monotonic()
+    with status_view_lock:
+        if now - status_view['diagnostics_at'] >= STATUS_DIAGNOSTICS_TTL:
+            diagnostics = build_status_diagnostics()
+            status_view['diagnostics_at'] = now
+            if diagnostics != status_view['diagnostics']:
+                status_view['diagnostics'] = diagnostics
+        
+        key = (system_status.version,
+               orchestrator_v2.status.version if is_loaded(orchestrator_v2) else 0,
+               id(status_view['diagnostics']))
+        if key != status_view['key']:
+            status_view['version'] += 1
+            status_view['response'] = build_status_response(status_view['diagnostics'])
+            status_view['response']['status_version'] = status_view['version']
+            status_view['built_at'] = time.time()
+            status_view['key'] = key
+        return status_view['version'], status_view['response']
+
+def build_status_response(diagnostics=None):
+    """Statut complet du système, construit depuis l'instantané courant du magasin de statut"""
+    snapshot = system_status.snapshot()
     
-    # Ajouter les données manquantes pour le frontend
-    status_response = system_status.copy()
+    # Récupération des paramètres de configuration
+    mode = snapshot.data.get('mode', 'manual')
+    schedule_500_time = snapshot.data.get('schedule_500_time')
+    schedule_10_time = snapshot.data.get('schedule_10_time')
+    schedule_500_enabled = snapshot.data.get('schedule_500_enabled', False)
+    schedule_10_enabled = snapshot.data.get('schedule_10_enabled', False)
+    equitable_mode = snapshot.data.get('equitable_mode', False)
     
-    # CORRECTION: Exclure les champs non-sérialisables en JSON
-    if 'processed_recommendations' in status_response:
-        del status_response['processed_recommendations']
+    # Ajouter les données manquantes pour le frontend (champs internes déjà exclus de l'instantané)
+    status_response = dict(snapshot.data)
     
     # S'assurer que top_10_candidates et final_recommendation sont inclus
     if 'top_10_candidates' not in status_response:
@@ -1240,6 +1727,8 @@ def get_status():
         'alpaca_available': ALPACA_AVAILABLE
     }
     
+    status_response.update(diagnostics or build_status_diagnostics())
+    
     # Ajouter les paramètres de configuration
     status_response.update({
         'mode': mode,
@@ -1250,28 +1739,223 @@ def get_status():
         'equitable_mode': equitable_mode
     })
     
-    # Ajouter les métriques du système équitable si disponible
-    if EQUITABLE_SYSTEM_AVAILABLE and orchestrator_v2:
+    # Ajouter les métriques du système équitable si disponible (le statut ne force pas le chargement)
+    if is_loaded(orchestrator_v2):
         try:
             equitable_status = orchestrator_v2.get_status()
             status_response['equitable_status'] = equitable_status
+            
+            # Progression du scan équitable lue à la demande (plus de recopie périodique)
+            if status_response.get('phase') == 'analyzing_500_equitable':
+                progress = equitable_status.get('progress', {})
+                status_response.update({
+                    'analyzed_stocks': progress.get('analyzed_stocks', 0),
+                    'total_stocks': progress.get('total_stocks', 500),
+                    # Top 10 provisoire maintenu incrémentalement pendant le scan
+                    'provisional_top_10': (equitable_status.get('provisional_selection') or {}).get('top_candidates', []),
+                    'scan_convergence': equitable_status.get('convergence'),
+                    'last_update': equitable_status.get('timing', {}).get('last_update') or status_response.get('last_update')
+                })
+            elif status_response.get('phase') == 'analyzing_10_equitable':
+                progress = equitable_status.get('progress', {})
+                status_response.update({
+                    'analyzed_stocks': progress.get('analyzed_stocks', 0),
+                    'total_stocks': progress.get('total_stocks', 10),
+                    'last_update': equitable_status.get('timing', {}).get('last_update') or status_response.get('last_update')
+                })
         except:
             pass
     
-    return jsonify(status_response)
+    return status_response
+
+@app.route('/api/status', methods=['GET'])
+def get_status():
+    """Retourne le statut actuel du système"""
+    version, status_response = get_status_view()
+    return conditional_json(f"status-{version}", lambda: status_response, status_view['built_at'])
+
+# ===== FLUX SSE (/api/stream) =====
+
+STREAM_STATUS_INTERVAL = 0.5  # Détection des changements de statut (secondes)
+STREAM_HEARTBEAT = 15         # Commentaire keep-alive sans événement (secondes)
+# Chaque client occupe un thread du serveur: sous Gunicorn, plafond sous le nombre de threads par processus
+MAX_STREAM_CLIENTS = int(os.getenv('MAX_STREAM_CLIENTS', '20'))
+STREAM_PROGRESS_FIELDS = ('phase', 'running', 'analyzed_stocks', 'total_stocks', 'last_update')
+STREAM_PIPELINE_EVENTS = {
+    SCAN_COMPLETED: 'pipeline', FINALISTS_READY: 'pipeline', RECOMMENDATION_READY: 'pipeline',
+    ORDER_SUBMITTED: 'order', ORDER_FILLED: 'order'
+}
+_MISSING = object()
+stream_publisher = {'thread': None}
+stream_publisher_lock = threading.Lock()
+
+def status_delta(previous, current):
+    """Champs du statut modifiés depuis `previous` et champs supprimés (valeurs inchangées: test d'identité d'abord)"""
+    changed = {key: value for key, value in current.items()
+               if previous.get(key, _MISSING) is not value and previous.get(key, _MISSING) != value}
+    return changed, [key for key in previous if key not in current]
+
+def _stream_status_source():
+    """(version, statut) courant: vue composée locale, ou instantané du processus d'analyse en mode web"""
+    if worker_client:
+        snapshot = worker_client.read_snapshot()
+        if snapshot is None:
+            return None, None
+        status = json_loads(snapshot[0])
+        return status.get('status_version'), status
+    return get_status_view()
+
+def run_stream_publisher():
+    """
+    Transforme les changements du statut en événements du flux (progression, Top K, recommandation)
+    
+    Le statut complet n'est envoyé qu'à la connexion ou à la resynchronisation d'un client;
+    ensuite seuls les champs modifiés sont publiés (status_delta).
+    """
+    last_version = None
+    last_status = None
+    last_sent = {}
+    while True:
+        try:
+            version, status = _stream_status_source()
+            if version is not None and version != last_version:
+                last_version = version
+                sections = {
+                    'progress': {field: status.get(field) for field in STREAM_PROGRESS_FIELDS},
+                    'top_k': {
+                        'top_10_candidates': status.get('top_10_candidates', []),
+                        'provisional_top_10': status.get('provisional_top_10', [])
+                    },
+                    'recommendation': status.get('final_recommendation')
+                }
+                for event, data in sections.items():
+                    if data != last_sent.get(event):
+                        last_sent[event] = data
+                        if data is not None:
+                            event_stream.publish(event, data)
+                if last_status is not None:
+                    changed, removed = status_delta(last_status, status)
+                    if changed or removed:
+                        event_stream.publish('status_delta', {'fields': changed, 'removed': removed})
+                last_status = status
+        except Exception as e:
+            print(f"❌ Erreur publication flux SSE: {e}")
+        time.sleep(STREAM_STATUS_INTERVAL)
+
+def publish_status_resync():
+    """Événements du processus d'analyse perdus (coupure, redémarrage): statut complet pour tous les clients"""
+    version, status = _stream_status_source()
+    if status is not None:
+        event_stream.publish('status', status)
+
+def ensure_stream_publisher():
+    """Démarre la publication du flux au premier abonné (aucun coût tant que personne n'écoute)"""
+    with stream_publisher_lock:
+        if stream_publisher['thread']:
+            return
+        if worker_client:
+            # Mode web séparé: tous les événements viennent du processus d'analyse, relayés par la liaison IPC
+            stream_publisher['thread'] = threading.Thread(
+                target=worker_client.relay_events, args=(event_stream.publish_serialized, publish_status_resync),
+                daemon=True, name="sp500-stream-relay")
+        else:
+            # Événements de phase et d'ordres, et événements dérivés du statut
+            for bus_event, stream_type in STREAM_PIPELINE_EVENTS.items():
+                event_bus.subscribe(bus_event, lambda payload, name=bus_event, kind=stream_type:
+                                    event_stream.publish(kind, {'event': name, **payload}))
+            stream_publisher['thread'] = threading.Thread(target=run_stream_publisher, daemon=True, name="sp500-stream")
+        stream_publisher['thread'].start()
+
+@app.route('/api/stream', methods=['GET'])
+def stream_events():
+    """
+    Flux Server-Sent Events: progress, symbol_results, top_k, recommendation, pipeline, order,
+    status (complet, à la connexion et à la resynchronisation) et status_delta (champs modifiés)
+    
+    Reprise: en-tête Last-Event-ID (reconnexion automatique d'EventSource) ou ?last_event_id=;
+    un identifiant inconnu ou trop ancien déclenche d'abord un événement 'status' complet.
+    """
+    if event_stream.clients >= MAX_STREAM_CLIENTS:
+        return jsonify({'success': False, 'message': 'Trop de clients connectés au flux'}), 503
+    ensure_stream_publisher()
+    cursor = event_stream.parse_event_id(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+    
+    def resync():
+        """Statut complet courant, identifié par le dernier événement publié"""
+        seq = event_stream.last_seq()
+        version, status = _stream_status_source()
+        return seq, format_sse(event_stream.event_id(seq), 'status', app.json.dumps(status or {}))
+    
+    def generate(cursor):
+        event_stream.connect()
+        try:
+            yield f"retry: 3000\n\n"
+            if cursor is None:
+                cursor, frame = resync()
+                yield frame
+            while True:
+                events, gap = event_stream.read_since(cursor, STREAM_HEARTBEAT)
+                if gap:
+                    # Client trop lent: événements évincés, resynchronisation sur le statut complet
+                    cursor, frame = resync()
+                    yield frame
+                    continue
+                if not events:
+                    yield ": keep-alive\n\n"
+                    continue
+                for seq, event, data in events:
+                    yield format_sse(event_stream.event_id(seq), event, data)
+                cursor = events[-1][0]
+        finally:
+            event_stream.disconnect()
+    
+    return Response(stream_with_context(generate(cursor)), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Pas de mise en tampon par un proxy
+    })
 
 @app.route('/api/start-analysis-500', methods=['POST'])
 def start_analysis_500_endpoint():
-    """Démarre l'analyse des 500 tickers"""
-    if start_analysis_500():
+    """Démarre l'analyse des 500 tickers
+    
+    Corps optionnel: {"deadline": "HH:MM" (fuseau du mode automatique) ou ISO 8601, "mode": "resume"}
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        deadline = parse_deadline(data.get('deadline'), auto_schedule_config['timezone'])
+    except DeadlinePassedError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'Échéance invalide (utilisez HH:MM ou ISO 8601)'})
+    if data.get('mode', 'fresh') not in ('fresh', 'resume'):
+        return jsonify({'success': False, 'message': 'Mode invalide (fresh ou resume)'})
+    if start_analysis_500(deadline, resume=data.get('mode') == 'resume'):
         return jsonify({'success': True, 'message': 'Analyse des 500 tickers démarrée'})
     else:
         return jsonify({'success': False, 'message': 'Analyse déjà en cours'})
 
+@app.route('/api/checkpoint-500', methods=['GET'])
+def get_checkpoint_500():
+    """Point de reprise du scan des 500 tickers en cours ou du dernier scan (mode actif)"""
+    try:
+        if system_status.get('equitable_mode', False) and EQUITABLE_SYSTEM_AVAILABLE and orchestrator_v2:
+            checkpoint = orchestrator_v2.last_checkpoint()
+        else:
+            checkpoint = scan_checkpoint_500
+        return jsonify({'success': True, 'checkpoint': checkpoint.info()})
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Erreur: {str(e)}'})
+
 @app.route('/api/start-analysis-10', methods=['POST'])
 def start_analysis_10_endpoint():
-    """Démarre l'analyse des 10 finalistes"""
-    if start_analysis_10():
+    """Démarre l'analyse des 10 finalistes (échéance optionnelle: {"deadline": "HH:MM" ou ISO 8601})"""
+    try:
+        deadline = parse_deadline((request.get_json(silent=True) or {}).get('deadline'), auto_schedule_config['timezone'])
+    except DeadlinePassedError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'Échéance invalide (utilisez HH:MM ou ISO 8601)'})
+    if start_analysis_10(deadline):
         return jsonify({'success': True, 'message': 'Analyse des 10 finalistes démarrée'})
     else:
         return jsonify({'success': False, 'message': 'Analyse déjà en cours ou aucun candidat disponible'})
@@ -1281,15 +1965,17 @@ def stop_analysis():
     """Arrête l'analyse en cours"""
     global stop_analysis_flag
     stop_analysis_flag = True
+    stop_analysis_event.set()
     
-    # Arrêter aussi l'orchestrateur équitable si actif
-    if EQUITABLE_SYSTEM_AVAILABLE and orchestrator_v2:
+    # Arrêter aussi l'orchestrateur équitable si actif (annule les analyses en vol)
+    partial_results = 0
+    if is_loaded(orchestrator_v2):
         try:
-            orchestrator_v2.stop_analysis()
+            partial_results = orchestrator_v2.stop_analysis().get('partial_results', 0)
         except:
             pass
     
-    return jsonify({'success': True, 'message': 'Arrêt de l\'analyse demandé'})
+    return jsonify({'success': True, 'message': 'Arrêt de l\'analyse demandé', 'partial_results': partial_results})
 
 @app.route('/api/set-mode', methods=['POST'])
 def set_mode():
@@ -1297,19 +1983,19 @@ def set_mode():
     try:
         data = request.get_json()
         
-        # Mise à jour des paramètres
-        system_status['mode'] = data.get('mode', 'manual')
-        system_status['auto_timer_500'] = data.get('timer_500', 30)
-        system_status['auto_timer_10'] = data.get('timer_10', 15)
-        
-        # Nouveaux paramètres d'horloges
-        system_status['schedule_500_time'] = data.get('schedule_500_time')
-        system_status['schedule_10_time'] = data.get('schedule_10_time')
-        system_status['schedule_500_enabled'] = data.get('schedule_500_enabled', False)
-        system_status['schedule_10_enabled'] = data.get('schedule_10_enabled', False)
-        
-        # Mode équitable
-        system_status['equitable_mode'] = data.get('equitable_mode', False)
+        # Mise à jour des paramètres (une seule publication du statut)
+        system_status.update({
+            'mode': data.get('mode', 'manual'),
+            'auto_timer_500': data.get('timer_500', 30),
+            'auto_timer_10': data.get('timer_10', 15),
+            # Nouveaux paramètres d'horloges
+            'schedule_500_time': data.get('schedule_500_time'),
+            'schedule_10_time': data.get('schedule_10_time'),
+            'schedule_500_enabled': data.get('schedule_500_enabled', False),
+            'schedule_10_enabled': data.get('schedule_10_enabled', False),
+            # Mode équitable
+            'equitable_mode': data.get('equitable_mode', False)
+        })
         
         print(f"Configuration mise à jour: {system_status['mode']}")
         print(f"Mode équitable: {system_status['equitable_mode']}")
@@ -1338,28 +2024,36 @@ def set_mode():
     except Exception as e:
         return jsonify({'success': False, 'message': f'Erreur: {str(e)}'})
 
-@app.route('/api/get-top-10', methods=['GET'])
-def get_top_10():
-    """Retourne les 10 candidats sélectionnés"""
-    top_10 = system_status.get('top_10_candidates', [])
+def build_top_10_payload(snapshot):
+    """Payload des 10 candidats sélectionnés"""
+    top_10 = snapshot.data.get('top_10_candidates', [])
     
     print(f"🔍 DEBUG get-top-10: {len(top_10)} candidats trouvés")
     if top_10:
         print(f"🔍 Premier candidat: {top_10[0]}")
     
-    return jsonify({
+    return {
         'success': True,
         'top_10': top_10,
         'count': len(top_10),
-        'last_update': system_status.get('last_update'),
-        'phase': system_status.get('phase'),
-        'diversity_metrics': system_status.get('diversity_metrics')
-    })
+        'last_update': snapshot.data.get('last_update'),
+        'phase': snapshot.data.get('phase'),
+        'diversity_metrics': snapshot.data.get('diversity_metrics')
+    }
 
-@app.route('/api/get-final-recommendation', methods=['GET'])
-def get_final_recommendation():
-    """Retourne la recommandation finale avec logique conditionnelle selon le mode"""
-    recommendation = system_status.get('final_recommendation')
+@app.route('/api/get-top-10', methods=['GET'])
+def get_top_10():
+    """Retourne les 10 candidats sélectionnés"""
+    snapshot = system_status.snapshot()
+    return conditional_json(f"top10-{snapshot.version}", lambda: build_top_10_payload(snapshot), snapshot.published_at)
+
+def recommendation_threshold_tag():
+    """Le seuil d'affichage fait partie de la version servie de la recommandation"""
+    return f"{int(auto_threshold_config.get('enabled', False))}-{auto_threshold_config.get('target_score', 70.0)}"
+
+def build_final_recommendation_payload(snapshot):
+    """Payload de la recommandation finale avec logique conditionnelle selon le mode"""
+    recommendation = snapshot.data.get('final_recommendation')
     
     print(f"🔍 DEBUG get-final-recommendation: {recommendation}")
     
@@ -1370,7 +2064,7 @@ def get_final_recommendation():
         # 3. En mode automatique avec seuil : afficher seulement si score >= seuil
         
         auto_threshold_enabled = auto_threshold_config.get('enabled', False)
-        system_mode = system_status.get('mode', 'manual')
+        system_mode = snapshot.data.get('mode', 'manual')
         
         print(f"🔍 Mode système: {system_mode}")
         print(f"🔍 Mode seuil automatique: {auto_threshold_enabled}")
@@ -1386,14 +2080,14 @@ def get_final_recommendation():
             
             if score >= target_score:
                 print(f"✅ Recommandation finale validée - Score respecte le seuil")
-                return jsonify({
+                return {
                     'success': True,
                     'recommendation': recommendation,
-                    'timestamp': system_status.get('last_update')
-                })
+                    'timestamp': snapshot.data.get('last_update')
+                }
             else:
                 print(f"🚫 Recommandation finale bloquée - Score insuffisant pour le seuil configuré")
-                return jsonify({
+                return {
                     'success': False,
                     'message': 'Aucune recommandation finale disponible (score insuffisant)',
                     'debug_info': {
@@ -1402,20 +2096,116 @@ def get_final_recommendation():
                         'threshold_mode_enabled': auto_threshold_enabled,
                         'system_mode': system_mode
                     }
-                })
+                }
         else:
             # Mode manuel OU mode automatique sans seuil : toujours afficher
             print(f"✅ Recommandation finale affichée - Mode: {system_mode}, Seuil: {auto_threshold_enabled}")
-            return jsonify({
+            return {
                 'success': True,
                 'recommendation': recommendation,
-                'timestamp': system_status.get('last_update')
-            })
+                'timestamp': snapshot.data.get('last_update')
+            }
     else:
-        return jsonify({
+        return {
             'success': False,
             'message': 'Aucune recommandation finale disponible'
-        })
+        }
+
+@app.route('/api/get-final-recommendation', methods=['GET'])
+def get_final_recommendation():
+    """Retourne la recommandation finale avec logique conditionnelle selon le mode"""
+    snapshot = system_status.snapshot()
+    return conditional_json(f"recommendation-{snapshot.version}-{recommendation_threshold_tag()}",
+                            lambda: build_final_recommendation_payload(snapshot), snapshot.published_at)
+
+# Attente de recommandation du trading: lecture en mémoire (plus de requêtes HTTP vers ce serveur)
+if ALPACA_AVAILABLE:
+    trading_agent.recommendation_source = lambda: build_final_recommendation_payload(system_status.snapshot())
+
+# ===== TABLEAU DE BORD AGRÉGÉ (/api/dashboard) =====
+
+DASHBOARD_HISTORY_SIZE = 64           # Versions conservées pour les deltas (au-delà: réponse complète)
+DASHBOARD_PORTFOLIO_REFRESH = 10.0    # Rafraîchissement Alpaca du portefeuille partagé entre clients (secondes)
+TRADING_CREDENTIAL_KEYS = ('paper_api_key', 'paper_secret_key', 'live_api_key', 'live_secret_key')
+dashboard_history = deque(maxlen=DASHBOARD_HISTORY_SIZE)  # (version, étiquettes des sections, statut)
+dashboard_state = {'version': 0, 'portfolio_refreshed_at': 0.0}
+dashboard_lock = threading.Lock()
+
+def _expire_dashboard_portfolio(payload):
+    """Un ordre modifie le portefeuille: le prochain tableau de bord le rafraîchit sans attendre"""
+    dashboard_state['portfolio_refreshed_at'] = 0.0
+
+event_bus.subscribe(ORDER_SUBMITTED, _expire_dashboard_portfolio)
+event_bus.subscribe(ORDER_FILLED, _expire_dashboard_portfolio)
+
+def build_trading_section():
+    """Statut trading avec portefeuille rafraîchi au plus toutes les DASHBOARD_PORTFOLIO_REFRESH secondes"""
+    if not ALPACA_AVAILABLE:
+        return {'success': False, 'message': 'Module Alpaca Trading non disponible'}
+    from alpaca_trading import get_trading_status, get_portfolio
+    now = time.monotonic()
+    if now - dashboard_state['portfolio_refreshed_at'] >= DASHBOARD_PORTFOLIO_REFRESH:
+        dashboard_state['portfolio_refreshed_at'] = now
+        get_portfolio()  # Appelle _update_portfolio (requête Alpaca)
+    trading = get_trading_status()
+    # Clés Alpaca jamais diffusées à chaque rafraîchissement ni conservées dans l'historique
+    trading['config'] = {key: value for key, value in trading['config'].items() if key not in TRADING_CREDENTIAL_KEYS}
+    return trading
+
+def build_dashboard_response(since=None):
+    """
+    Données du tableau de bord en une réponse: statut, Top 10, recommandation finale, trading
+    
+    Avec `since` (version reçue précédemment), seules les sections modifiées sont renvoyées,
+    et pour le statut seulement les champs modifiés (plus la liste des champs supprimés).
+    Les versions "<démarrage>-<numéro>" sont propres au processus: après un redémarrage, une
+    version précédente est inconnue et la réponse est complète.
+    """
+    status_version, status = get_status_view()
+    snapshot = system_status.snapshot()
+    try:
+        trading = build_trading_section()
+    except Exception as e:
+        trading = {'success': False, 'message': str(e)}
+    # Statut trading sans version: étiquette calculée sur son contenu (portefeuille modifié sur place)
+    trading_tag = json.dumps(trading, sort_keys=True, default=str)
+    tags = {
+        'status': status_version,
+        'top_10': snapshot.version,
+        'recommendation': f"{snapshot.version}-{recommendation_threshold_tag()}",
+        'trading': trading_tag
+    }
+    
+    with dashboard_lock:
+        if not dashboard_history or dashboard_history[-1][1] != tags:
+            dashboard_state['version'] += 1
+            dashboard_history.append((f"{ETAG_BOOT_ID}-{dashboard_state['version']}", tags, status))
+        version = dashboard_history[-1][0]
+        base = next((entry for entry in dashboard_history if since is not None and entry[0] == since), None)
+    
+    builders = {
+        'status': lambda: status,
+        'top_10': lambda: build_top_10_payload(snapshot),
+        'recommendation': lambda: build_final_recommendation_payload(snapshot),
+        'trading': lambda: trading
+    }
+    sections = {name: build() for name, build in builders.items() if base is None or base[1][name] != tags[name]}
+    response = {'success': True, 'version': version, 'full': base is None, 'sections': sections}
+    
+    if base is not None and 'status' in sections:
+        # Delta par champ du statut
+        sections['status'], removed = status_delta(base[2], status)
+        response['removed'] = {'status': removed}
+    return response
+
+@app.route('/api/dashboard', methods=['GET'])
+def get_dashboard():
+    """Tableau de bord agrégé; ?since=<version> pour ne recevoir que les changements"""
+    try:
+        since = request.args.get('since')
+        return jsonify(build_dashboard_response(since))
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Erreur: {str(e)}'})
 
 @app.route('/api/get-opportunities', methods=['GET'])
 def get_opportunities():
@@ -1440,6 +2230,7 @@ def analyze_single_stock():
     try:
         # Utiliser le système équitable si disponible et activé
         if system_status.get('equitable_mode', False) and EQUITABLE_SYSTEM_AVAILABLE:
+            from individual_agent_v2 import analyze_symbol_advanced
             result = asyncio.run(analyze_symbol_advanced(symbol, os.getenv('POLYGON_API_KEY')))
         else:
             result = analyze_stock_with_polygon(symbol)
@@ -1463,6 +2254,64 @@ def analyze_single_stock():
             'message': f'Erreur analyse {symbol}: {str(e)}'
         })
 
+BATCH_ANALYZE_MAX_SYMBOLS = 150  # Taille maximale d'une watchlist (un secteur du S&P 500 en compte moins)
+
+@app.route('/api/analyze-batch', methods=['POST'])
+def analyze_batch():
+    """
+    Analyse une liste de symboles en flux NDJSON (NOUVEAU V3)
+    
+    Corps: {"symbols": ["AAPL", "MSFT", ...]} ou {"sector": "Technology"} (symboles du secteur
+    d'après le dernier scan). Une ligne JSON par symbole dès la fin de son analyse (ordre d'achèvement),
+    puis une ligne de synthèse {"done": true, ...}. Les symboles passent par le pipeline concurrent
+    du scan, qui respecte la fenêtre de concurrence et les disjoncteurs des fournisseurs.
+    """
+    if not EQUITABLE_SYSTEM_AVAILABLE:
+        return jsonify({'success': False, 'message': 'Système équitable non disponible'})
+    from central_orchestrator import result_to_summary
+    
+    data = request.get_json(silent=True) or {}
+    sector = data.get('sector')
+    if sector:
+        symbols = orchestrator_v2.sector_symbols(sector)
+        if not symbols:
+            return jsonify({'success': False, 'message': f'Secteur inconnu ou aucun scan terminé: {sector}'}), 404
+    else:
+        symbols = data.get('symbols') or []
+        if not isinstance(symbols, list) or not all(isinstance(symbol, str) for symbol in symbols):
+            return jsonify({'success': False, 'message': 'symbols doit être une liste de symboles'}), 400
+        # Doublons retirés, ordre de la watchlist conservé
+        symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+    
+    if not symbols:
+        return jsonify({'success': False, 'message': 'Symboles requis (symbols ou sector)'}), 400
+    if len(symbols) > BATCH_ANALYZE_MAX_SYMBOLS:
+        return jsonify({'success': False, 'message': f'Maximum {BATCH_ANALYZE_MAX_SYMBOLS} symboles par requête'}), 400
+    
+    def generate():
+        started = time.time()
+        succeeded = 0
+        for symbol, result in orchestrator_v2.analyze_symbols_stream(symbols, threading.Event()):
+            if result:
+                succeeded += 1
+                line = {'symbol': symbol, 'success': True, 'analysis': result_to_summary(result)}
+            else:
+                line = {'symbol': symbol, 'success': False, 'message': f"Impossible d'analyser {symbol}"}
+            yield dumps_bytes(line) + b'\n'
+        yield dumps_bytes({
+            'done': True,
+            'total': len(symbols),
+            'succeeded': succeeded,
+            'failed': len(symbols) - succeeded,
+            'elapsed': round(time.time() - started, 2),
+            'timestamp': datetime.now().isoformat()
+        }) + b'\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Pas de mise en tampon par un proxy
+    })
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Vérification de santé de l'API"""
@@ -1494,8 +2343,9 @@ def configure_equitable_system():
         data = request.get_json() or {}
         mode = data.get('mode', 'manual')
         diversity_settings = data.get('diversity_settings', {})
+        precise_settings = data.get('precise_settings', {})  # Ex: prefilter_enabled, prefilter_keep_ratio
         
-        result = orchestrator_v2.configure_advanced_mode(mode, diversity_settings)
+        result = orchestrator_v2.configure_advanced_mode(mode, diversity_settings, precise_settings)
         
         return jsonify({
             'success': result['success'],
@@ -1646,6 +2496,42 @@ def get_equitable_performance():
             'timestamp': datetime.now().isoformat()
         }), 500
 
+@app.route('/api/equitable/results', methods=['GET'])
+def query_equitable_results():
+    """
+    Requête paginée sur les résultats du dernier scan terminé (NOUVEAU V3)
+    
+    Paramètres: sector, quintile, recommendation (filtres), min_score/max_score sur score_field
+    (défaut equitable_score), sort (composante de score), order (desc/asc), limit, cursor
+    (next_cursor de la page précédente). Servi depuis l'index trié construit à la fin du scan.
+    """
+    if not EQUITABLE_SYSTEM_AVAILABLE:
+        return jsonify({'success': False, 'message': 'Système équitable non disponible'})
+    
+    try:
+        args = request.args
+        page = orchestrator_v2.query_results(
+            filters={facet: args.get(facet) for facet in ('sector', 'quintile', 'recommendation')},
+            sort=args.get('sort', 'equitable_score'),
+            order=args.get('order', 'desc').lower(),
+            min_score=args.get('min_score', type=float),
+            max_score=args.get('max_score', type=float),
+            score_field=args.get('score_field', 'equitable_score'),
+            limit=args.get('limit', 20, type=int),
+            cursor=args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Erreur: {str(e)}'}), 500
+    
+    # Une page est immuable pour un index donné: l'ETag suit la génération de l'index
+    return conditional_json(f"results-{page['generation']}", lambda: {
+        'success': True,
+        'data': page,
+        'timestamp': datetime.now().isoformat()
+    })
+
 # ===== ENDPOINTS TRADING ALPACA (CONSERVÉS INTÉGRALEMENT) =====
 
 @app.route('/api/trading/configure', methods=['POST'])
@@ -1681,7 +2567,7 @@ def get_trading_status_route():
     try:
         from alpaca_trading import get_trading_status
         status = get_trading_status()
-        return jsonify(status)
+        return content_conditional_json(status)
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
 
@@ -1694,7 +2580,7 @@ def get_portfolio_route():
     try:
         from alpaca_trading import get_portfolio
         portfolio = get_portfolio()
-        return jsonify(portfolio)
+        return content_conditional_json(portfolio)
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
 
@@ -1948,13 +2834,13 @@ def trigger_immediate_buy():
 def cache_schedule_status():
     """Vérifie le statut du vidage automatique quotidien"""
     try:
-        jobs = schedule.get_jobs()
-        cache_jobs = [job for job in jobs if 'daily_cache_cleanup' in str(job.job_func)]
+        cache_job = schedule_manager.get_job_status('daily_cache_cleanup')
         return jsonify({
             'success': True,
-            'scheduled_jobs': len(cache_jobs),
-            'next_run': str(cache_jobs[0].next_run) if cache_jobs else None,
-            'status': 'active' if cache_jobs else 'inactive',
+            'scheduled_jobs': 1 if cache_job else 0,
+            'next_run': cache_job['next_run'] if cache_job else None,
+            'stats': cache_job['stats'] if cache_job else None,
+            'status': 'active' if cache_job and schedule_manager.running else 'inactive',
             'timezone': 'US Eastern (EST)',
             'description': 'Vidage automatique à minuit US - après market, avant pre-market'
         })
@@ -2117,7 +3003,11 @@ auto_threshold_config = {
     'current_cycle': 0,
     'running': False,
     'last_score': 0.0,
-    'start_time': None
+    'start_time': None,
+    'delta_mode': True,          # Cycles suivants en mode delta (dernière cotation + re-scoring incrémental)
+    'delta_band': 10.0,          # Largeur de la bande (points) sous le score cible pour la ré-analyse complète
+    'delta_max_reanalysis': 10,  # Nombre maximum de symboles ré-analysés complètement par cycle delta
+    'last_cycle': None           # Résumé du dernier cycle (type, durée, symboles ré-analysés)
 }
 auto_threshold_timer = None
 
@@ -2128,7 +3018,9 @@ auto_schedule_config = {
     'enabled': False,           # Mode automatique activé
     'threshold_time': None,     # Heure de déclenchement (format "HH:MM")
     'timezone': 'Europe/Paris', # Fuseau horaire
+    'analysis_deadline': None,  # Échéance de publication des analyses programmées et des cycles seuil ("HH:MM")
     'weekdays_only': True,      # Seulement les jours de semaine
+    'skip_market_holidays': True,  # Pas de déclenchement les jours fériés du marché US
     'auto_threshold_config': {  # Configuration du mode seuil pour l'auto
         'target_score': 70.0,
         'max_cycles': 5,
@@ -2146,6 +3038,10 @@ def validate_timezone(tz_str):
     except pytz.exceptions.UnknownTimeZoneError:
         return False
 
+def scheduled_deadline():
+    """Échéance des analyses programmées et des cycles seuil (None si non configurée ou déjà passée)"""
+    return upcoming_deadline(auto_schedule_config.get('analysis_deadline'), auto_schedule_config['timezone'])
+
 def start_auto_schedule():
     """Démarre le mode automatique avec horloge"""
     try:
@@ -2166,7 +3062,9 @@ def start_auto_schedule():
             callback=trigger_auto_threshold,
             job_id='auto_threshold',
             weekdays_only=auto_schedule_config['weekdays_only'],
-            enabled=True
+            enabled=True,
+            timezone=auto_schedule_config['timezone'],
+            skip_holidays=auto_schedule_config.get('skip_market_holidays', True)
         )
         
         if success:
@@ -2255,6 +3153,10 @@ def configure_auto_schedule(config_data):
             if not validate_timezone(config_data['timezone']):
                 return {'success': False, 'message': 'Fuseau horaire invalide'}
         
+        if config_data.get('analysis_deadline'):
+            if not validate_time_format(config_data['analysis_deadline']):
+                return {'success': False, 'message': 'Format d\'échéance invalide (utilisez HH:MM)'}
+        
         # Mettre à jour la configuration
         auto_schedule_config.update(config_data)
         
@@ -2283,8 +3185,10 @@ def start_auto_threshold_analysis():
         'current_cycle': 0,
         'last_score': 0.0,
         'target_reached': False,  # CORRECTION: Réinitialiser le flag
-        'start_time': datetime.now().isoformat()
+        'start_time': datetime.now().isoformat(),
+        'last_cycle': None
     })
+    reset_delta_state()
     print(f"🎯 Démarrage analyse automatique seuil {auto_threshold_config['target_score']}%")
     print(f"📊 Maximum {auto_threshold_config['max_cycles']} cycles, délai {auto_threshold_config['delay_between_cycles']} min")
     _execute_threshold_cycle()
@@ -2315,45 +3219,50 @@ def _execute_threshold_cycle():
     auto_threshold_config['current_cycle'] += 1
     cycle_num = auto_threshold_config['current_cycle']
     print(f"🔄 Cycle {cycle_num}/{auto_threshold_config['max_cycles']} - Analyse automatique seuil")
-    if start_analysis_500():
-        _monitor_threshold_analysis_500()
+
+    # Après la première passe complète: cycle delta (dernière cotation + re-scoring incrémental)
+    if _can_run_delta_cycle(cycle_num):
+        future = submit_threshold_delta_cycle()
+        if future:
+            future.add_done_callback(_on_threshold_analysis_10_done)
+            return
+        print("⚠️ Cycle delta impossible - repli sur une passe complète")
+
+    auto_threshold_config['last_cycle'] = {'type': 'full', 'cycle': cycle_num, 'start_time': datetime.now().isoformat()}
+    future = submit_analysis_500(scheduled_deadline())
+    if future:
+        # L'étape suivante démarre dès la fin du scan (plus d'attente par minuterie)
+        future.add_done_callback(_on_threshold_analysis_500_done)
     else:
         print(f"❌ Impossible de démarrer le cycle {cycle_num}")
         auto_threshold_config['running'] = False
 
-def _monitor_threshold_analysis_500():
-    """Surveille l'analyse des 500 tickers pour le mode seuil"""
-    def check_500_completion():
-        if not auto_threshold_config['running']:
-            return
-        if system_status.get('phase') == 'completed_500' and not system_status.get('running'):
-            print("✅ Analyse 500 terminée, démarrage analyse 10 finalistes")
-            if start_analysis_10():
-                _monitor_threshold_analysis_10()
-            else:
-                print("❌ Impossible de démarrer l'analyse des 10 finalistes")
-                _schedule_next_threshold_cycle()
-        elif system_status.get('running'):
-            threading.Timer(10, check_500_completion).start()
+def _on_threshold_analysis_500_done(future):
+    """Fin du scan des 500 tickers en mode seuil: enchaîne immédiatement sur les 10 finalistes"""
+    if not auto_threshold_config['running']:
+        return
+    if future.result().get('success'):
+        print("✅ Analyse 500 terminée, démarrage analyse 10 finalistes")
+        next_future = submit_analysis_10(scheduled_deadline())
+        if next_future:
+            next_future.add_done_callback(_on_threshold_analysis_10_done)
         else:
-            print("❌ Analyse 500 échouée")
+            print("❌ Impossible de démarrer l'analyse des 10 finalistes")
             _schedule_next_threshold_cycle()
-    threading.Timer(5, check_500_completion).start()
+    else:
+        print("❌ Analyse 500 échouée")
+        _schedule_next_threshold_cycle()
 
-def _monitor_threshold_analysis_10():
-    """Surveille l'analyse des 10 finalistes pour le mode seuil"""
-    def check_10_completion():
-        if not auto_threshold_config['running']:
-            return
-        if system_status.get('phase') == 'completed_10' and not system_status.get('running'):
-            print("✅ Analyse 10 finalistes terminée, vérification du score")
-            _check_threshold_score()
-        elif system_status.get('running'):
-            threading.Timer(10, check_10_completion).start()
-        else:
-            print("❌ Analyse 10 finalistes échouée")
-            _schedule_next_threshold_cycle()
-    threading.Timer(5, check_10_completion).start()
+def _on_threshold_analysis_10_done(future):
+    """Fin de l'analyse des 10 finalistes (ou d'un cycle delta) en mode seuil: vérification du score"""
+    if not auto_threshold_config['running']:
+        return
+    if future.result().get('success'):
+        print("✅ Analyse 10 finalistes terminée, vérification du score")
+        _check_threshold_score()
+    else:
+        print("❌ Analyse 10 finalistes échouée")
+        _schedule_next_threshold_cycle()
 
 def _check_threshold_score():
     """Vérifie si le score de la recommandation finale atteint le seuil"""
@@ -2414,6 +3323,200 @@ def _schedule_next_threshold_cycle():
     auto_threshold_timer = threading.Timer(delay_seconds, _execute_threshold_cycle)
     auto_threshold_timer.start()
 
+# ===== CYCLES DELTA DU MODE SEUIL =====
+
+def _delta_universe():
+    """Symboles dont la série de la passe complète du jour est disponible pour un re-scoring incrémental"""
+    today = datetime.now().date()
+    return [symbol for symbol, entry in list(price_series_cache.items()) if entry['fetched_on'] == today and entry['prices']]
+
+def _can_run_delta_cycle(cycle_num):
+    """Un cycle delta n'est possible qu'après une passe complète du jour en mode original"""
+    if not auto_threshold_config.get('delta_mode', False) or cycle_num <= 1:
+        return False
+    if system_status.get('equitable_mode', False) and EQUITABLE_SYSTEM_AVAILABLE:
+        return False
+    return bool(_delta_universe())
+
+def fetch_latest_bars(symbols):
+    """Récupère en un seul appel groupé la dernière barre journalière (clôture, volume) de chaque symbole"""
+    import pandas as pd
+    import yfinance as yf
+    latest = {}
+    data = yf.download(symbols, period='5d', interval='1d', group_by='ticker', progress=False, threads=True)
+    if data is None or data.empty:
+        return latest
+
+    for symbol in symbols:
+        try:
+            frame = data[symbol] if isinstance(data.columns, pd.MultiIndex) else data
+            frame = frame.dropna(subset=['Close'])
+            if frame.empty:
+                continue
+            latest[symbol] = {
+                'close': float(frame['Close'].iloc[-1]),
+                'volume': float(frame['Volume'].iloc[-1]),
+                'date': frame.index[-1].date()
+            }
+        except (KeyError, IndexError):
+            continue
+    return latest
+
+def rescore_with_latest_bar(symbol, bar=None):
+    """
+    Re-score un symbole à partir de sa série en cache, la dernière barre étant remplacée (même séance)
+    ou ajoutée (séance suivante); la série en cache reste la base de tous les cycles delta du jour
+    """
+    cached = price_series_cache.get(symbol)
+    if not cached or not cached['prices']:
+        return None
+
+    prices = list(cached['prices'])
+    volumes = list(cached['volumes'])
+    if bar:
+        if bar['date'] > cached['date']:
+            prices.append(bar['close'])
+            volumes.append(bar['volume'])
+        elif bar['date'] == cached['date']:
+            prices[-1] = bar['close']
+            if volumes and bar['volume'] > 0:
+                volumes[-1] = bar['volume']
+
+    analysis = analyze_with_prices(symbol, prices, volumes, cached['source'], cache=False)
+    if analysis:
+        analysis['delta'] = True
+    return analysis
+
+def submit_threshold_delta_cycle():
+    """Démarre un cycle delta du mode seuil, retourne son future (None si une analyse est en cours)"""
+    if system_status['running']:
+        return None
+    return _launch_analysis(run_threshold_delta_cycle, '10')
+
+def run_threshold_delta_cycle():
+    """Cycle delta: rafraîchit la dernière cotation, re-score tout l'univers et ne ré-analyse que la bande proche du seuil"""
+    try:
+        started = time.time()
+        cycle_num = auto_threshold_config['current_cycle']
+        target_score = auto_threshold_config['target_score']
+        band = auto_threshold_config.get('delta_band', 10.0)
+        symbols = _delta_universe()
+
+        system_status.update({
+            'running': True,
+            'analyzed_stocks': 0,
+            'total_stocks': len(symbols),
+            'start_time': datetime.now().isoformat(),
+            'phase': 'delta_refresh'
+        })
+        print(f"⚡ Cycle delta {cycle_num}: rafraîchissement de {len(symbols)} cotations")
+
+        try:
+            latest = fetch_latest_bars(symbols)
+        except Exception as e:
+            print(f"⚠️ Rafraîchissement groupé échoué, re-scoring sur les séries en cache: {e}")
+            latest = {}
+
+        band_floor = target_score - band
+        if delta_state['day'] != datetime.now().date():
+            # Changement de séance: les analyses approfondies de la veille ne sont plus publiables
+            reset_delta_state()
+        if not delta_state['deep']:
+            # Premier cycle delta: les finalistes de la passe complète sont les analyses approfondies connues
+            delta_state['deep'] = {c['symbol']: c for c in system_status.get('top_10_candidates') or [] if c.get('symbol')}
+
+        rescored = []
+        changed = []
+        for symbol in symbols:
+            if stop_analysis_flag:
+                break
+            analysis = rescore_with_latest_bar(symbol, latest.get(symbol))
+            if not analysis:
+                continue
+            rescored.append(analysis)
+            # Score précédent: dernier cycle delta, ou passe complète si la série a été rechargée depuis
+            cached = price_series_cache[symbol]
+            previous_at, previous = delta_state['scores'].get(symbol, (None, None))
+            if previous_at != cached['cached_at']:
+                previous = cached['score']
+            delta_state['scores'][symbol] = (cached['cached_at'], analysis['score'])
+            # Ré-analyse: entrée dans la bande, ou membre de la bande dont le score rapide a bougé
+            # (ou dont la série a été rechargée), comme le ferait un recalcul complet
+            near_target = analysis['score'] >= band_floor
+            reloaded = previous_at is not None and previous_at != cached['cached_at']
+            if near_target and (symbol not in delta_state['deep'] or analysis['score'] != previous or reloaded):
+                changed.append(analysis)
+        rescored.sort(key=lambda x: x['score'], reverse=True)
+
+        # Seuls les symboles de la bande proche du seuil entrés ou modifiés depuis le cycle précédent sont ré-analysés
+        in_band = {a['symbol'] for a in rescored if a['score'] >= band_floor}
+        delta_state['deep'] = {symbol: deep for symbol, deep in delta_state['deep'].items() if symbol in in_band}
+        changed.sort(key=lambda x: x['score'], reverse=True)
+        band_candidates = changed[:auto_threshold_config.get('delta_max_reanalysis', 10)]
+        for deferred in changed[len(band_candidates):]:
+            # Au-delà du plafond: analyse périmée retirée, le symbole sera ré-analysé au cycle suivant
+            delta_state['deep'].pop(deferred['symbol'], None)
+
+        system_status.update({
+            'analyzed_stocks': len(rescored),
+            'phase': 'delta_reanalysis',
+            'last_update': datetime.now().isoformat()
+        })
+        print(f"📊 {len(latest)} cotations rafraîchies, {len(band_candidates)} symbole(s) nouveau(x) ou modifié(s) dans la bande "
+              f"{band_floor:.1f}-{target_score}%+ ({len(in_band)} dans la bande)")
+
+        for candidate in band_candidates:
+            if stop_analysis_flag:
+                break
+            # Une ré-analyse échouée ne laisse pas publier l'analyse périmée (nouvel essai au cycle suivant)
+            enhanced = None
+            try:
+                enhanced = deep_analyze_candidate(candidate['symbol'])
+            except Exception as e:
+                print(f"❌ Erreur ré-analyse delta {candidate['symbol']}: {e}")
+            if enhanced:
+                delta_state['deep'][candidate['symbol']] = enhanced
+            else:
+                delta_state['deep'].pop(candidate['symbol'], None)
+            stop_analysis_event.wait(1)
+
+        if stop_analysis_flag:
+            system_status.update({
+                'running': False,
+                'phase': 'stopped',
+                'last_update': datetime.now().isoformat()
+            })
+            print("⏹️ Cycle delta arrêté par l'utilisateur")
+            return
+
+        # Analyses approfondies des symboles de la bande: ré-analyses du cycle et membres inchangés des cycles précédents
+        enhanced_results = [dict(deep) for deep in delta_state['deep'].values()]
+        if not enhanced_results:
+            # Aucun symbole proche du seuil: le classement re-scoré est publié tel quel (seuil non atteignable)
+            best = rescored[0]['score'] if rescored else 0
+            print(f"📉 Aucun symbole dans la bande - meilleur score delta {best}%")
+            enhanced_results = rescored[:10]
+
+        auto_threshold_config['last_cycle'] = {
+            'type': 'delta',
+            'cycle': cycle_num,
+            'duration_seconds': round(time.time() - started, 1),
+            'refreshed': len(latest),
+            'rescored': len(rescored),
+            'reanalyzed': [c['symbol'] for c in band_candidates]
+        }
+        print(f"⚡ Cycle delta terminé en {auto_threshold_config['last_cycle']['duration_seconds']}s")
+
+        finalize_analysis_10(enhanced_results, extra_status={'top_opportunities': rescored[:20]})
+
+    except Exception as e:
+        print(f"❌ Erreur critique dans le cycle delta: {e}")
+        system_status.update({
+            'running': False,
+            'phase': 'error',
+            'last_update': datetime.now().isoformat()
+        })
+
 def _send_recommendation_to_trading(recommendation):
     """Envoie la recommandation finale au système de trading"""
     try:
@@ -2479,23 +3582,30 @@ def configure_auto_threshold():
         target_score = float(data.get('target_score', 70.0))
         max_cycles = int(data.get('max_cycles', 5))
         delay_between_cycles = int(data.get('delay_between_cycles', 30))
+        delta_mode = bool(data.get('delta_mode', auto_threshold_config['delta_mode']))
+        delta_band = float(data.get('delta_band', auto_threshold_config['delta_band']))
         if not (60.0 <= target_score <= 100.0):
             return jsonify({'success': False, 'message': 'Le score cible doit être entre 60% et 100%'})
         if not (1 <= max_cycles <= 40):
             return jsonify({'success': False, 'message': 'Le nombre de cycles doit être entre 1 et 40'})
         if not (1 <= delay_between_cycles <= 60):
             return jsonify({'success': False, 'message': 'Le délai doit être entre 5 et 120 minutes'})
+        if not (1.0 <= delta_band <= 30.0):
+            return jsonify({'success': False, 'message': 'La bande delta doit être entre 1 et 30 points'})
         auto_threshold_config.update({
             'enabled': enabled,
             'target_score': target_score,
             'max_cycles': max_cycles,
-            'delay_between_cycles': delay_between_cycles
+            'delay_between_cycles': delay_between_cycles,
+            'delta_mode': delta_mode,
+            'delta_band': delta_band
         })
         print(f"⚙️ Configuration analyse automatique seuil mise à jour:")
         print(f"   - Activé: {enabled}")
         print(f"   - Score cible: {target_score}%")
         print(f"   - Cycles max: {max_cycles}")
         print(f"   - Délai: {delay_between_cycles} min")
+        print(f"   - Cycles delta: {delta_mode} (bande {delta_band} pts)")
         return jsonify({
             'success': True,
             'message': 'Configuration mise à jour',
@@ -2586,14 +3696,16 @@ def set_mode_extended():
     """Configure le mode étendu avec analyse automatique seuil"""
     try:
         data = request.get_json()
-        system_status['mode'] = data.get('mode', 'manual')
-        system_status['auto_timer_500'] = data.get('timer_500', 30)
-        system_status['auto_timer_10'] = data.get('timer_10', 15)
-        system_status['schedule_500_time'] = data.get('schedule_500_time')
-        system_status['schedule_10_time'] = data.get('schedule_10_time')
-        system_status['schedule_500_enabled'] = data.get('schedule_500_enabled', False)
-        system_status['schedule_10_enabled'] = data.get('schedule_10_enabled', False)
-        system_status['equitable_mode'] = data.get('equitable_mode', False)
+        system_status.update({
+            'mode': data.get('mode', 'manual'),
+            'auto_timer_500': data.get('timer_500', 30),
+            'auto_timer_10': data.get('timer_10', 15),
+            'schedule_500_time': data.get('schedule_500_time'),
+            'schedule_10_time': data.get('schedule_10_time'),
+            'schedule_500_enabled': data.get('schedule_500_enabled', False),
+            'schedule_10_enabled': data.get('schedule_10_enabled', False),
+            'equitable_mode': data.get('equitable_mode', False)
+        })
         
         # Configuration du mode automatique avec horloge
         auto_schedule_data = data.get('auto_schedule', {})
@@ -2766,13 +3878,46 @@ def check_score_threshold_before_trading(final_recommendation):
         print(f"❌ Erreur vérification score seuil: {e}")
         return False
 
-# Démarrer le vidage quotidien automatique
-print("🔧 Configuration du vidage quotidien du cache...")
-setup_daily_cache_cleanup()
-
-if __name__ == '__main__':
-    # CORRECTION: Démarrer le gestionnaire d'horaires automatiquement
+def start_background_services():
+    """Services du processus leader (plus démarrés à l'import): vidage quotidien du cache, gestionnaire d'horaires"""
+    print("🔧 Configuration du vidage quotidien du cache...")
+    setup_daily_cache_cleanup()
     initialize_schedule_manager()
+
+def warm_up_services():
+    """Précharge en arrière-plan la pile d'analyse et la connexion Alpaca, différées à l'import"""
+    tasks = []
+    if orchestrator_v2:
+        tasks.append(orchestrator_v2._lazy_get)
+    if ALPACA_AVAILABLE:
+        tasks.append(lambda: trading_agent.api)
+    tasks.append(lambda: [importlib.import_module(module) for module in ('yfinance', 'textblob')])
+    warm_up(tasks)
+
+def run_analysis_worker():
+    """Processus d'analyse dédié (ANALYSIS_WORKER_MODE=worker): horloges, analyses et trading sans serveur HTTP"""
+    # Liaison vérifiée avant tout (secret explicite, boucle locale): refus de démarrer sinon
+    server = WorkerServer(app, lambda: dumps_bytes(get_status_view()[1]),
+                          event_stream=event_stream, on_subscribe=ensure_stream_publisher)
+    # Un second processus d'analyse reste en attente (rien n'est planifié) jusqu'à la mort du leader
+    leader_lock.acquire(lambda pid: print(f"⏳ Processus d'analyse en attente: leader actuel PID {pid or '?'}"))
+    print(f"👑 Rôle de leader acquis (PID {os.getpid()})")
+    start_background_services()
+    warm_up_services()
+    print("🛠️ Processus d'analyse dédié démarré (statut publié dans l'instantané partagé)")
+    server.serve_forever()
+
+if __name__ == '__main__' and WORKER_MODE == 'worker':
+    run_analysis_worker()
+elif __name__ == '__main__':
+    # CORRECTION: Démarrer le gestionnaire d'horaires automatiquement (dans le processus d'analyse en mode web)
+    # Un second serveur inline sur la même machine ne planifie rien: pas de double déclenchement des ordres
+    if WORKER_MODE != 'web':
+        if leader_lock.try_acquire():
+            start_background_services()
+        else:
+            print(f"⚠️ Leader déjà actif (PID {leader_lock.holder() or '?'}) - gestionnaire d'horaires non démarré")
+        warm_up_services()
     
     print("🚀 Démarrage de l'API S&P 500 Multi-Agents Complète V2 avec Trading Alpaca - VERSION CORRIGÉE")
     print(f"⚡ Polygon: {'✅' if os.getenv('POLYGON_API_KEY') else '❌'}")
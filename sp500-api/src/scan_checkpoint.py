@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Points de Reprise du Scan S&P 500 pour le Bot Trading SP500
+Chaque symbole analysé est ajouté à un journal local (une ligne JSON par symbole),
+ce qui permet de reprendre un scan interrompu (redéploiement, crash, arrêt manuel)
+sans réanalyser les symboles déjà traités
+"""
+
+import json
+import os
+import threading
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+import pytz
+
+from schedule_manager import is_market_holiday
+
+CHECKPOINT_DIR = os.getenv('SCAN_CHECKPOINT_DIR', os.path.join(os.path.dirname(__file__), 'checkpoints'))
+
+def market_as_of_date(now: Optional[datetime] = None) -> str:
+    """
+    Date de séance des données de marché (heure de New York)
+
+    Avant l'ouverture (9h30), les dernières barres sont celles de la séance précédente;
+    les week-ends et jours fériés renvoient à la dernière séance ouvrée.
+    """
+    now = now or datetime.now(pytz.timezone('America/New_York'))
+    day = now.date()
+    if (now.hour, now.minute) < (9, 30):
+        day -= timedelta(days=1)
+    while day.weekday() >= 5 or is_market_holiday(day):
+        day -= timedelta(days=1)
+    return day.isoformat()
+
+class ScanCheckpoint:
+    """Journal append-only des résultats d'un scan des 500 tickers"""
+
+    def __init__(self, mode: str, directory: str = CHECKPOINT_DIR):
+        """
+        Args:
+            mode (str): Mode d'analyse ('original', 'equitable', 'precise'), un journal par mode
+            directory (str): Répertoire des journaux
+        """
+        self.mode = mode
+        self.path = os.path.join(directory, f'scan_500_{mode}.jsonl')
+        self.header: Optional[Dict] = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def begin(self, total: int, resume: bool = False) -> Dict[str, Dict]:
+        """
+        Ouvre le journal pour un nouveau scan
+
+        Args:
+            total (int): Nombre de symboles du scan
+            resume (bool): Recharger les symboles déjà traités si la date des données correspond
+
+        Returns:
+            Dict[str, Dict]: Enregistrements repris par symbole (vide si nouveau scan)
+        """
+        as_of = market_as_of_date()
+
+        if resume:
+            header, records = self._read()
+            if header and header.get('as_of') == as_of:
+                self.header = header
+                self.logger.info(f"♻️ Reprise du scan {self.mode}: {len(records)} symboles déjà traités ({as_of})")
+                return records
+            if header:
+                self.logger.info(f"♻️ Point de reprise {self.mode} obsolète ({header.get('as_of')} ≠ {as_of}) - nouveau scan")
+
+        self.header = {
+            'type': 'header',
+            'mode': self.mode,
+            'as_of': as_of,
+            'total': total,
+            'started': datetime.now().isoformat()
+        }
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w') as f:
+                f.write(json.dumps(self.header) + '\n')
+        return {}
+
+    def append(self, records: Iterable[Dict]):
+        """Ajoute les enregistrements d'un lot (chacun avec une clé 'symbol') et les force sur disque"""
+        lines = [json.dumps(record, default=str) + '\n' for record in records]
+        if not lines or not self.header:
+            return
+        try:
+            with self._lock:
+                with open(self.path, 'a') as f:
+                    f.writelines(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+        except OSError as e:
+            self.logger.error(f"Erreur écriture point de reprise {self.mode}: {e}")
+
+    def info(self) -> Dict:
+        """Résumé du journal sur disque (pour le statut et la décision de reprise)"""
+        header, records = self._read()
+        if not header:
+            return {'mode': self.mode, 'available': False}
+        return {
+            'mode': self.mode,
+            'available': True,
+            'as_of': header.get('as_of'),
+            'resumable': header.get('as_of') == market_as_of_date(),
+            'completed_symbols': len(records),
+            'total': header.get('total'),
+            'started': header.get('started')
+        }
+
+    def clear(self):
+        """Supprime le journal (scan terminé ou données réinitialisées)"""
+        with self._lock:
+            self.header = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _read(self):
+        """Relit le journal; une dernière ligne tronquée (crash en cours d'écriture) est ignorée"""
+        if not os.path.exists(self.path):
+            return None, {}
+        header, records = None, {}
+        with self._lock:
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get('type') == 'header':
+                        header = record
+                    elif record.get('symbol'):
+                        records[record['symbol']] = record
+        return header, records
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Échéances des Scans "Anytime" pour le Bot Trading SP500
+Lecture des échéances (heure du fuseau configuré), projection de fin et indicateur de
+complétude partagés par les analyses classiques et le système équitable
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+import pytz
+
+DEFAULT_DEADLINE_TIMEZONE = 'Europe/Paris'
+
+class DeadlinePassedError(ValueError):
+    """Échéance déjà passée: le scan s'arrêterait avant d'avoir analysé le moindre symbole"""
+
+def parse_deadline(value, timezone: Optional[str] = None) -> Optional[float]:
+    """
+    Convertit une échéance en timestamp epoch, None si absente
+
+    Formats acceptés: "HH:MM" (aujourd'hui dans le fuseau donné), ISO 8601 (fuseau donné si
+    sans décalage) ou timestamp. Lève ValueError/TypeError si le format est invalide et
+    DeadlinePassedError si l'échéance est déjà passée.
+    """
+    if value in (None, ''):
+        return None
+    if isinstance(value, (int, float)):
+        return _check_upcoming(float(value), value)
+    tz = pytz.timezone(timezone or DEFAULT_DEADLINE_TIMEZONE)
+    try:
+        clock = datetime.strptime(value, '%H:%M')
+    except ValueError:
+        moment = datetime.fromisoformat(value)
+    else:
+        moment = datetime.now(tz).replace(tzinfo=None, hour=clock.hour, minute=clock.minute,
+                                          second=0, microsecond=0)
+    if moment.tzinfo is None:
+        moment = tz.localize(moment)
+    return _check_upcoming(moment.timestamp(), value)
+
+def _check_upcoming(deadline: float, value) -> float:
+    if deadline <= time.time():
+        raise DeadlinePassedError(f"Échéance déjà passée: {value}")
+    return deadline
+
+def upcoming_deadline(value, timezone: Optional[str] = None) -> Optional[float]:
+    """Échéance configurée des analyses programmées: ignorée si absente, invalide ou déjà passée"""
+    try:
+        return parse_deadline(value, timezone)
+    except (TypeError, ValueError):
+        return None
+
+def deadline_pressure(deadline: Optional[float], started: float, done: int, remaining: int) -> bool:
+    """True si, au débit observé, les éléments restants ne tiennent pas avant l'échéance"""
+    if not deadline or done == 0:
+        return False
+    rate = (time.time() - started) / done
+    return rate * remaining > deadline - time.time()
+
+def build_completeness(scanned: int, total: int, successful: int, light_symbols: int = 0,
+                       deadline_hit: bool = False, deadline_ts: Optional[float] = None) -> Dict:
+    """Construit l'indicateur de complétude d'un scan"""
+    return {
+        'scanned': scanned,
+        'total': total,
+        'successful': successful,
+        'ratio': round(scanned / total, 3) if total else 0.0,
+        'light_symbols': light_symbols,
+        'deadline_hit': deadline_hit,
+        'deadline': datetime.fromtimestamp(deadline_ts).isoformat() if deadline_ts else None,
+        'complete': scanned >= total and light_symbols == 0
+    }
+
+class ScanDeadline:
+    """Échéance d'un scan "anytime" : projection de fin, mode allégé et indicateur de complétude
+
+    La projection extrapole le débit observé (secondes par symbole) sur les symboles restants.
+    Si la fin projetée dépasse l'échéance, les symboles suivants (les moins prioritaires, le scan
+    étant ordonné par score attendu) sont analysés en mode allégé et sans pause entre batches.
+    """
+
+    def __init__(self, deadline_ts: float, total_symbols: int):
+        self.deadline_ts = deadline_ts
+        self.total_symbols = total_symbols
+        self.started = time.time()
+        self.scanned = 0
+        self.restored = 0  # Symboles repris du journal (hors calcul du débit)
+        self.light_symbols = 0
+        self.deadline_hit = False
+
+    def remaining_time(self) -> float:
+        return self.deadline_ts - time.time()
+
+    def expired(self) -> bool:
+        if self.remaining_time() <= 0:
+            self.deadline_hit = True
+        return self.deadline_hit
+
+    def projected_overshoot(self, remaining_symbols: int) -> bool:
+        """True si, au débit actuel, les symboles restants ne tiennent pas avant l'échéance"""
+        return deadline_pressure(self.deadline_ts, self.started, self.scanned, remaining_symbols)
+
+    def record_batch(self, count: int, light: bool):
+        self.scanned += count
+        if light:
+            self.light_symbols += count
+
+    def completeness(self, successful: int) -> Dict:
+        """Indicateur de complétude publié avec le Top K"""
+        return build_completeness(self.scanned + self.restored, self.total_symbols, successful,
+                                  self.light_symbols, self.deadline_hit, self.deadline_ts)
@@ -1,24 +1,85 @@
 #!/usr/bin/env python3
 """
 Gestionnaire d'Horloge pour le Bot Trading SP500
-Gère la planification automatique du mode seuil
+Gère toutes les tâches planifiées du processus (mode seuil, analyses programmées, vidage du cache)
+avec un tas de minuteries unique: le thread dort exactement jusqu'à la prochaine échéance
 """
 
-import schedule
+import heapq
+import itertools
 import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
+from datetime import time as dtime
+from functools import lru_cache
 import pytz
 import logging
-from typing import Dict, Callable, Optional, List
+from typing import Dict, Callable, Optional, List, Set
+
+# ===== JOURS FÉRIÉS DU MARCHÉ US (NYSE) =====
+
+def _easter_sunday(year: int) -> date:
+    """Dimanche de Pâques (algorithme grégorien anonyme)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-ième jour de semaine du mois (n=-1 pour le dernier)"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = (date(year, month + 1, 1) if month < 12 else date(year + 1, 1, 1)) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def _observed(day: date) -> date:
+    """Report du jour férié tombant un week-end (samedi -> vendredi, dimanche -> lundi)"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+@lru_cache(maxsize=16)
+def us_market_holidays(year: int) -> Set[date]:
+    """Jours de fermeture complète du NYSE pour une année"""
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),                  # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),                  # Presidents' Day
+        _easter_sunday(year) - timedelta(days=2),     # Good Friday
+        _nth_weekday(year, 5, 0, -1),                 # Memorial Day
+        _observed(date(year, 7, 4)),                  # Independence Day
+        _nth_weekday(year, 9, 0, 1),                  # Labor Day
+        _nth_weekday(year, 11, 3, 4),                 # Thanksgiving
+        _observed(date(year, 12, 25)),                # Christmas
+    }
+    # Le Nouvel An tombant un samedi n'est pas reporté au vendredi précédent
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.add(_observed(new_year))
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))    # Juneteenth
+    return holidays
+
+def is_market_holiday(day: date) -> bool:
+    """Indique si le marché US est fermé ce jour (jour férié)"""
+    return day in us_market_holidays(day.year)
 
 class ScheduleManager:
-    """Gestionnaire d'horaires pour le déclenchement automatique du mode seuil"""
-    
+    """Planificateur unique à tas de minuteries (tâches quotidiennes, périodiques et ponctuelles)"""
+
     def __init__(self, timezone='Europe/Paris'):
         """
         Initialise le gestionnaire d'horaires
-        
+
         Args:
             timezone (str): Fuseau horaire par défaut
         """
@@ -27,23 +88,33 @@ class ScheduleManager:
         self.running = False
         self.scheduler_thread = None
         self.stop_event = threading.Event()
-        
+
+        # Tas des échéances: (timestamp, séquence, job_id, génération)
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
         # Configuration du logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
-        
-    def add_schedule(self, time_str: str, callback: Callable, job_id: str, 
-                    weekdays_only: bool = True, enabled: bool = True) -> bool:
+
+    def add_schedule(self, time_str: str, callback: Callable, job_id: str,
+                    weekdays_only: bool = True, enabled: bool = True,
+                    timezone: Optional[str] = None, skip_holidays: bool = False,
+                    misfire_grace_time: float = 60.0) -> bool:
         """
-        Ajoute une tâche programmée
-        
+        Ajoute une tâche quotidienne programmée
+
         Args:
             time_str (str): Heure au format "HH:MM"
             callback (Callable): Fonction à exécuter
             job_id (str): Identifiant unique de la tâche
             weekdays_only (bool): Exécuter seulement les jours de semaine
             enabled (bool): Tâche activée
-            
+            timezone (str): Fuseau horaire de l'heure (None = heure locale du serveur)
+            skip_holidays (bool): Ne pas exécuter les jours fériés du marché US
+            misfire_grace_time (float): Retard maximum toléré (s) avant de compter un raté
+
         Returns:
             bool: True si la tâche a été ajoutée avec succès
         """
@@ -52,69 +123,134 @@ class ScheduleManager:
             if not self._validate_time_format(time_str):
                 self.logger.error(f"Format d'heure invalide: {time_str}")
                 return False
-            
-            # Supprimer la tâche existante si elle existe
-            if job_id in self.scheduled_jobs:
-                self.remove_schedule(job_id)
-            
-            # Créer la nouvelle tâche
-            job_config = {
+
+            if timezone:
+                pytz.timezone(timezone)
+
+            self._register_job(job_id, {
+                'kind': 'daily',
                 'time_str': time_str,
                 'callback': callback,
                 'weekdays_only': weekdays_only,
                 'enabled': enabled,
-                'job': None,
-                'last_run': None,
-                'next_run': None
-            }
-            
-            # Programmer la tâche
-            if weekdays_only:
-                job = schedule.every().monday.at(time_str).do(self._execute_job, job_id)
-                schedule.every().tuesday.at(time_str).do(self._execute_job, job_id)
-                schedule.every().wednesday.at(time_str).do(self._execute_job, job_id)
-                schedule.every().thursday.at(time_str).do(self._execute_job, job_id)
-                schedule.every().friday.at(time_str).do(self._execute_job, job_id)
-            else:
-                job = schedule.every().day.at(time_str).do(self._execute_job, job_id)
-            
-            job_config['job'] = job
-            job_config['next_run'] = self._calculate_next_run(time_str, weekdays_only)
-            
-            self.scheduled_jobs[job_id] = job_config
-            
-            self.logger.info(f"Tâche programmée ajoutée: {job_id} à {time_str}")
+                'timezone': timezone,
+                'skip_holidays': skip_holidays,
+                'misfire_grace_time': misfire_grace_time
+            })
+
+            self.logger.info(f"Tâche programmée ajoutée: {job_id} à {time_str} ({timezone or 'heure locale'})")
             return True
-            
+
         except Exception as e:
             self.logger.error(f"Erreur lors de l'ajout de la tâche {job_id}: {e}")
             return False
-    
+
+    def add_interval(self, job_id: str, callback: Callable, interval_seconds: float,
+                     enabled: bool = True, misfire_grace_time: Optional[float] = None) -> bool:
+        """
+        Ajoute une tâche périodique
+
+        Args:
+            job_id (str): Identifiant unique de la tâche
+            callback (Callable): Fonction à exécuter
+            interval_seconds (float): Période en secondes
+            enabled (bool): Tâche activée
+            misfire_grace_time (float): Retard maximum toléré (s), par défaut la période
+
+        Returns:
+            bool: True si la tâche a été ajoutée avec succès
+        """
+        try:
+            if interval_seconds <= 0:
+                self.logger.error(f"Période invalide pour {job_id}: {interval_seconds}")
+                return False
+
+            self._register_job(job_id, {
+                'kind': 'interval',
+                'time_str': None,
+                'callback': callback,
+                'weekdays_only': False,
+                'enabled': enabled,
+                'timezone': None,
+                'skip_holidays': False,
+                'interval_seconds': interval_seconds,
+                'misfire_grace_time': misfire_grace_time if misfire_grace_time is not None else interval_seconds
+            })
+
+            self.logger.info(f"Tâche périodique ajoutée: {job_id} toutes les {interval_seconds}s")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'ajout de la tâche {job_id}: {e}")
+            return False
+
+    def add_one_shot(self, job_id: str, callback: Callable, run_at: Optional[datetime] = None,
+                     delay_seconds: Optional[float] = None, misfire_grace_time: float = 60.0) -> bool:
+        """
+        Ajoute une tâche ponctuelle (supprimée après son exécution)
+
+        Args:
+            job_id (str): Identifiant unique de la tâche
+            callback (Callable): Fonction à exécuter
+            run_at (datetime): Date d'exécution (naïve = heure locale du serveur)
+            delay_seconds (float): Alternative à run_at, délai à partir de maintenant
+            misfire_grace_time (float): Retard maximum toléré (s) avant de compter un raté
+
+        Returns:
+            bool: True si la tâche a été ajoutée avec succès
+        """
+        try:
+            if run_at is None:
+                if delay_seconds is None:
+                    self.logger.error(f"Tâche ponctuelle {job_id} sans échéance")
+                    return False
+                run_at = datetime.now().astimezone() + timedelta(seconds=delay_seconds)
+            elif run_at.tzinfo is None:
+                run_at = run_at.astimezone()
+
+            self._register_job(job_id, {
+                'kind': 'once',
+                'time_str': None,
+                'callback': callback,
+                'weekdays_only': False,
+                'enabled': True,
+                'timezone': None,
+                'skip_holidays': False,
+                'run_at': run_at,
+                'misfire_grace_time': misfire_grace_time
+            })
+
+            self.logger.info(f"Tâche ponctuelle ajoutée: {job_id} à {run_at.isoformat()}")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'ajout de la tâche {job_id}: {e}")
+            return False
+
     def remove_schedule(self, job_id: str) -> bool:
         """
         Supprime une tâche programmée
-        
+
         Args:
             job_id (str): Identifiant de la tâche
-            
+
         Returns:
             bool: True si la tâche a été supprimée avec succès
         """
         try:
-            if job_id in self.scheduled_jobs:
-                job_config = self.scheduled_jobs[job_id]
-                if job_config['job']:
-                    schedule.cancel_job(job_config['job'])
-                del self.scheduled_jobs[job_id]
-                self.logger.info(f"Tâche supprimée: {job_id}")
-                return True
-            else:
-                self.logger.warning(f"Tâche non trouvée: {job_id}")
-                return False
+            with self._condition:
+                if job_id in self.scheduled_jobs:
+                    # L'entrée du tas devient obsolète et sera ignorée
+                    del self.scheduled_jobs[job_id]
+                    self._condition.notify_all()
+                    self.logger.info(f"Tâche supprimée: {job_id}")
+                    return True
+            self.logger.warning(f"Tâche non trouvée: {job_id}")
+            return False
         except Exception as e:
             self.logger.error(f"Erreur lors de la suppression de la tâche {job_id}: {e}")
             return False
-    
+
     def enable_schedule(self, job_id: str) -> bool:
         """Active une tâche programmée"""
         if job_id in self.scheduled_jobs:
@@ -122,7 +258,7 @@ class ScheduleManager:
             self.logger.info(f"Tâche activée: {job_id}")
             return True
         return False
-    
+
     def disable_schedule(self, job_id: str) -> bool:
         """Désactive une tâche programmée"""
         if job_id in self.scheduled_jobs:
@@ -130,21 +266,27 @@ class ScheduleManager:
             self.logger.info(f"Tâche désactivée: {job_id}")
             return True
         return False
-    
+
     def start_scheduler(self) -> bool:
         """
         Démarre le gestionnaire d'horaires
-        
+
         Returns:
             bool: True si le gestionnaire a été démarré avec succès
         """
         if self.running:
             self.logger.warning("Le gestionnaire d'horaires est déjà en cours d'exécution")
             return False
-        
+
         try:
-            self.running = True
-            self.stop_event.clear()
+            with self._condition:
+                self.running = True
+                self.stop_event.clear()
+                # Échéances recalculées: les tâches restent enregistrées pendant un arrêt
+                self._heap = []
+                for job_id in list(self.scheduled_jobs):
+                    self._push_next_run(job_id)
+
             self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
             self.scheduler_thread.start()
             self.logger.info("Gestionnaire d'horaires démarré")
@@ -153,38 +295,37 @@ class ScheduleManager:
             self.logger.error(f"Erreur lors du démarrage du gestionnaire: {e}")
             self.running = False
             return False
-    
+
     def stop_scheduler(self) -> bool:
         """
         Arrête le gestionnaire d'horaires
-        
+
         Returns:
             bool: True si le gestionnaire a été arrêté avec succès
         """
         if not self.running:
             self.logger.warning("Le gestionnaire d'horaires n'est pas en cours d'exécution")
             return False
-        
+
         try:
-            self.running = False
-            self.stop_event.set()
-            
+            with self._condition:
+                self.running = False
+                self.stop_event.set()
+                self._condition.notify_all()
+
             if self.scheduler_thread and self.scheduler_thread.is_alive():
                 self.scheduler_thread.join(timeout=5)
-            
-            # Nettoyer toutes les tâches programmées
-            schedule.clear()
-            
+
             self.logger.info("Gestionnaire d'horaires arrêté")
             return True
         except Exception as e:
             self.logger.error(f"Erreur lors de l'arrêt du gestionnaire: {e}")
             return False
-    
+
     def get_status(self) -> Dict:
         """
         Retourne le statut du gestionnaire d'horaires
-        
+
         Returns:
             Dict: Statut complet du gestionnaire
         """
@@ -192,66 +333,184 @@ class ScheduleManager:
             'running': self.running,
             'timezone': self.timezone,
             'jobs_count': len(self.scheduled_jobs),
+            'pending_timers': len(self._heap),
             'jobs': {}
         }
-        
-        for job_id, job_config in self.scheduled_jobs.items():
-            status['jobs'][job_id] = {
-                'time': job_config['time_str'],
-                'enabled': job_config['enabled'],
-                'weekdays_only': job_config['weekdays_only'],
-                'last_run': job_config['last_run'].isoformat() if job_config['last_run'] else None,
-                'next_run': job_config['next_run'].isoformat() if job_config['next_run'] else None
-            }
-        
+
+        for job_id in list(self.scheduled_jobs):
+            job_status = self.get_job_status(job_id)
+            if job_status:
+                status['jobs'][job_id] = job_status
+
         return status
-    
-    def _execute_job(self, job_id: str):
+
+    def get_job_status(self, job_id: str) -> Optional[Dict]:
+        """Retourne le statut et les statistiques (ratés, latence) d'une tâche"""
+        job_config = self.scheduled_jobs.get(job_id)
+        if not job_config:
+            return None
+
+        return {
+            'kind': job_config['kind'],
+            'time': job_config['time_str'],
+            'interval_seconds': job_config.get('interval_seconds'),
+            'enabled': job_config['enabled'],
+            'weekdays_only': job_config['weekdays_only'],
+            'timezone': job_config['timezone'],
+            'skip_holidays': job_config['skip_holidays'],
+            'last_run': job_config['last_run'].isoformat() if job_config['last_run'] else None,
+            'next_run': job_config['next_run'].isoformat() if job_config['next_run'] else None,
+            'stats': dict(job_config['stats'])
+        }
+
+    def _register_job(self, job_id: str, job_config: Dict):
+        """Enregistre (ou remplace) une tâche et place sa prochaine échéance dans le tas"""
+        with self._condition:
+            previous = self.scheduled_jobs.get(job_id)
+            job_config.update({
+                'generation': (previous['generation'] + 1) if previous else 0,
+                'last_run': None,
+                'next_run': None,
+                'stats': {
+                    'runs': 0,
+                    'misfires': 0,
+                    'errors': 0,
+                    'last_latency_ms': None,
+                    'avg_latency_ms': None,
+                    'max_latency_ms': None,
+                    'last_duration_ms': None
+                }
+            })
+            self.scheduled_jobs[job_id] = job_config
+            self._push_next_run(job_id)
+
+    def _push_next_run(self, job_id: str, after: Optional[datetime] = None):
+        """Calcule la prochaine échéance d'une tâche et l'insère dans le tas (verrou tenu)"""
+        job_config = self.scheduled_jobs[job_id]
+
+        if job_config['kind'] == 'daily':
+            next_run = self._calculate_next_run(
+                job_config['time_str'],
+                job_config['weekdays_only'],
+                job_config['timezone'],
+                job_config['skip_holidays']
+            )
+        elif job_config['kind'] == 'interval':
+            now = datetime.now().astimezone()
+            next_run = (after or now) + timedelta(seconds=job_config['interval_seconds'])
+            if next_run <= now:
+                next_run = now + timedelta(seconds=job_config['interval_seconds'])
+        else:
+            next_run = job_config['run_at']
+
+        job_config['next_run'] = next_run
+        if next_run is None:
+            return
+
+        heapq.heappush(self._heap, (next_run.timestamp(), next(self._sequence), job_id, job_config['generation']))
+        self._condition.notify_all()
+
+    def _pop_due_jobs(self) -> List:
+        """Attend la prochaine échéance et retourne les tâches dues: [(job_id, configuration, échéance)]"""
+        with self._condition:
+            while self.running:
+                # Entrées obsolètes (tâche supprimée ou remplacée)
+                while self._heap:
+                    _, _, job_id, generation = self._heap[0]
+                    job_config = self.scheduled_jobs.get(job_id)
+                    if job_config and job_config['generation'] == generation:
+                        break
+                    heapq.heappop(self._heap)
+
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                delay = self._heap[0][0] - time.time()
+                if delay > 0:
+                    # Sommeil exact jusqu'à l'échéance (réveillé par tout ajout/suppression)
+                    self._condition.wait(timeout=delay)
+                    continue
+
+                due_jobs = []
+                now = time.time()
+                while self._heap and self._heap[0][0] <= now:
+                    due_ts, _, job_id, generation = heapq.heappop(self._heap)
+                    job_config = self.scheduled_jobs.get(job_id)
+                    if not job_config or job_config['generation'] != generation:
+                        continue
+                    due_jobs.append((job_id, job_config, due_ts))
+
+                    # Replanification immédiate des tâches récurrentes
+                    if job_config['kind'] == 'daily':
+                        self._push_next_run(job_id)
+                    elif job_config['kind'] == 'interval':
+                        self._push_next_run(job_id, after=datetime.fromtimestamp(due_ts).astimezone())
+                    else:
+                        del self.scheduled_jobs[job_id]
+                return due_jobs
+        return []
+
+    def _dispatch(self, job_id: str, job_config: Dict, due_ts: float):
+        """Lance une tâche due (ou la compte comme ratée si son retard dépasse la tolérance)"""
+        lateness = time.time() - due_ts
+        stats = job_config['stats']
+
+        if not job_config['enabled']:
+            self.logger.info(f"Tâche désactivée, ignorée: {job_id}")
+            return
+
+        if lateness > job_config['misfire_grace_time']:
+            stats['misfires'] += 1
+            self.logger.warning(f"Tâche ratée: {job_id} (retard {lateness:.1f}s)")
+            return
+
+        latency_ms = round(lateness * 1000, 1)
+        runs = stats['runs']
+        stats['runs'] = runs + 1
+        stats['last_latency_ms'] = latency_ms
+        stats['max_latency_ms'] = max(stats['max_latency_ms'] or 0.0, latency_ms)
+        stats['avg_latency_ms'] = round(((stats['avg_latency_ms'] or 0.0) * runs + latency_ms) / (runs + 1), 1)
+        job_config['last_run'] = datetime.now().astimezone()
+
+        # Exécution hors du thread d'horloge: une tâche longue ne retarde pas les suivantes
+        worker = threading.Thread(target=self._execute_job, args=(job_id, job_config), daemon=True,
+                                  name=f"schedule-{job_id}")
+        worker.start()
+
+    def _execute_job(self, job_id: str, job_config: Dict):
         """Exécute une tâche programmée"""
+        started = time.time()
         try:
-            if job_id not in self.scheduled_jobs:
-                self.logger.error(f"Tâche non trouvée: {job_id}")
-                return
-            
-            job_config = self.scheduled_jobs[job_id]
-            
-            if not job_config['enabled']:
-                self.logger.info(f"Tâche désactivée, ignorée: {job_id}")
-                return
-            
             self.logger.info(f"Exécution de la tâche programmée: {job_id}")
-            
-            # Mettre à jour l'heure de dernière exécution
-            job_config['last_run'] = datetime.now()
-            job_config['next_run'] = self._calculate_next_run(
-                job_config['time_str'], 
-                job_config['weekdays_only']
-            )
-            
+
             # Exécuter la fonction callback
             callback = job_config['callback']
             if callback:
                 callback()
-            
+
             self.logger.info(f"Tâche exécutée avec succès: {job_id}")
-            
+
         except Exception as e:
+            job_config['stats']['errors'] += 1
             self.logger.error(f"Erreur lors de l'exécution de la tâche {job_id}: {e}")
-    
+        finally:
+            job_config['stats']['last_duration_ms'] = round((time.time() - started) * 1000, 1)
+
     def _run_scheduler(self):
         """Boucle principale du gestionnaire d'horaires"""
         self.logger.info("Boucle du gestionnaire d'horaires démarrée")
-        
+
         while self.running and not self.stop_event.is_set():
             try:
-                schedule.run_pending()
-                time.sleep(1)  # Vérifier toutes les secondes
+                for job_id, job_config, due_ts in self._pop_due_jobs():
+                    self._dispatch(job_id, job_config, due_ts)
             except Exception as e:
                 self.logger.error(f"Erreur dans la boucle du gestionnaire: {e}")
-                time.sleep(5)  # Attendre avant de réessayer
-        
+                self.stop_event.wait(5)  # Attendre avant de réessayer
+
         self.logger.info("Boucle du gestionnaire d'horaires arrêtée")
-    
+
     def _validate_time_format(self, time_str: str) -> bool:
         """Valide le format d'heure HH:MM"""
         try:
@@ -259,33 +518,32 @@ class ScheduleManager:
             return True
         except ValueError:
             return False
-    
-    def _calculate_next_run(self, time_str: str, weekdays_only: bool) -> Optional[datetime]:
-        """Calcule la prochaine exécution d'une tâche"""
+
+    def _calculate_next_run(self, time_str: str, weekdays_only: bool, timezone: Optional[str] = None,
+                            skip_holidays: bool = False) -> Optional[datetime]:
+        """Calcule la prochaine exécution d'une tâche (datetime avec fuseau horaire)"""
         try:
-            now = datetime.now()
-            time_parts = time_str.split(':')
-            hour = int(time_parts[0])
-            minute = int(time_parts[1])
-            
-            # Calculer la prochaine exécution aujourd'hui
-            next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-            
-            # Si l'heure est déjà passée aujourd'hui, passer au jour suivant
-            if next_run <= now:
-                next_run += timedelta(days=1)
-            
-            # Si on ne veut que les jours de semaine, ajuster si nécessaire
-            if weekdays_only:
-                while next_run.weekday() >= 5:  # 5 = samedi, 6 = dimanche
-                    next_run += timedelta(days=1)
-            
-            return next_run
-            
+            tz = pytz.timezone(timezone) if timezone else None
+            now = datetime.now(tz) if tz else datetime.now().astimezone()
+            hour, minute = (int(part) for part in time_str.split(':'))
+
+            candidate_day = now.date()
+            for _ in range(400):
+                naive = datetime.combine(candidate_day, dtime(hour, minute))
+                next_run = tz.localize(naive) if tz else naive.astimezone()
+
+                # Jours de semaine seulement (5 = samedi, 6 = dimanche) et jours fériés du marché
+                if (next_run > now
+                        and not (weekdays_only and candidate_day.weekday() >= 5)
+                        and not (skip_holidays and is_market_holiday(candidate_day))):
+                    return next_run
+                candidate_day += timedelta(days=1)
+
+            return None
+
         except Exception as e:
             self.logger.error(f"Erreur lors du calcul de la prochaine exécution: {e}")
             return None
 
 # Instance globale du gestionnaire d'horaires
 schedule_manager = ScheduleManager()
-
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Banc d'Essai du Démarrage à Froid pour le Bot Trading SP500
+Mesure `import main` dans des processus neufs (un par essai, caches Python chauds),
+pour chaque mode de processus, et vérifie que la pile d'analyse reste différée
+
+Usage: python startup_benchmark.py [essais]   (code de sortie 1 si le budget est dépassé)
+"""
+
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+STARTUP_BUDGET = float(os.getenv('STARTUP_BUDGET', '1.0'))  # Secondes, médiane de `import main`
+DEFAULT_RUNS = 5
+TOP_IMPORTS = 10  # Modules les plus coûteux affichés (temps cumulé, -X importtime)
+
+# Modules qui ne doivent être chargés qu'au premier usage (ou par le préchargement)
+DEFERRED_MODULES = ('pandas', 'numpy', 'yfinance', 'sklearn', 'textblob', 'alpaca_trade_api',
+                    'central_orchestrator', 'individual_agent_v2')
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULT_MARKER = 'STARTUP_BENCHMARK '
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(%r + json.dumps({'elapsed': elapsed, 'loaded': [m for m in %r if m in sys.modules]}), flush=True)
+"""
+
+def run_probe(mode: str, importtime: bool = False):
+    """Un import de main dans un interpréteur neuf; retourne (mesure, sortie -X importtime)"""
+    env = dict(os.environ, ANALYSIS_WORKER_MODE=mode)
+    # Le mode web exige le secret du lien vers le worker (aucune connexion n'est ouverte à l'import)
+    env.setdefault('ANALYSIS_WORKER_AUTHKEY', os.urandom(16).hex())
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', PROBE % (RESULT_MARKER, DEFERRED_MODULES)]
+    completed = subprocess.run(command, cwd=SRC_DIR, env=env, capture_output=True, text=True, timeout=120)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Import de main échoué (mode {mode}):\n{completed.stderr[-2000:]}")
+    # Les journaux de main (et de ses hooks atexit) partagent la sortie standard
+    result = next(line for line in completed.stdout.splitlines() if line.startswith(RESULT_MARKER))
+    return json.loads(result[len(RESULT_MARKER):]), completed.stderr
+
+def top_imports(importtime_output: str, count: int = TOP_IMPORTS):
+    """Imports directs de main triés par temps cumulé (microsecondes)"""
+    modules = []
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Un espace de séparation, puis deux par niveau d'imbrication (main est au niveau 0)
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        if cumulative.strip().isdigit() and depth == 1:
+            modules.append((int(cumulative), name.strip()))
+    return sorted(modules, reverse=True)[:count]
+
+def run_benchmark(runs: int = DEFAULT_RUNS) -> bool:
+    print(f"Démarrage à froid: médiane de {runs} imports de main par mode (budget {STARTUP_BUDGET:.2f}s)")
+    within_budget = True
+
+    for mode in ('inline', 'web'):
+        samples = []
+        loaded = set()
+        for _ in range(runs):
+            measure, _ = run_probe(mode)
+            samples.append(measure['elapsed'])
+            loaded.update(measure['loaded'])
+
+        median = statistics.median(samples)
+        status = "✅" if median <= STARTUP_BUDGET and not loaded else "❌"
+        print(f"{status} mode {mode:<7} médiane {median:.3f}s (min {min(samples):.3f}s, max {max(samples):.3f}s)")
+        if loaded:
+            print(f"   ⚠️ Modules chargés à l'import au lieu du premier usage: {', '.join(sorted(loaded))}")
+        within_budget = within_budget and median <= STARTUP_BUDGET and not loaded
+
+    _, importtime_output = run_probe('inline', importtime=True)
+    print("Imports les plus coûteux (temps cumulé):")
+    for cumulative, name in top_imports(importtime_output):
+        print(f"   {cumulative / 1000:8.1f} ms  {name}")
+
+    return within_budget
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RUNS) else 1)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Magasin de Statut Versionné pour le Bot Trading SP500
+Les écritures sont sérialisées par un verrou et publient chacune un instantané immuable;
+les lecteurs (routes Flask, processus d'analyse) récupèrent l'instantané courant en O(1),
+sans copie ni verrou, avec une version croissante utilisable pour les requêtes conditionnelles
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    """Instantané publié: jamais modifié après publication"""
+    version: int
+    data: Mapping[str, Any]
+    published_at: float
+
+class VersionedStatusStore(dict):
+    """
+    Dictionnaire de statut dont chaque écriture publie un nouvel instantané (copie à l'écriture)
+
+    Les lectures directes (store.get, store[...]) restent disponibles pour le code existant;
+    les valeurs sont remplacées, jamais modifiées sur place, ce qui rend la copie superficielle suffisante.
+    """
+
+    def __init__(self, initial: Dict[str, Any], private_keys: Iterable[str] = ()):
+        """
+        Args:
+            initial (Dict): Statut initial
+            private_keys (Iterable[str]): Champs internes exclus des instantanés (non sérialisables)
+        """
+        super().__init__(initial)
+        self.private_keys = frozenset(private_keys)
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._dirty = False
+        self._version = 0
+        self._snapshot: StatusSnapshot = None
+        self._publish()
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def snapshot(self) -> StatusSnapshot:
+        """Instantané courant (lecture atomique d'une référence, sans verrou)"""
+        return self._snapshot
+
+    @contextmanager
+    def batch(self):
+        """Regroupe plusieurs écritures en une seule publication (les lecteurs voient tout ou rien)"""
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._dirty:
+                    self._publish()
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+            self._changed()
+
+    def __delitem__(self, key):
+        with self._lock:
+            super().__delitem__(key)
+            self._changed()
+
+    def update(self, *args, **kwargs):
+        with self._lock:
+            super().update(*args, **kwargs)
+            self._changed()
+
+    def pop(self, key, *default):
+        with self._lock:
+            value = super().pop(key, *default)
+            self._changed()
+            return value
+
+    def setdefault(self, key, default=None):
+        with self._lock:
+            if key in self:
+                return self[key]
+            self[key] = default
+            return default
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+            self._changed()
+
+    def _changed(self):
+        if self._batch_depth:
+            self._dirty = True
+        else:
+            self._publish()
+
+    def _publish(self):
+        """Construit et publie l'instantané (appelé sous verrou par l'écrivain)"""
+        data = {key: value for key, value in self.items() if key not in self.private_keys}
+        self._version += 1
+        self._dirty = False
+        self._snapshot = StatusSnapshot(self._version, MappingProxyType(data), time.time())
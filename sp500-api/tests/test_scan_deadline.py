@@ -0,0 +1,58 @@
+"""
+Tests des échéances de scan (lecture "HH:MM" dans le fuseau configuré, échéances passées refusées)
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scan_deadline import DeadlinePassedError, parse_deadline, upcoming_deadline
+
+TIMEZONE = 'Europe/Paris'
+
+def _clock(offset: timedelta) -> str:
+    """Heure "HH:MM" du fuseau configuré, décalée de maintenant"""
+    return (datetime.now(pytz.timezone(TIMEZONE)) + offset).strftime('%H:%M')
+
+def _skip_near_midnight(offset: timedelta):
+    # "HH:MM" désigne aujourd'hui: un décalage qui franchit minuit changerait de jour
+    now = datetime.now(pytz.timezone(TIMEZONE))
+    if (now + offset).date() != now.date():
+        pytest.skip("Décalage à cheval sur minuit dans le fuseau configuré")
+
+def test_clock_deadline_in_configured_timezone():
+    offset = timedelta(hours=2)
+    _skip_near_midnight(offset)
+    deadline = parse_deadline(_clock(offset), TIMEZONE)
+    expected = (datetime.now(pytz.timezone(TIMEZONE)) + offset).replace(second=0, microsecond=0)
+    assert deadline == expected.timestamp()
+
+def test_past_clock_deadline_is_rejected():
+    offset = -timedelta(minutes=2)
+    _skip_near_midnight(offset)
+    with pytest.raises(DeadlinePassedError):
+        parse_deadline(_clock(offset), TIMEZONE)
+
+def test_past_iso_and_timestamp_deadlines_are_rejected():
+    with pytest.raises(DeadlinePassedError):
+        parse_deadline((datetime.now(pytz.utc) - timedelta(hours=1)).isoformat(), TIMEZONE)
+    with pytest.raises(DeadlinePassedError):
+        parse_deadline(time.time() - 60)
+
+def test_invalid_and_missing_deadlines():
+    assert parse_deadline(None) is None
+    assert parse_deadline('') is None
+    with pytest.raises(ValueError):
+        parse_deadline('demain', TIMEZONE)
+
+def test_scheduled_deadline_ignores_past_times():
+    assert upcoming_deadline(time.time() - 60) is None
+    assert upcoming_deadline('invalide', TIMEZONE) is None
+    future = time.time() + 3600
+    assert upcoming_deadline(future) == future
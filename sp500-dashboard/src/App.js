@@ -5,6 +5,23 @@ import Alpaca from '@alpacahq/alpaca-trade-api';
 // Configuration de l'URL de l'API
 const API_BASE_URL = process.env.REACT_APP_API_URL || "https://sp500-day-tradingbot.onrender.com"; // Utilise des guillemets simples ou doubles, pas de template string ici
 
+// Requêtes conditionnelles des endpoints interrogés périodiquement:
+// l'ETag reçu est renvoyé dans If-None-Match, une réponse 304 (sans corps) retourne null
+const lastETags = new Map();
+const fetchIfChanged = async (path) => {
+  const url = `${API_BASE_URL}${path}`;
+  const etag = lastETags.get(url);
+  const response = await fetch(url, {
+    cache: 'no-store', // Le cache HTTP du navigateur ne doit pas répondre à notre place
+    headers: etag ? { 'If-None-Match': etag } : {}
+  });
+  if (response.status === 304) return null;
+  const data = await response.json();
+  const newETag = response.headers.get('ETag');
+  if (newETag) lastETags.set(url, newETag);
+  return data;
+};
+
 // === CONFIGURATION ALPACA ===
 // Remplacez ces valeurs par vos vraies clés ou utilisez un formulaire sécurisé côté interface
 const ALPACA_KEY = process.env.REACT_APP_ALPACA_KEY || '';
@@ -302,73 +319,81 @@ const [autoSendLogs, setAutoSendLogs] = useState([]);
   
   // État pour éviter l'écrasement des champs en cours de modification
   const [isEditingTradingConfig, setIsEditingTradingConfig] = useState(false);
+  
+  // Flux SSE connecté: le polling du statut est suspendu
+  const [streamConnected, setStreamConnected] = useState(false);
   const editingTimeoutRef = useRef(null);
   
   // État local pour la valeur en cours de saisie du montant initial
   const [localInitialAmount, setLocalInitialAmount] = useState('');
 
+  // Application d'un statut reçu (requête ou flux SSE)
+  const applySystemStatus = useCallback((data) => {
+    setSystemStatus(data);
+    
+    // Mise à jour des états locaux SEULEMENT si on n'est pas en train de configurer
+    if (!showSettings && !isConfiguring.current) {
+      if (data.mode) setMode(data.mode);
+      if (data.auto_timer_500) setTimer500(data.auto_timer_500);
+      if (data.auto_timer_10) setTimer10(data.auto_timer_10);
+      // Nouveaux paramètres d'horloges
+      if (data.schedule_500_time) setSchedule500Time(data.schedule_500_time);
+      if (data.schedule_10_time) setSchedule10Time(data.schedule_10_time);
+      if (data.schedule_500_enabled !== undefined) setSchedule500Enabled(data.schedule_500_enabled);
+      if (data.schedule_10_enabled !== undefined) setSchedule10Enabled(data.schedule_10_enabled);
+    }
+  }, [showSettings]);
+
   // Fonction pour récupérer le statut du système - stabilisée avec useCallback
   const fetchSystemStatus = useCallback(async () => {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/status`);
-      const data = await response.json();
-      setSystemStatus(data);
-      
-      // Mise à jour des états locaux SEULEMENT si on n'est pas en train de configurer
-      if (!showSettings && !isConfiguring.current) {
-        if (data.mode) setMode(data.mode);
-        if (data.auto_timer_500) setTimer500(data.auto_timer_500);
-        if (data.auto_timer_10) setTimer10(data.auto_timer_10);
-        // Nouveaux paramètres d'horloges
-        if (data.schedule_500_time) setSchedule500Time(data.schedule_500_time);
-        if (data.schedule_10_time) setSchedule10Time(data.schedule_10_time);
-        if (data.schedule_500_enabled !== undefined) setSchedule500Enabled(data.schedule_500_enabled);
-        if (data.schedule_10_enabled !== undefined) setSchedule10Enabled(data.schedule_10_enabled);
-      }
-      
+      const data = await fetchIfChanged('/api/status');
+      if (!data) return; // Statut inchangé depuis le dernier appel
+      applySystemStatus(data);
     } catch (error) {
       console.error('Erreur récupération statut:', error);
     }
-  }, [showSettings]);
+  }, [applySystemStatus]);
 
   // ===== NOUVELLES FONCTIONS POUR LE TRADING ALPACA =====
-  const fetchTradingStatus = useCallback(async () => {
-    try {
-      const response = await fetch(`${API_BASE_URL}/api/trading/status`);
-      const data = await response.json();
-      
-      if (data.success) {
-        // MODIFIÉ: Forcer market_open à true pour tests 24h/24
-        data.market_open = true;
-        setTradingStatus(data);
-        if (data.portfolio) {
-          setPortfolio(data.portfolio);
-        }
-        // CORRECTION AMÉLIORÉE: Ne pas écraser la config si l'utilisateur est en train de l'éditer
-        // ET vérifier si les valeurs ont réellement changé pour éviter les mises à jour inutiles
-        if (data.config && !isEditingTradingConfig) {
-          const hasConfigChanged = 
-            data.config.take_profit_percent !== tradingConfig.take_profit_percent ||
-            data.config.stop_loss_percent !== tradingConfig.stop_loss_percent ||
-            data.config.investment_percent !== tradingConfig.investment_percent ||
-            data.config.initial_amount !== tradingConfig.initial_amount;
-          
-          if (hasConfigChanged) {
-            setTradingConfig(prev => ({ ...prev, ...data.config }));
-          }
+  // Application d'un statut trading reçu (requête dédiée ou tableau de bord agrégé)
+  const applyTradingStatus = useCallback((data) => {
+    if (data && data.success) {
+      // MODIFIÉ: Forcer market_open à true pour tests 24h/24
+      data.market_open = true;
+      setTradingStatus(data);
+      if (data.portfolio) {
+        setPortfolio(data.portfolio);
+      }
+      // CORRECTION AMÉLIORÉE: Ne pas écraser la config si l'utilisateur est en train de l'éditer
+      // ET vérifier si les valeurs ont réellement changé pour éviter les mises à jour inutiles
+      if (data.config && !isEditingTradingConfig) {
+        const hasConfigChanged = 
+          data.config.take_profit_percent !== tradingConfig.take_profit_percent ||
+          data.config.stop_loss_percent !== tradingConfig.stop_loss_percent ||
+          data.config.investment_percent !== tradingConfig.investment_percent ||
+          data.config.initial_amount !== tradingConfig.initial_amount;
+        
+        if (hasConfigChanged) {
+          setTradingConfig(prev => ({ ...prev, ...data.config }));
         }
       }
+    }
+  }, [isEditingTradingConfig, tradingConfig.take_profit_percent, tradingConfig.stop_loss_percent, tradingConfig.investment_percent, tradingConfig.initial_amount]);
+
+  const fetchTradingStatus = useCallback(async () => {
+    try {
+      applyTradingStatus(await fetchIfChanged('/api/trading/status'));
     } catch (error) {
       console.error('Erreur récupération statut trading:', error);
     }
-  }, [isEditingTradingConfig, tradingConfig.take_profit_percent, tradingConfig.stop_loss_percent, tradingConfig.investment_percent, tradingConfig.initial_amount]);
+  }, [applyTradingStatus]);
 
   const fetchPortfolio = useCallback(async () => {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/trading/portfolio`);
-      const data = await response.json();
+      const data = await fetchIfChanged('/api/trading/portfolio');
       
-      if (data.success && data.portfolio) {
+      if (data && data.success && data.portfolio) {
         setPortfolio(data.portfolio);
       }
     } catch (error) {
@@ -665,10 +690,9 @@ const autoSaveTradingConfig = useCallback(async (configToSave) => {
   // Fonction pour récupérer le Top 10 - stabilisée avec useCallback
   const fetchTop10 = useCallback(async () => {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/get-top-10`);
-      const data = await response.json();
+      const data = await fetchIfChanged('/api/get-top-10');
       
-      if (data.success) {
+      if (data && data.success) {
         setTop10Candidates(data.top_10);
       }
     } catch (error) {
@@ -679,10 +703,9 @@ const autoSaveTradingConfig = useCallback(async (configToSave) => {
   // Fonction pour récupérer la recommandation finale - stabilisée avec useCallback
   const fetchFinalRecommendation = useCallback(async () => {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/get-final-recommendation`);
-      const data = await response.json();
+      const data = await fetchIfChanged('/api/get-final-recommendation');
       
-      if (data.success) {
+      if (data && data.success) {
         setFinalRecommendation(data.recommendation);
       }
     } catch (error) {
@@ -1031,43 +1054,95 @@ const autoSaveTradingConfig = useCallback(async (configToSave) => {
     return () => clearInterval(interval);
   }, []);
 
-  // Effet pour les mises à jour automatiques - dépendances corrigées
+  // ===== TABLEAU DE BORD AGRÉGÉ: une requête, seuls les changements depuis la version reçue =====
+  const dashboardRef = useRef({ version: null, status: {} });
+  const fetchDashboard = useCallback(async () => {
+    try {
+      const { version, status } = dashboardRef.current;
+      const query = version !== null ? `?since=${version}` : '';
+      const response = await fetch(`${API_BASE_URL}/api/dashboard${query}`);
+      const data = await response.json();
+      if (!data.success) return;
+      
+      const { sections } = data;
+      if (sections.status) {
+        // Delta par champ fusionné sur le dernier statut complet reçu
+        const merged = data.full ? { ...sections.status } : { ...status, ...sections.status };
+        ((data.removed && data.removed.status) || []).forEach((key) => delete merged[key]);
+        dashboardRef.current.status = merged;
+        if (!isConfiguring.current) applySystemStatus(merged);
+      }
+      dashboardRef.current.version = data.version;
+      
+      if (sections.top_10 && sections.top_10.success) {
+        setTop10Candidates(sections.top_10.top_10);
+      }
+      if (sections.recommendation && sections.recommendation.success) {
+        setFinalRecommendation(sections.recommendation.recommendation);
+      }
+      if (sections.trading) {
+        applyTradingStatus(sections.trading);
+      }
+    } catch (error) {
+      console.error('Erreur récupération tableau de bord:', error);
+    }
+  }, [applySystemStatus, applyTradingStatus]);
+
+  // ===== FLUX SSE: mises à jour poussées par le serveur =====
+  // Gestionnaires lus via une ref pour que l'abonnement ne soit ouvert qu'une fois
+  const streamHandlers = useRef({});
+  const streamStatusRef = useRef({});
+  streamHandlers.current = {
+    // Statut complet à la connexion (ou resynchronisation), puis seulement les champs modifiés
+    status: (data) => {
+      streamStatusRef.current = data;
+      if (!isConfiguring.current) applySystemStatus(data);
+    },
+    status_delta: (data) => {
+      const merged = { ...streamStatusRef.current, ...data.fields };
+      (data.removed || []).forEach((key) => delete merged[key]);
+      streamStatusRef.current = merged;
+      if (!isConfiguring.current) applySystemStatus(merged);
+    },
+    top_k: (data) => setTop10Candidates(data.top_10_candidates || []),
+    // Le serveur applique le seuil d'affichage: relecture via le tableau de bord à chaque changement
+    recommendation: () => fetchDashboard(),
+    order: () => fetchDashboard()
+  };
+
   useEffect(() => {
-    fetchSystemStatus();
-    fetchTradingStatus(); // AJOUT: Récupération du statut trading
+    if (typeof EventSource === 'undefined') return;
     
-    // Initialisation supprimée car setLocalInitialAmount n'existe plus
-    // setLocalInitialAmount(tradingConfig.initial_amount.toString());
+    // EventSource se reconnecte seul et renvoie Last-Event-ID: aucun événement perdu
+    const source = new EventSource(`${API_BASE_URL}/api/stream`);
+    source.onopen = () => setStreamConnected(true);
+    source.onerror = () => setStreamConnected(false); // Retour au polling jusqu'à la reconnexion
+    Object.keys(streamHandlers.current).forEach((event) => {
+      source.addEventListener(event, (e) => {
+        try {
+          streamHandlers.current[event](JSON.parse(e.data));
+        } catch (error) {
+          console.error(`Erreur événement ${event}:`, error);
+        }
+      });
+    });
+    return () => source.close();
+  }, []);
+
+  // Effet pour les mises à jour automatiques: tableau de bord agrégé comme source unique
+  useEffect(() => {
+    fetchDashboard();
     
+    // Avec le flux SSE, seule la valorisation des positions reste à interroger (60 s);
+    // sans flux, polling de secours toutes les 3 secondes
     const interval = setInterval(() => {
-      // Toujours permettre les mises à jour du statut système pour le progrès
       if (!isConfiguring.current) {
-        fetchSystemStatus();
-        // fetchTradingStatus et fetchPortfolio déplacés vers leur propre intervalle
-        if (systemStatus.phase === 'completed_500' || systemStatus.phase === 'analyzing_10') {
-          fetchTop10();
-        }
-        if (systemStatus.phase === 'completed_10') {
-          fetchFinalRecommendation();
-        }
+        fetchDashboard();
       }
-    }, 3000); // Mise à jour toutes les 3 secondes (statut système uniquement)
-
-    // Intervalle séparé pour le statut trading (moins fréquent pour éviter les conflits)
-    const tradingInterval = setInterval(() => {
-      if (!isConfiguring.current && !isEditingTradingConfig && !showSettings && !showAutoThresholdSettings) {
-        fetchTradingStatus();
-        if (tradingStatus.api_connected) {
-          fetchPortfolio();
-        }
-      }
-    }, 10000); // Mise à jour toutes les 10 secondes pour le trading
-
-    return () => {
-      clearInterval(interval);
-      clearInterval(tradingInterval);
-    };
-  }, [fetchSystemStatus, fetchTradingStatus, fetchPortfolio, fetchTop10, fetchFinalRecommendation, systemStatus.phase, tradingStatus.api_connected, isEditingTradingConfig, showSettings, showAutoThresholdSettings]);
+    }, streamConnected ? 60000 : 3000);
+    
+    return () => clearInterval(interval);
+  }, [fetchDashboard, streamConnected]);
 
   // ===== EFFET POUR LE MODE ANALYSE AUTOMATIQUE SEUIL 70% =====
   useEffect(() => {